@@ -0,0 +1,780 @@
+"""Asyncio clients for the SMHI APIs.
+
+Requires the optional dependency httpx, install it with `pip install ifk-smhi[async]`.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple, Type, Union
+
+import httpx
+import pandas as pd
+import requests
+
+from smhi.constants import (
+    ASYNC_MAX_CONCURRENCY,
+    HTTP_POOL_MAXSIZE,
+    METOBS_CSV_ENGINE,
+    OUT_OF_BOUNDS,
+    STATUS_OK,
+)
+from smhi.grid import GridCube, GridGeometry, get_grid_cache
+from smhi.mesan import BaseMesan
+from smhi.metfcts import Metfcts
+from smhi.metobs import BaseMetobs, Data, Versions
+from smhi.models.metobs_model import (
+    MetobsCategoryModel,
+    MetobsDataModel,
+    MetobsParameterModel,
+    MetobsPeriodModel,
+    MetobsStationModel,
+    MetobsVersionModel,
+)
+from smhi.models.request_model import RetryPolicy
+from smhi.models.strang_model import StrangMultiPoint, StrangPoint
+from smhi.models.variable_model import (
+    ApprovedTime,
+    CsvEngine,
+    GeoMultiPoint,
+    GeoPolygon,
+    MetobsModels,
+    MultiPoint,
+    Parameter,
+    Point,
+    ValidTime,
+)
+from smhi.strang import BaseStrang, RequestType
+from smhi.utils import (
+    RetryableHTTPError,
+    _get_retry_delay,
+    format_datetime,
+    get_retry_policy,
+)
+
+logger = logging.getLogger(__name__)
+
+ASYNC_TRANSIENT_EXCEPTIONS = (httpx.TransportError, RetryableHTTPError)
+
+
+class AsyncTransport:
+    """Async HTTP transport shared between async clients.
+
+    Keeps a pool of keep-alive connections and bounds the number of concurrent
+    requests. Transient failures are retried with the same retry policy
+    as the synchronous clients.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = ASYNC_MAX_CONCURRENCY,
+        max_connections: int = HTTP_POOL_MAXSIZE,
+        retry: Optional[RetryPolicy] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """Initialise async transport.
+
+        Args:
+            max_concurrency: maximum number of concurrent requests
+            max_connections: maximum number of pooled connections
+            retry: retry policy, defaults to the shared retry policy
+            client: httpx client to send requests with
+        """
+        self.retry = get_retry_policy() if retry is None else retry
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+                timeout=httpx.Timeout(
+                    self.retry.read_timeout, connect=self.retry.connect_timeout
+                ),
+            )
+
+        self._client = client
+
+    async def __aenter__(self) -> "AsyncTransport":
+        """Enter async context."""
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Exit async context, closing connections."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close all connections."""
+        await self._client.aclose()
+
+    async def get(
+        self, url: str, retry: Optional[RetryPolicy] = None
+    ) -> httpx.Response:
+        """Get request from url.
+
+        Args:
+            url: url to request from
+            retry: retry policy, defaults to the policy of the transport
+
+        Returns:
+            response
+
+        Raises:
+            ValueError
+            RetryableHTTPError: status in the retry policy after the last attempt
+            requests.exceptions.HTTPError
+        """
+        if retry is None:
+            retry = self.retry
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            response = await self._send(url, retry)
+
+        if response.status_code != STATUS_OK:
+            if OUT_OF_BOUNDS in response.text.lower():
+                raise ValueError("Request is out of bounds.")
+
+            if response.status_code in retry.retry_status:
+                raise RetryableHTTPError(
+                    f"Could not request from {url}.",
+                    response.status_code,
+                    response.headers,
+                )
+
+            raise requests.exceptions.HTTPError(f"Could not request from {url}.")
+
+        logger.debug(f"Successful request from {url}.")
+
+        return response
+
+    async def _send(self, url: str, retry: RetryPolicy) -> httpx.Response:
+        """Send GET request, retrying transient failures.
+
+        Args:
+            url: url to request from
+            retry: retry policy
+
+        Returns:
+            last response
+        """
+        logger.debug(f"Fetching from {url}.")
+
+        for attempt in range(1, retry.max_attempts + 1):
+            last_attempt = attempt == retry.max_attempts
+
+            try:
+                response = await self._client.get(url)
+            except httpx.TransportError as e:
+                if last_attempt:
+                    raise
+
+                delay = retry.delay(attempt)
+                logger.warning(
+                    f"Request to {url} failed ({e}), retrying in {delay:.1f} s."
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code not in retry.retry_status or last_attempt:
+                break
+
+            delay = _get_retry_delay(response, retry, attempt)
+            logger.warning(
+                f"Request to {url} returned {response.status_code}, "
+                + f"retrying in {delay:.1f} s."
+            )
+            await asyncio.sleep(delay)
+
+        return response
+
+
+class AsyncClient:
+    """Base of async clients, owning or sharing a transport."""
+
+    def __init__(self, transport: Optional[AsyncTransport] = None) -> None:
+        """Initialise async client.
+
+        Args:
+            transport: transport to share, a new one is created if not given
+        """
+        self._owns_transport = transport is None
+        self._transport = AsyncTransport() if transport is None else transport
+
+    async def __aenter__(self):
+        """Enter async context."""
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Exit async context, closing an owned transport."""
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close transport, if owned by this client."""
+        if self._owns_transport:
+            await self._transport.aclose()
+
+    async def _get_data(self, url: str) -> tuple[Any, Dict[str, str], int]:
+        """Get requested JSON data.
+
+        Args:
+            url: url to get from
+
+        Returns:
+            data of response
+            headers of response
+            status of response
+        """
+        response = await self._transport.get(url)
+
+        return (
+            json.loads(response.content),
+            dict(response.headers),
+            response.status_code,
+        )
+
+
+class AsyncMesan(AsyncClient, BaseMesan):
+    """Async SMHI Mesan module."""
+
+    def __init__(self, transport: Optional[AsyncTransport] = None) -> None:
+        """Initialise async Mesan.
+
+        Args:
+            transport: transport to share, a new one is created if not given
+        """
+        AsyncClient.__init__(self, transport)
+        BaseMesan.__init__(self)
+
+    async def get_parameters(self) -> Parameter:
+        """Get parameters.
+
+        Returns:
+            parameter model
+        """
+        url = self._base_url + "parameter.json"
+        return self._build_parameters(url, *await self._get_data(url))
+
+    async def get_created_time(self) -> ApprovedTime:
+        """Get created time.
+
+        Returns:
+            created time model
+        """
+        url = self._base_url + "createdtime.json"
+        return self._build_created_time(url, *await self._get_data(url))
+
+    async def get_times(self) -> ValidTime:
+        """Get valid time.
+
+        Returns:
+            valid time model
+        """
+        url = self._base_url + "times.json"
+        return self._build_times(url, *await self._get_data(url))
+
+    async def get_geo_polygon(self) -> GeoPolygon:
+        """Get geographic area polygon.
+
+        Returns:
+            polygon model
+        """
+        url = self._base_url + "geotype/polygon.json"
+        return self._build_geo_polygon(url, *await self._get_data(url))
+
+    async def get_geo_multipoint(self, downsample: int = 2) -> GeoMultiPoint:
+        """Get geographic area multipoint.
+
+        Args:
+            downsample: downsample parameter
+
+        Returns:
+            multipoint polygon model
+        """
+        url = self._build_geo_multipoint_url(downsample)
+        return self._build_geo_multipoint(url, *await self._get_data(url))
+
+    async def get_grid_geometry(self, downsample: int = 2) -> GridGeometry:
+        """Get coordinates of the multipoint grid, cached after the first request.
+
+        Args:
+            downsample: downsample parameter
+
+        Returns:
+            grid geometry
+        """
+        key = self._grid_key(downsample)
+        geometry = get_grid_cache().get(key)
+
+        if geometry is None:
+            url = self._build_geo_multipoint_url(downsample)
+            data, _, _ = await self._get_data(url)
+            geometry = GridGeometry.from_coordinates(data["coordinates"])
+            get_grid_cache().set(key, geometry)
+
+        return geometry
+
+    async def get_cube(
+        self,
+        times: Sequence[Union[str, datetime]],
+        parameters: Sequence[str],
+        downsample: int = 2,
+    ) -> GridCube:
+        """Get multipoint data of several parameters and times as one cube.
+
+        Values are requested concurrently, bounded by the transport. A failing
+        request is logged and reported in the errors of the cube, leaving its
+        values as NaN.
+
+        Args:
+            times: valid times
+            parameters: parameters
+            downsample: downsample
+
+        Returns:
+            cube with values of shape time, parameter and grid point
+
+        Raises:
+            ValueError
+        """
+        geometry = await self.get_grid_geometry(downsample)
+        cube, urls = self._build_cube(times, parameters, downsample, geometry)
+
+        async def get_values(position: Tuple[int, int], url: str) -> None:
+            data, _, _ = await self._get_data(url)
+            self._fill_cube(cube, position, data)
+
+        results = await asyncio.gather(
+            *[get_values(position, url) for position, url in urls.items()],
+            return_exceptions=True,
+        )
+
+        for position, result in zip(urls, results):
+            if isinstance(result, Exception):
+                self._report_cube_error(cube, position, result)
+
+        return cube
+
+    async def get_point(self, latitude: float, longitude: float) -> Point:
+        """Get data for given lon, lat and parameter.
+
+        Args:
+            latitude: latitude
+            longitude: longitude
+
+        Returns:
+            point data model
+        """
+        url = self._build_point_url(latitude, longitude)
+        data, headers, status = await self._get_data(url)
+
+        return self._build_point(url, data, headers, status, latitude, longitude)
+
+    async def get_multipoint(
+        self,
+        times: Union[str, datetime],
+        parameter: str,
+        geo: bool = True,
+        downsample: int = 2,
+    ) -> MultiPoint:
+        """Get multipoint data.
+
+        Args:
+            times: valid time
+            parameter: parameter
+            geo: attach coordinates of grid points
+            downsample: downsample
+
+        Returns:
+            multipoint data model
+
+        Raises:
+            ValueError
+        """
+        times = format_datetime(times)
+        if self._check_times(times) is False:
+            raise ValueError(f"Invalid time {times}.")
+
+        geometry = await self.get_grid_geometry(downsample) if geo is True else None
+        url = self._build_multipoint_url(times, parameter, False, downsample)
+        data, headers, status = await self._get_data(url)
+
+        return self._build_multipoint(
+            url, data, headers, status, parameter, geo, downsample, geometry
+        )
+
+
+class AsyncMetfcts(AsyncMesan):
+    """Async SMHI Metfcts module."""
+
+    _category = Metfcts._category
+    _version = Metfcts._version
+    _base_url = Metfcts._base_url
+    _parameter_descriptions = Metfcts._parameter_descriptions
+
+
+class AsyncStrang(AsyncClient, BaseStrang):
+    """Async SMHI Strang class. Only supports category strang1g and version 1."""
+
+    def __init__(self, transport: Optional[AsyncTransport] = None) -> None:
+        """Initialise async Strang object.
+
+        Args:
+            transport: transport to share, a new one is created if not given
+        """
+        AsyncClient.__init__(self, transport)
+        BaseStrang.__init__(self)
+
+    async def get_point(
+        self,
+        latitude: float,
+        longitude: float,
+        parameter: int,
+        time_from: Optional[str] = None,
+        time_to: Optional[str] = None,
+        time_interval: Optional[str] = None,
+        window: Optional[str] = None,
+    ) -> StrangPoint:
+        """Get data for given lon, lat and parameter.
+
+        Long periods can be split into time windows, e.g. one per year, which are
+        requested concurrently, bounded by the transport. A failing window is
+        retried on its own when the error is transient, and the windows are
+        joined in time order.
+
+        Args:
+            latitude: latitude
+            longitude: longitude
+            parameter: parameter
+            time_from: get data from (optional),
+            time_to: get data to (optional),
+            time_interval: interval of data
+                           [valid values: hourly, daily, monthly] (optional)
+            window: pandas frequency of time windows, e.g. YS for calendar
+                    years, requests the whole period at once if not given
+
+        Returns:
+            strange point model
+        """
+        strang_parameter, url, time_from, time_to = self._prepare_point(
+            latitude, longitude, parameter, time_from, time_to, time_interval
+        )
+        urls = [url]
+        if window is not None:
+            urls = self._prepare_windows(
+                strang_parameter,
+                latitude,
+                longitude,
+                time_from,
+                time_to,
+                time_interval,
+                window,
+            )
+
+        results = await asyncio.gather(*[self._get_window(url) for url in urls])
+        _, headers, status = results[0]
+
+        return self._build_point(
+            strang_parameter,
+            latitude,
+            longitude,
+            time_from,
+            time_to,
+            time_interval,
+            url,
+            self._concat_windows([data for data, _, _ in results]),
+            headers,
+            status,
+        )
+
+    async def get_multipoint(
+        self, parameter: int, valid_time: str, time_interval: Optional[str] = None
+    ) -> StrangMultiPoint:
+        """Get full spatial data for given parameter and time.
+
+        Args:
+            parameter: parameter
+            valid_time: valid time
+            time_interval: interval of data
+                           [valid values: hourly,
+                            daily, monthly] (optional)
+
+        Returns:
+            strange multipoint model
+        """
+        strang_parameter, url, valid_time = self._prepare_multipoint(
+            parameter, valid_time, time_interval
+        )
+        response = await self._transport.get(url)
+        data = self._load_data(response.content, RequestType.MULTIPOINT)
+
+        return self._build_multipoint(
+            strang_parameter,
+            valid_time,
+            time_interval,
+            url,
+            data,
+            dict(response.headers),
+            response.status_code,
+        )
+
+    async def _get_window(
+        self, url: str
+    ) -> tuple[Optional[pd.DataFrame], Dict[str, str], int]:
+        """Get point data of a time window, retrying it on transient errors.
+
+        Window attempts replace the attempts of the transport, so a window is
+        sent at most as many times as the retry policy allows. Errors that do
+        not go away on retry, e.g. a point outside the grid or a client error,
+        are raised right away.
+
+        Args:
+            url: url of window
+
+        Returns:
+            data
+            headers
+            status code
+        """
+        retry = self._transport.retry
+        single = retry.model_copy(update={"max_attempts": 1})
+        attempt = 1
+
+        while True:
+            try:
+                return await self._get_point_data(url, single)
+            except ASYNC_TRANSIENT_EXCEPTIONS as e:
+                if attempt >= retry.max_attempts:
+                    raise
+
+                delay = (
+                    _get_retry_delay(e, retry, attempt)
+                    if isinstance(e, RetryableHTTPError)
+                    else retry.delay(attempt)
+                )
+                logger.warning(f"Window {url} failed ({e}), retrying in {delay:.1f} s.")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _get_point_data(
+        self, url: str, retry: Optional[RetryPolicy] = None
+    ) -> tuple[Optional[pd.DataFrame], Dict[str, str], int]:
+        """Get point data.
+
+        Args:
+            url: url to get from
+            retry: retry policy, defaults to the policy of the transport
+
+        Returns:
+            data
+            headers
+            status code
+        """
+        response = await self._transport.get(url, retry)
+        data = self._load_data(response.content, RequestType.POINT)
+
+        return data, dict(response.headers), response.status_code
+
+
+class AsyncMetobs(AsyncClient, BaseMetobs):
+    """Async client of version 1 of the Metobs API.
+
+    Walks the same chain as Versions, Parameters, Stations, Periods and Data,
+    returning the pydantic models of each step. Metadata models are kept for the
+    lifetime of the client, so concurrent requests for many stations fetch
+    versions, parameters and stations only once.
+    """
+
+    def __init__(self, transport: Optional[AsyncTransport] = None) -> None:
+        """Initialise async Metobs.
+
+        Args:
+            transport: transport to share, a new one is created if not given
+        """
+        AsyncClient.__init__(self, transport)
+        BaseMetobs.__init__(self)
+        self._models: Dict[str, asyncio.Future] = {}
+
+    async def get_versions(self) -> MetobsCategoryModel:
+        """Get versions.
+
+        Returns:
+            versions model
+        """
+        url = Versions._base_url.format(data_type="json")
+        return await self._get_model(url, MetobsCategoryModel)
+
+    async def get_parameters(
+        self, version: Union[str, int] = "1.0"
+    ) -> MetobsVersionModel:
+        """Get parameters from version.
+
+        Args:
+            version: selected version
+
+        Returns:
+            parameters model
+
+        Raises:
+            NotImplementedError: version not implemented
+        """
+        version = "1.0" if version == 1 else version
+        if version != "1.0":
+            raise NotImplementedError("Only supports version 1.0.")
+
+        versions = await self.get_versions()
+        url, _ = self._get_url(versions.data, "key", version)
+
+        return await self._get_model(url, MetobsVersionModel)
+
+    async def get_stations(
+        self,
+        parameter: Optional[int] = None,
+        parameter_title: Optional[str] = None,
+        version: Union[str, int] = "1.0",
+    ) -> MetobsParameterModel:
+        """Get stations from parameter.
+
+        Args:
+            parameter: integer parameter key to get
+            parameter_title: exact parameter title to get
+            version: selected version
+
+        Returns:
+            stations model
+
+        Raises:
+            NotImplementedError: parameter not implemented
+        """
+        if parameter is None and parameter_title is None:
+            raise NotImplementedError("No parameter selected.")
+
+        if parameter and parameter_title:
+            raise NotImplementedError("Can't decide which input to select.")
+
+        parameters = await self.get_parameters(version)
+        if parameter:
+            url, _ = self._get_url(parameters.resource, "key", parameter)
+        else:
+            url, _ = self._get_url(parameters.resource, "title", parameter_title)
+
+        return await self._get_model(url, MetobsParameterModel)
+
+    async def get_periods(
+        self,
+        parameter: Optional[int] = None,
+        station: Optional[int] = None,
+        station_name: Optional[str] = None,
+        station_set: Optional[str] = None,
+        parameter_title: Optional[str] = None,
+        version: Union[str, int] = "1.0",
+    ) -> MetobsStationModel:
+        """Get periods from station.
+
+        Args:
+            parameter: integer parameter key to get
+            station: integer station key to get
+            station_name: exact station name to get
+            station_set: station set to get
+            parameter_title: exact parameter title to get
+            version: selected version
+
+        Returns:
+            periods model
+
+        Raises:
+            NotImplementedError: station not implemented
+        """
+        if [station, station_name, station_set].count(None) == 3:
+            raise NotImplementedError("No stations selected.")
+
+        if [bool(x) for x in [station, station_name, station_set]].count(True) > 1:
+            raise NotImplementedError("Can't decide which input to select.")
+
+        stations = await self.get_stations(parameter, parameter_title, version)
+        if station:
+            url, _ = self._get_url(stations.station, "key", station)
+        elif station_name:
+            url, _ = self._get_url(stations.station, "name", station_name)
+        else:
+            url, _ = self._get_url(stations.station_set, "key", station_set)
+
+        return await self._get_model(url, MetobsStationModel)
+
+    async def get_data(
+        self,
+        parameter: Optional[int] = None,
+        station: Optional[int] = None,
+        period: Optional[str] = None,
+        station_name: Optional[str] = None,
+        station_set: Optional[str] = None,
+        parameter_title: Optional[str] = None,
+        version: Union[str, int] = "1.0",
+        engine: CsvEngine = METOBS_CSV_ENGINE,
+    ) -> MetobsDataModel:
+        """Get data from period.
+
+        Args:
+            parameter: integer parameter key to get
+            station: integer station key to get
+            period: select period from:
+                    latest-hour, latest-day, latest-months or corrected-archive
+            station_name: exact station name to get
+            station_set: station set to get
+            parameter_title: exact parameter title to get
+            version: selected version
+            engine: pandas CSV parser engine, one of c, pyarrow or python
+
+        Returns:
+            data model
+        """
+        periods = await self.get_periods(
+            parameter, station, station_name, station_set, parameter_title, version
+        )
+        period = Data._select_period(periods.data, period)
+        url, _ = self._get_url(periods.period, "key", period)
+
+        data, _, _ = await self._get_data(url)
+        period_model = MetobsPeriodModel.model_validate(data)
+        response = await self._transport.get(Data._get_data_link(period_model.data))
+
+        return Data._parse_data(Data._decode(response.content), engine)
+
+    async def _get_model(self, url: str, model: Type[MetobsModels]) -> MetobsModels:
+        """Get and parse metadata model, fetching each url only once.
+
+        Args:
+            url: url to get from
+            model: pydantic model to populate
+
+        Returns:
+            pydantic model
+        """
+        future = self._models.get(url)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_model(url, model))
+            self._models[url] = future
+
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            self._models.pop(url, None)
+            raise
+
+    async def _fetch_model(self, url: str, model: Type[MetobsModels]) -> MetobsModels:
+        """Fetch and parse model.
+
+        Args:
+            url: url to get from
+            model: pydantic model to populate
+
+        Returns:
+            pydantic model
+        """
+        response = await self._transport.get(url)
+        return model.model_validate_json(response.content)
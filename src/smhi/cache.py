@@ -0,0 +1,286 @@
+"""Caches used by the clients."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from smhi.constants import (
+    CACHE_MAX_SIZE,
+    CACHE_TTL,
+    MEMO_MAX_ENTRIES,
+    MEMO_TTL,
+    STATUS_OK,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ResponseCache:
+    """Persistent on-disk cache of HTTP responses keyed by url.
+
+    Fresh entries, younger than the time to live, are served without any request.
+    Stale entries are revalidated with a conditional GET if the server sent an ETag
+    or a Last-Modified header. The least recently used entries are evicted
+    when the cache grows beyond its maximum size.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        ttl: float = CACHE_TTL,
+        max_size: int = CACHE_MAX_SIZE,
+    ) -> None:
+        """Initialise response cache.
+
+        Args:
+            directory: directory to store responses in
+            ttl: time to live in seconds before an entry is revalidated
+            max_size: maximum total size of stored bodies in bytes
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[tuple[requests.Response, bool]]:
+        """Get stored response for url.
+
+        Args:
+            url: url of response
+
+        Returns:
+            stored response and if it is fresh, or None if not stored
+        """
+        meta_path, body_path = self._paths(url)
+
+        with self._lock:
+            try:
+                meta = json.loads(meta_path.read_text())
+                content = body_path.read_bytes()
+            except (OSError, ValueError):
+                return None
+
+            os.utime(meta_path)
+
+        response = requests.Response()
+        response.status_code = STATUS_OK
+        response.url = url
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response._content = content
+
+        return response, time.time() - meta["stored"] < self.ttl
+
+    def validators(self, response: requests.Response) -> Dict[str, str]:
+        """Get conditional request headers for a stored response.
+
+        Args:
+            response: stored response
+
+        Returns:
+            conditional request headers, empty if the response can't be revalidated
+        """
+        headers = {}
+        if "ETag" in response.headers:
+            headers["If-None-Match"] = response.headers["ETag"]
+        if "Last-Modified" in response.headers:
+            headers["If-Modified-Since"] = response.headers["Last-Modified"]
+
+        return headers
+
+    def set(self, url: str, response: requests.Response) -> None:
+        """Store response for url.
+
+        Args:
+            url: url of response
+            response: response to store
+        """
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "stored": time.time(),
+            "headers": dict(response.headers or {}),
+        }
+
+        with self._lock:
+            self._write(body_path, response.content)
+            self._write(meta_path, json.dumps(meta).encode("utf-8"))
+            self._evict()
+
+    def touch(self, url: str) -> None:
+        """Mark stored response for url as fresh, after a successful revalidation.
+
+        Args:
+            url: url of response
+        """
+        meta_path, _ = self._paths(url)
+
+        with self._lock:
+            try:
+                meta = json.loads(meta_path.read_text())
+            except (OSError, ValueError):
+                return None
+
+            meta["stored"] = time.time()
+            self._write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def clear(self) -> None:
+        """Remove all stored responses."""
+        with self._lock:
+            for path in self.directory.glob("*.json"):
+                self._remove(path)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        """Get metadata and body paths for url.
+
+        Args:
+            url: url
+
+        Returns:
+            metadata path
+            body path
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def _write(self, path: Path, content: bytes) -> None:
+        """Write file atomically.
+
+        Args:
+            path: path to write
+            content: content to write
+        """
+        tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+    def _remove(self, meta_path: Path) -> None:
+        """Remove entry by its metadata path.
+
+        Args:
+            meta_path: metadata path of entry
+        """
+        meta_path.with_suffix(".body").unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits its maximum size."""
+        entries = []
+        for meta_path in self.directory.glob("*.json"):
+            try:
+                size = meta_path.with_suffix(".body").stat().st_size
+                entries.append((meta_path.stat().st_mtime, size, meta_path))
+            except OSError:
+                continue
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, meta_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            logger.debug(f"Evicting {meta_path.stem} from response cache.")
+            self._remove(meta_path)
+            total_size -= size
+
+
+class MemoCache:
+    """Thread-safe in-process least recently used cache with time to live.
+
+    Concurrent requests for the same missing key wait for a single call of the
+    factory instead of calling it once each.
+    """
+
+    def __init__(
+        self, ttl: float = MEMO_TTL, max_entries: int = MEMO_MAX_ENTRIES
+    ) -> None:
+        """Initialise memo cache.
+
+        Args:
+            ttl: time to live in seconds of an entry
+            max_entries: maximum number of entries
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get number of entries."""
+        return len(self._entries)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], T]) -> T:
+        """Get value of key, calling the factory to set it if missing or expired.
+
+        Args:
+            key: key of value
+            factory: function creating the value
+
+        Returns:
+            value
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                return value
+
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                value = self._lookup(key)
+                if value is not None:
+                    return value
+
+            try:
+                value = factory()
+
+                with self._lock:
+                    self._entries[key] = (time.monotonic(), value)
+                    self._entries.move_to_end(key)
+
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Look up key, dropping it if expired. Must be called holding the lock.
+
+        Args:
+            key: key of value
+
+        Returns:
+            value or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        created, value = entry
+        if time.monotonic() - created >= self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+
+        return value
@@ -2,8 +2,9 @@
 
 import logging
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta
 from posixpath import join as urljoin
+from typing import Final
 
 import arrow
 
@@ -155,6 +156,52 @@ STRANG_MULTIPOINT_URL = urljoin(
 )
 
 STRANG_TIME_INTERVALS = ["hourly", "daily", "monthly"]
+STRANG_AGGREGATION_FREQUENCIES = {"hourly": "h", "daily": "D", "monthly": "MS"}
+STRANG_GRID_PARAMETER = 116
+STRANG_GRID_VALID_TIME = "2020-01-01T12:00:00Z"
 
 STATUS_OK = 200
 OUT_OF_BOUNDS = "out of bounds"
+
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 10
+HTTP_POOL_BLOCK = False
+
+HTTP_CONNECT_TIMEOUT = 10.0
+HTTP_READ_TIMEOUT = 200.0
+HTTP_RETRY_MAX_ATTEMPTS = 4
+HTTP_RETRY_BACKOFF = 0.5
+HTTP_RETRY_BACKOFF_MAX = 60.0
+HTTP_RETRY_STATUS = (429, 500, 502, 503, 504)
+HTTP_NOT_MODIFIED = 304
+
+ASYNC_MAX_CONCURRENCY = 16
+
+METOBS_BULK_MAX_WORKERS = HTTP_POOL_MAXSIZE
+MESAN_CUBE_MAX_WORKERS = HTTP_POOL_MAXSIZE
+STRANG_WINDOW_MAX_WORKERS = HTTP_POOL_MAXSIZE
+STRANG_POINTS_MAX_WORKERS = HTTP_POOL_MAXSIZE
+METOBS_STREAM_CHUNK_SIZE = 1024**2
+METOBS_CSV_ENGINE: Final = "c"
+METOBS_SYNC_WINDOWS = {
+    "latest-hour": timedelta(hours=1),
+    "latest-day": timedelta(days=1),
+    "latest-months": timedelta(days=90),
+}
+
+EARTH_RADIUS = 6371.0088
+GEODESIC_MARGIN = 1.01
+GEO_BATCH_SIZE = 4096
+IDW_MIN_DISTANCE = 1e-3
+GRID_ROW_JUMP = 3.0
+GRID_BILINEAR_ITERATIONS = 8
+GRID_KEY_FACTOR = 10**10
+GRID_STORE_STEP = timedelta(hours=1)
+GEOCODE_USER_AGENT = "ifk-smhi"
+GEOCODE_MIN_DELAY = 1.0
+GEOCODE_MAX_ENTRIES = 4096
+
+CACHE_TTL = 3600.0
+CACHE_MAX_SIZE = 512 * 1024**2
+MEMO_TTL = 3600.0
+MEMO_MAX_ENTRIES = 1024
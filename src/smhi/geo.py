@@ -0,0 +1,496 @@
+"""Spatial index of Metobs stations and geocoding of place names."""
+
+import csv
+import hashlib
+import json
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from geopy import distance
+from geopy.extra.rate_limiter import RateLimiter
+from geopy.geocoders import Nominatim
+
+from smhi.cache import MemoCache
+from smhi.constants import (
+    EARTH_RADIUS,
+    GEO_BATCH_SIZE,
+    GEOCODE_MAX_ENTRIES,
+    GEOCODE_MIN_DELAY,
+    GEOCODE_USER_AGENT,
+    GEODESIC_MARGIN,
+)
+from smhi.models.metobs_model import MetobsStationLink
+
+GAZETTEER_PATH = Path(__file__).parent / "data" / "gazetteer.csv"
+
+geo_cache = MemoCache()
+
+
+class StationIndex:
+    """Spatial index of station coordinates for nearest-station queries.
+
+    Distances are computed with a vectorised haversine kernel over all stations
+    at once. With geodesic enabled, only the shortlist of candidates within
+    the error margin of the spherical approximation is refined with geodesic
+    distances on the WGS-84 ellipsoid.
+    """
+
+    def __init__(self, stations: Sequence[MetobsStationLink]) -> None:
+        """Build index from stations.
+
+        Args:
+            stations: stations to index
+        """
+        self.ids = np.array([s.id for s in stations], dtype=np.int64)
+        self.names = np.array([s.name for s in stations], dtype=object)
+        self.latitudes = np.array([s.latitude for s in stations], dtype=np.float64)
+        self.longitudes = np.array([s.longitude for s in stations], dtype=np.float64)
+
+        self._latitudes = np.radians(self.latitudes)
+        self._longitudes = np.radians(self.longitudes)
+        self._cos_latitudes = np.cos(self._latitudes)
+        self._key = self._hash(self.ids, self.latitudes, self.longitudes)
+
+    def __len__(self) -> int:
+        """Get number of stations."""
+        return len(self.ids)
+
+    @classmethod
+    def of(cls, station_response: Any) -> "StationIndex":
+        """Get index of a stations object, building it on first use.
+
+        Args:
+            station_response: stations object with a station list
+
+        Returns:
+            station index
+        """
+        index = getattr(station_response, "_station_index", None)
+
+        if index is None:
+            index = cls(station_response.station)
+            station_response._station_index = index
+
+        return index
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int = 1, geodesic: bool = False
+    ) -> List[Tuple[int, str, float]]:
+        """Find the k nearest stations.
+
+        Args:
+            latitude: latitude
+            longitude: longitude
+            k: number of stations
+            geodesic: refine distances with geodesic distances
+
+        Returns:
+            id, name and distance in km of stations, nearest first
+        """
+        distances = self.haversine(latitude, longitude)
+        k = min(k, len(distances))
+
+        if k <= 0:
+            return []
+
+        candidates = np.argpartition(distances, k - 1)[:k]
+
+        if geodesic is True:
+            limit = distances[candidates].max() * GEODESIC_MARGIN
+            candidates = np.flatnonzero(distances <= limit)
+
+        return self._select(latitude, longitude, candidates, distances, geodesic)[:k]
+
+    def within(
+        self, latitude: float, longitude: float, radius: float, geodesic: bool = False
+    ) -> List[Tuple[int, str, float]]:
+        """Find all stations within radius.
+
+        Args:
+            latitude: latitude
+            longitude: longitude
+            radius: radius in km
+            geodesic: refine distances with geodesic distances
+
+        Returns:
+            id, name and distance in km of stations, nearest first
+        """
+        distances = self.haversine(latitude, longitude)
+        limit = radius * GEODESIC_MARGIN if geodesic is True else radius
+        candidates = np.flatnonzero(distances <= limit)
+        stations = self._select(latitude, longitude, candidates, distances, geodesic)
+
+        return [s for s in stations if s[2] <= radius]
+
+    def nearest_many(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        k: int = 1,
+        use_cache: bool = True,
+    ) -> pd.DataFrame:
+        """Find the k nearest stations of many sites at once.
+
+        Sites are processed in batches of one vectorised pass over all stations.
+        Results are cached by the station list and the site coordinates.
+
+        Args:
+            latitudes: latitudes of sites
+            longitudes: longitudes of sites
+            k: number of stations per site
+            use_cache: use the in-process cache
+
+        Returns:
+            station id, name and distance in km, indexed by site and rank
+
+        Raises:
+            ValueError
+        """
+        site_latitudes = np.asarray(latitudes, dtype=np.float64)
+        site_longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        if site_latitudes.shape != site_longitudes.shape or site_latitudes.ndim != 1:
+            raise ValueError("Latitudes and longitudes must be equally long 1D arrays.")
+
+        k = min(k, len(self))
+
+        if use_cache is False:
+            return self._nearest_many(site_latitudes, site_longitudes, k)
+
+        key = (self._key, self._hash(site_latitudes, site_longitudes), k)
+        df = geo_cache.get_or_set(
+            key, lambda: self._nearest_many(site_latitudes, site_longitudes, k)
+        )
+
+        return df.copy()
+
+    def haversine(self, latitude: Any, longitude: Any) -> np.ndarray:
+        """Get great-circle distances from coordinates to all stations.
+
+        Args:
+            latitude: latitude, scalar or array
+            longitude: longitude, scalar or array
+
+        Returns:
+            distances in km, with a trailing axis over stations
+        """
+        latitude = np.radians(np.asarray(latitude, dtype=np.float64))[..., None]
+        longitude = np.radians(np.asarray(longitude, dtype=np.float64))[..., None]
+
+        a = (
+            np.sin((self._latitudes - latitude) / 2) ** 2
+            + np.cos(latitude)
+            * self._cos_latitudes
+            * np.sin((self._longitudes - longitude) / 2) ** 2
+        )
+
+        return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+    def _nearest_many(
+        self, latitudes: np.ndarray, longitudes: np.ndarray, k: int
+    ) -> pd.DataFrame:
+        """Find the k nearest stations of many sites.
+
+        Args:
+            latitudes: latitudes of sites
+            longitudes: longitudes of sites
+            k: number of stations per site
+
+        Returns:
+            station id, name and distance in km, indexed by site and rank
+        """
+        n_sites = len(latitudes)
+        positions = np.empty((n_sites, k), dtype=np.int64)
+        distances = np.empty((n_sites, k), dtype=np.float64)
+
+        for start in range(0, n_sites if k > 0 else 0, GEO_BATCH_SIZE):
+            stop = start + GEO_BATCH_SIZE
+            batch = self.haversine(latitudes[start:stop], longitudes[start:stop])
+            candidates = np.argpartition(batch, k - 1, axis=1)[:, :k]
+            candidate_distances = np.take_along_axis(batch, candidates, axis=1)
+            order = np.argsort(candidate_distances, axis=1, kind="stable")
+
+            positions[start:stop] = np.take_along_axis(candidates, order, axis=1)
+            distances[start:stop] = np.take_along_axis(
+                candidate_distances, order, axis=1
+            )
+
+        stations = positions.ravel()
+
+        return pd.DataFrame(
+            {
+                "station": self.ids[stations],
+                "name": self.names[stations],
+                "distance": distances.ravel(),
+            },
+            index=pd.MultiIndex.from_product(
+                [range(n_sites), range(k)], names=["site", "rank"]
+            ),
+        )
+
+    @staticmethod
+    def _hash(*arrays: np.ndarray) -> str:
+        """Hash contents of arrays.
+
+        Args:
+            arrays: arrays to hash
+
+        Returns:
+            hex digest
+        """
+        digest = hashlib.sha256()
+        for array in arrays:
+            digest.update(np.ascontiguousarray(array).tobytes())
+
+        return digest.hexdigest()
+
+    def _select(
+        self,
+        latitude: float,
+        longitude: float,
+        candidates: np.ndarray,
+        distances: np.ndarray,
+        geodesic: bool,
+    ) -> List[Tuple[int, str, float]]:
+        """Select candidates sorted by distance.
+
+        Args:
+            latitude: latitude
+            longitude: longitude
+            candidates: positions of candidate stations
+            distances: haversine distances to all stations
+            geodesic: refine distances with geodesic distances
+
+        Returns:
+            id, name and distance in km of candidates, nearest first
+        """
+        if geodesic is True:
+            exact = np.array(
+                [
+                    distance.distance(
+                        (latitude, longitude),
+                        (self.latitudes[i], self.longitudes[i]),
+                    ).km
+                    for i in candidates
+                ],
+                dtype=np.float64,
+            )
+        else:
+            exact = distances[candidates]
+
+        order = np.argsort(exact, kind="stable")
+
+        return [
+            (
+                int(self.ids[candidates[i]]),
+                str(self.names[candidates[i]]),
+                float(exact[i]),
+            )
+            for i in order
+        ]
+
+
+class Geocoder:
+    """Geocoder of place names with an offline gazetteer and a persistent cache.
+
+    Names are resolved from the bundled gazetteer of Swedish localities first,
+    then from the cache of earlier lookups and only on a miss from Nominatim.
+    Nominatim is rate limited and its client is shared by all lookups. The
+    least recently used entries are evicted when the cache grows beyond its
+    maximum number of entries.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        gazetteer: bool = True,
+        max_entries: int = GEOCODE_MAX_ENTRIES,
+        min_delay: float = GEOCODE_MIN_DELAY,
+    ) -> None:
+        """Initialise geocoder.
+
+        Args:
+            path: json file to persist lookups in, None keeps them in memory only
+            gazetteer: resolve names from the bundled gazetteer
+            max_entries: maximum number of cached lookups
+            min_delay: minimum delay in seconds between Nominatim requests
+        """
+        self.path = None if path is None else Path(path)
+        self.gazetteer = gazetteer
+        self.max_entries = max_entries
+        self.min_delay = min_delay
+        self._entries = self._read()
+        self._geocode: Optional[Callable[[str], Any]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get number of cached lookups."""
+        return len(self._entries)
+
+    def geocode(self, name: str) -> Tuple[float, float]:
+        """Get coordinates of a place.
+
+        Args:
+            name: name of place
+
+        Returns:
+            latitude
+            longitude
+
+        Raises:
+            ValueError
+        """
+        key = self._normalise(name)
+
+        if self.gazetteer is True:
+            gazetteer, folded = _load_gazetteer()
+            if key in gazetteer:
+                return gazetteer[key]
+
+            # names typed without å, ä or ö only match a single unambiguous place
+            if key == self._fold(key) and key in folded:
+                return folded[key]
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            if self._geocode is None:
+                geolocator = Nominatim(user_agent=GEOCODE_USER_AGENT)
+                self._geocode = RateLimiter(
+                    geolocator.geocode, min_delay_seconds=self.min_delay
+                )
+
+            geocode = self._geocode
+
+        location = geocode(name)
+
+        if location is None:
+            raise ValueError(f"Can't find location of {name}.")
+
+        coordinates = (float(location.latitude), float(location.longitude))
+
+        with self._lock:
+            self._entries[key] = coordinates
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            self._write()
+
+        return coordinates
+
+    def clear(self) -> None:
+        """Remove all cached lookups."""
+        with self._lock:
+            self._entries.clear()
+            self._write()
+
+    @staticmethod
+    def _normalise(name: str) -> str:
+        """Normalise place name to a lookup key, ignoring case and whitespace.
+
+        Diacritics are kept, so that e.g. Åsa and Asa are different places.
+
+        Args:
+            name: name of place
+
+        Returns:
+            key
+        """
+        return unicodedata.normalize("NFC", " ".join(name.casefold().split()))
+
+    @staticmethod
+    def _fold(key: str) -> str:
+        """Fold lookup key to its letters without diacritics.
+
+        Args:
+            key: normalised name of place
+
+        Returns:
+            folded key
+        """
+        decomposed = unicodedata.normalize("NFKD", key)
+        return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+    def _read(self) -> "OrderedDict[str, Tuple[float, float]]":
+        """Read persisted lookups, least recently used first.
+
+        Returns:
+            lookups
+        """
+        if self.path is None:
+            return OrderedDict()
+
+        try:
+            entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return OrderedDict()
+
+        return OrderedDict((k, (float(v[0]), float(v[1]))) for k, v in entries.items())
+
+    def _write(self) -> None:
+        """Persist lookups atomically. Must be called holding the lock."""
+        if self.path is None:
+            return None
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self._entries))
+        os.replace(tmp_path, self.path)
+
+
+@lru_cache(maxsize=1)
+def _load_gazetteer() -> Tuple[
+    Dict[str, Tuple[float, float]], Dict[str, Tuple[float, float]]
+]:
+    """Load the bundled gazetteer of Swedish localities.
+
+    Returns:
+        coordinates by normalised name
+        coordinates by folded name, without names shared by several places
+    """
+    with open(GAZETTEER_PATH, encoding="utf-8", newline="") as f:
+        gazetteer = {
+            Geocoder._normalise(row["name"]): (
+                float(row["latitude"]),
+                float(row["longitude"]),
+            )
+            for row in csv.DictReader(f, delimiter=";")
+        }
+
+    folded: Dict[str, List[Tuple[float, float]]] = {}
+    for key, coordinates in gazetteer.items():
+        folded.setdefault(Geocoder._fold(key), []).append(coordinates)
+
+    return gazetteer, {k: v[0] for k, v in folded.items() if len(v) == 1}
+
+
+_geocoder = Geocoder()
+
+
+def get_geocoder() -> Geocoder:
+    """Get the geocoder used by all clients.
+
+    Returns:
+        geocoder
+    """
+    return _geocoder
+
+
+def set_geocoder(geocoder: Optional[Geocoder]) -> None:
+    """Set the geocoder used by all clients.
+
+    Args:
+        geocoder: geocoder, None resets to the default in-memory geocoder
+    """
+    global _geocoder
+
+    _geocoder = Geocoder() if geocoder is None else geocoder
@@ -0,0 +1,709 @@
+"""Grid geometry of the Mesan and Metfcts multipoint grids."""
+
+import logging
+import os
+import threading
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, Literal, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from smhi.constants import (
+    EARTH_RADIUS,
+    GRID_BILINEAR_ITERATIONS,
+    GRID_KEY_FACTOR,
+    GRID_ROW_JUMP,
+)
+
+logger = logging.getLogger(__name__)
+
+GridKey = Tuple[str, int, int]
+SampleMethod = Literal["bilinear", "nearest"]
+
+
+class GridGeometry:
+    """Coordinates of all points of a multipoint grid.
+
+    Coordinates are kept as read-only arrays so that they can be shared,
+    without copying, by every multipoint frame on the same grid.
+    """
+
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray) -> None:
+        """Initialise grid geometry.
+
+        Args:
+            latitudes: latitudes of grid points
+            longitudes: longitudes of grid points
+
+        Raises:
+            ValueError
+        """
+        self.latitudes = np.array(latitudes, dtype=np.float64)
+        self.longitudes = np.array(longitudes, dtype=np.float64)
+
+        if self.latitudes.shape != self.longitudes.shape or self.latitudes.ndim != 1:
+            raise ValueError("Latitudes and longitudes must be equally long 1D arrays.")
+
+        self.latitudes.setflags(write=False)
+        self.longitudes.setflags(write=False)
+        self._central_longitude = float(np.mean(self.longitudes)) if len(self) else 0.0
+
+    def __len__(self) -> int:
+        """Get number of grid points."""
+        return len(self.latitudes)
+
+    def project(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """Project coordinates to a plane around the grid.
+
+        Uses a sinusoidal projection centred on the mean longitude of the grid,
+        which keeps distances close to great-circle distances over the grid.
+
+        Args:
+            latitudes: latitudes
+            longitudes: longitudes
+
+        Returns:
+            x and y in km, with a trailing axis of length two
+        """
+        latitudes = np.radians(latitudes)
+        longitudes = np.radians(np.asarray(longitudes) - self._central_longitude)
+
+        return EARTH_RADIUS * np.stack(
+            [longitudes * np.cos(latitudes), latitudes], axis=-1
+        )
+
+    @property
+    def spacing(self) -> float:
+        """Get typical distance between neighbouring grid points in km.
+
+        Returns:
+            median distance between consecutive grid points
+        """
+        xy = self.project(self.latitudes, self.longitudes)
+        steps = np.hypot(*np.diff(xy, axis=0).T)
+
+        return float(np.median(steps)) if len(steps) else 0.0
+
+    @cached_property
+    def shape(self) -> Optional[Tuple[int, int]]:
+        """Get shape of the grid, if its points are ordered row by row.
+
+        Rows are detected as jumps between consecutive points that are much
+        longer than the grid spacing. The shape is computed once per geometry.
+
+        Returns:
+            number of rows and columns, or None if the grid is not structured
+        """
+        xy = self.project(self.latitudes, self.longitudes)
+        steps = np.hypot(*np.diff(xy, axis=0).T)
+        if len(steps) == 0:
+            return None
+
+        jumps = np.flatnonzero(steps > GRID_ROW_JUMP * np.median(steps)) + 1
+        if len(jumps) == 0 or len(self) % jumps[0] != 0:
+            return None
+
+        columns = int(jumps[0])
+        if not np.array_equal(jumps, np.arange(columns, len(self), columns)):
+            return None
+
+        return len(self) // columns, columns
+
+    def locate(self, latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """Locate grid points from their coordinates.
+
+        Coordinates in the order of the grid are located without a lookup.
+        Others are looked up in a sorted index of the grid coordinates, which is
+        built once per geometry.
+
+        Args:
+            latitudes: latitudes of grid points
+            longitudes: longitudes of grid points
+
+        Returns:
+            positions of grid points
+
+        Raises:
+            ValueError: coordinates not on the grid
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        if np.array_equal(latitudes, self.latitudes) and np.array_equal(
+            longitudes, self.longitudes
+        ):
+            return np.arange(len(self))
+
+        order, keys = self._index
+        query = self._keys(latitudes, longitudes)
+        found = np.minimum(np.searchsorted(keys, query), max(len(keys) - 1, 0))
+
+        if len(query) and (len(keys) == 0 or not np.array_equal(keys[found], query)):
+            raise ValueError("Coordinates are not on the grid.")
+
+        return order[found] if len(keys) else found
+
+    def to_raster(
+        self,
+        values: Union[Sequence[float], np.ndarray],
+        positions: Optional[np.ndarray] = None,
+        dtype: Any = np.float32,
+    ) -> np.ndarray:
+        """Map values of grid points onto a raster of the structured grid.
+
+        Args:
+            values: values, with grid points along the last axis
+            positions: positions of the values on the grid, all grid points in
+                       grid order if not given
+            dtype: dtype of raster
+
+        Returns:
+            raster with rows and columns as the last two axes, NaN where a grid
+            point has no value
+
+        Raises:
+            ValueError
+        """
+        shape = self.shape
+        if shape is None:
+            raise ValueError("A raster needs a structured grid.")
+
+        values = np.asarray(values)
+        if positions is None:
+            if values.shape[-1] != len(self):
+                raise ValueError("Values do not match the grid geometry.")
+
+            return values.astype(dtype, copy=False).reshape(*values.shape[:-1], *shape)
+
+        raster = np.full(values.shape[:-1] + (len(self),), np.nan, dtype=dtype)
+        raster[..., positions] = values
+
+        return raster.reshape(*values.shape[:-1], *shape)
+
+    @cached_property
+    def _index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get sorted index of grid coordinates.
+
+        Returns:
+            positions of grid points in key order
+            sorted keys
+        """
+        keys = self._keys(self.latitudes, self.longitudes)
+        order = np.argsort(keys, kind="stable")
+
+        return order, keys[order]
+
+    @staticmethod
+    def _keys(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+        """Pack coordinates rounded to micro degrees into integer keys.
+
+        Args:
+            latitudes: latitudes
+            longitudes: longitudes
+
+        Returns:
+            keys
+        """
+        latitudes = np.round((np.asarray(latitudes) + 90) * 1e6).astype(np.int64)
+        longitudes = np.round((np.asarray(longitudes) + 180) * 1e6).astype(np.int64)
+
+        return latitudes * GRID_KEY_FACTOR + longitudes
+
+    @classmethod
+    def from_coordinates(cls, coordinates: Sequence[Sequence[float]]) -> "GridGeometry":
+        """Build grid geometry from a GeoJSON coordinate list.
+
+        Args:
+            coordinates: longitude and latitude pairs
+
+        Returns:
+            grid geometry
+        """
+        lonlat = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+        return cls(lonlat[:, 1], lonlat[:, 0])
+
+
+class GridSampler:
+    """Sampler of grid values at fixed sites.
+
+    The interpolation index of the sites is built once, then values of any
+    time and parameter on the same grid are sampled in one vectorised pass.
+    Nearest grid points are found with a bin index over the projected grid.
+    Bilinear sampling inverts the bilinear map of the surrounding grid cell,
+    so that it also works on curvilinear grids. Sites outside the grid get NaN.
+    """
+
+    def __init__(
+        self,
+        geometry: GridGeometry,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        method: SampleMethod = "bilinear",
+    ) -> None:
+        """Build interpolation index of sites.
+
+        Args:
+            geometry: grid geometry
+            latitudes: latitudes of sites
+            longitudes: longitudes of sites
+            method: sample method, bilinear or nearest
+
+        Raises:
+            ValueError
+        """
+        site_latitudes = np.asarray(latitudes, dtype=np.float64)
+        site_longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        if site_latitudes.shape != site_longitudes.shape or site_latitudes.ndim != 1:
+            raise ValueError("Latitudes and longitudes must be equally long 1D arrays.")
+
+        if method not in ("bilinear", "nearest"):
+            raise ValueError(f"Unknown sample method {method}.")
+
+        shape = geometry.shape
+        if method == "bilinear" and shape is None:
+            raise ValueError("Bilinear sampling needs a structured grid.")
+
+        self.geometry = geometry
+        self.method = method
+
+        points = geometry.project(geometry.latitudes, geometry.longitudes)
+        sites = geometry.project(site_latitudes, site_longitudes)
+        spacing = geometry.spacing
+        nearest, distances = self._nearest(points, sites, spacing)
+
+        if shape is not None and method == "bilinear":
+            self.indices, self.weights = self._bilinear(points, sites, nearest, shape)
+        else:
+            self.indices = nearest[:, None]
+            self.weights = np.where(distances <= spacing, 1.0, np.nan)[:, None]
+
+    def __len__(self) -> int:
+        """Get number of sites."""
+        return len(self.indices)
+
+    def __call__(self, values: Union[Sequence[float], np.ndarray]) -> np.ndarray:
+        """Sample grid values at the sites.
+
+        Args:
+            values: values of grid points, with grid points along the last axis
+
+        Returns:
+            values of sites, with sites along the last axis
+
+        Raises:
+            ValueError
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape[-1] != len(self.geometry):
+            raise ValueError("Values do not match the grid geometry.")
+
+        return (values[..., self.indices] * self.weights).sum(axis=-1)
+
+    @staticmethod
+    def _nearest(
+        points: np.ndarray, sites: np.ndarray, cell: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find nearest grid point of sites with a bin index.
+
+        Grid points are binned in square cells of the grid spacing, so that the
+        nearest grid point of a site inside the grid is in its own or a
+        neighbouring cell.
+
+        Args:
+            points: projected grid points
+            sites: projected sites
+            cell: size of bins in km
+
+        Returns:
+            position of nearest grid point of each site
+            distance in km to nearest grid point
+        """
+        if len(sites) == 0 or len(points) == 0:
+            return np.zeros(len(sites), dtype=np.int64), np.full(len(sites), np.inf)
+
+        cell = cell if cell > 0 else 1.0
+        origin = points.min(axis=0)
+        bins = np.floor((points - origin) / cell).astype(np.int64)
+        n_bins = bins.max(axis=0) + 3
+        point_ids = (bins[:, 1] + 1) * n_bins[0] + bins[:, 0] + 1
+        order = np.argsort(point_ids, kind="stable")
+        sorted_ids = point_ids[order]
+
+        site_bins = np.floor((sites - origin) / cell).astype(np.int64)
+        site_bins = np.clip(site_bins, -1, n_bins - 2)
+        offsets = np.array([(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)])
+        neighbours = site_bins[:, None, :] + offsets
+        inside = np.all((neighbours >= -1) & (neighbours < n_bins - 1), axis=-1)
+        neighbour_ids = np.where(
+            inside, (neighbours[..., 1] + 1) * n_bins[0] + neighbours[..., 0] + 1, -1
+        )
+
+        starts = np.searchsorted(sorted_ids, neighbour_ids, side="left")
+        ends = np.searchsorted(sorted_ids, neighbour_ids, side="right")
+        occupancy = max(int((ends - starts).max()), 1)
+        candidates = starts[..., None] + np.arange(occupancy)
+        valid = candidates < ends[..., None]
+        candidates = order[np.minimum(candidates, len(order) - 1)]
+
+        squared = ((points[candidates] - sites[:, None, None, :]) ** 2).sum(axis=-1)
+        squared = np.where(valid, squared, np.inf).reshape(len(sites), -1)
+        best = np.argmin(squared, axis=1)
+        nearest = candidates.reshape(len(sites), -1)[np.arange(len(sites)), best]
+
+        return nearest, np.sqrt(squared[np.arange(len(sites)), best])
+
+    @staticmethod
+    def _bilinear(
+        points: np.ndarray,
+        sites: np.ndarray,
+        nearest: np.ndarray,
+        shape: Tuple[int, int],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Find bilinear corners and weights of sites on a structured grid.
+
+        The four cells around the nearest grid point are tried. For each, the
+        cell coordinates of the site are found by Newton iteration on the
+        bilinear map of the cell, and the first cell containing the site is used.
+
+        Args:
+            points: projected grid points
+            sites: projected sites
+            nearest: position of nearest grid point of each site
+            shape: number of rows and columns of grid
+
+        Returns:
+            positions of the four corners of each site
+            bilinear weights of the corners, NaN for sites outside the grid
+        """
+        rows, columns = shape
+        row, column = np.divmod(nearest, columns)
+        cell_rows = row[:, None] + np.array([-1, -1, 0, 0])
+        cell_columns = column[:, None] + np.array([-1, 0, -1, 0])
+        valid = (
+            (cell_rows >= 0)
+            & (cell_rows < rows - 1)
+            & (cell_columns >= 0)
+            & (cell_columns < columns - 1)
+        )
+
+        corner = np.clip(cell_rows, 0, rows - 2) * columns + np.clip(
+            cell_columns, 0, columns - 2
+        )
+        corners = corner[..., None] + np.array([0, 1, columns, columns + 1])
+        p00, p01, p10, p11 = (points[corners[..., i]] for i in range(4))
+        site = sites[:, None, :]
+
+        s = np.full(corner.shape, 0.5)
+        t = np.full(corner.shape, 0.5)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for _ in range(GRID_BILINEAR_ITERATIONS):
+                s_, t_ = s[..., None], t[..., None]
+                residual = (
+                    (1 - s_) * (1 - t_) * p00
+                    + s_ * (1 - t_) * p01
+                    + (1 - s_) * t_ * p10
+                    + s_ * t_ * p11
+                    - site
+                )
+                ds = (1 - t_) * (p01 - p00) + t_ * (p11 - p10)
+                dt = (1 - s_) * (p10 - p00) + s_ * (p11 - p01)
+                determinant = ds[..., 0] * dt[..., 1] - ds[..., 1] * dt[..., 0]
+                s = (
+                    s
+                    - (residual[..., 0] * dt[..., 1] - residual[..., 1] * dt[..., 0])
+                    / determinant
+                )
+                t = (
+                    t
+                    - (ds[..., 0] * residual[..., 1] - ds[..., 1] * residual[..., 0])
+                    / determinant
+                )
+
+        tolerance = 1e-6
+        contains = (
+            valid
+            & (s >= -tolerance)
+            & (s <= 1 + tolerance)
+            & (t >= -tolerance)
+            & (t <= 1 + tolerance)
+        )
+        found = contains.any(axis=1)
+        cell = np.argmax(contains, axis=1)
+        sites_range = np.arange(len(sites))
+
+        s = np.clip(s[sites_range, cell], 0, 1)
+        t = np.clip(t[sites_range, cell], 0, 1)
+        weights = np.stack([(1 - s) * (1 - t), s * (1 - t), (1 - s) * t, s * t], 1)
+        weights[~found] = np.nan
+
+        return corners[sites_range, cell], weights
+
+
+class GridCube:
+    """Values of several parameters and times on one grid.
+
+    Values are kept in one dense array with axes time, parameter and grid point,
+    sharing the grid geometry. Selections return views of the array.
+    """
+
+    def __init__(
+        self,
+        times: Sequence[datetime],
+        parameters: Sequence[str],
+        geometry: GridGeometry,
+        values: Optional[np.ndarray] = None,
+        dtype: type = np.float32,
+    ) -> None:
+        """Initialise grid cube.
+
+        Args:
+            times: valid times, naive times are taken as UTC
+            parameters: parameters
+            geometry: grid geometry
+            values: values with shape time, parameter and grid point,
+                    filled with NaN if not given
+            dtype: dtype of values if not given
+
+        Raises:
+            ValueError
+        """
+        self.times = pd.DatetimeIndex([self._to_utc(t) for t in times])
+        self.parameters = pd.Index(list(parameters))
+        self.geometry = geometry
+        self.errors: Dict[Tuple[pd.Timestamp, str], Exception] = {}
+
+        shape = (len(self.times), len(self.parameters), len(geometry))
+        if values is None:
+            values = np.full(shape, np.nan, dtype=dtype)
+
+        if values.shape != shape:
+            raise ValueError(f"Values must have shape {shape}, got {values.shape}.")
+
+        self.values = values
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        """Get shape of values.
+
+        Returns:
+            number of times, parameters and grid points
+        """
+        return self.values.shape
+
+    def sel(
+        self,
+        time: Optional[Union[str, datetime]] = None,
+        parameter: Optional[str] = None,
+    ) -> np.ndarray:
+        """Select values by time and parameter.
+
+        Args:
+            time: valid time, all times if not given
+            parameter: parameter, all parameters if not given
+
+        Returns:
+            view of selected values
+        """
+        time_position = (
+            slice(None) if time is None else self.times.get_loc(self._to_utc(time))
+        )
+        parameter_position = (
+            slice(None) if parameter is None else self.parameters.get_loc(parameter)
+        )
+
+        return self.values[time_position, parameter_position]
+
+    def frame(self, time: Union[str, datetime]) -> pd.DataFrame:
+        """Get values of all parameters at a time, with coordinates.
+
+        Args:
+            time: valid time
+
+        Returns:
+            grid points with a column per parameter, lat and lon
+        """
+        columns = dict(zip(self.parameters, self.sel(time)))
+        columns["lat"] = self.geometry.latitudes
+        columns["lon"] = self.geometry.longitudes
+
+        return pd.DataFrame(columns, copy=False)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Get all values as a long table.
+
+        Returns:
+            values with a column per parameter, indexed by time and grid point
+        """
+        n_times, n_parameters, n_points = self.shape
+        index = pd.MultiIndex.from_product(
+            [self.times, range(n_points)], names=["time", "point"]
+        )
+
+        return pd.DataFrame(
+            self.values.transpose(0, 2, 1).reshape(-1, n_parameters),
+            index=index,
+            columns=self.parameters,
+        )
+
+    def sample(self, sampler: GridSampler) -> np.ndarray:
+        """Sample values at the sites of a sampler on the same grid.
+
+        Args:
+            sampler: grid sampler
+
+        Returns:
+            values with shape time, parameter and site
+        """
+        return sampler(self.values)
+
+    @staticmethod
+    def _to_utc(time: Union[str, datetime]) -> pd.Timestamp:
+        """Convert time to a UTC timestamp, taking naive times as UTC.
+
+        Args:
+            time: time
+
+        Returns:
+            UTC timestamp
+        """
+        timestamp = pd.Timestamp(time)
+        if timestamp.tzinfo is None:
+            return timestamp.tz_localize("UTC")
+
+        return timestamp.tz_convert("UTC")
+
+
+class GridGeometryCache:
+    """Cache of grid geometries keyed by category, version and downsample.
+
+    Geometries are kept in memory and, if a directory is given, stored as npz
+    files so that they survive between sessions. The grids are fixed, so
+    entries never expire.
+    """
+
+    def __init__(self, directory: Optional[Union[str, Path]] = None) -> None:
+        """Initialise grid geometry cache.
+
+        Args:
+            directory: directory to store geometries in, None keeps them in memory
+        """
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._entries: Dict[GridKey, GridGeometry] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get number of geometries in memory."""
+        return len(self._entries)
+
+    def get(self, key: GridKey) -> Optional[GridGeometry]:
+        """Get geometry of grid.
+
+        Args:
+            key: category, version and downsample of grid
+
+        Returns:
+            geometry or None if not stored
+        """
+        with self._lock:
+            geometry = self._entries.get(key)
+
+        if geometry is None and self.directory is not None:
+            geometry = self._read(self._path(self.directory, key))
+            if geometry is not None:
+                with self._lock:
+                    self._entries[key] = geometry
+
+        return geometry
+
+    def set(self, key: GridKey, geometry: GridGeometry) -> None:
+        """Store geometry of grid.
+
+        Args:
+            key: category, version and downsample of grid
+            geometry: geometry
+        """
+        with self._lock:
+            self._entries[key] = geometry
+
+        if self.directory is not None:
+            self._write(self._path(self.directory, key), geometry)
+
+    def clear(self) -> None:
+        """Remove all geometries."""
+        with self._lock:
+            self._entries.clear()
+
+        if self.directory is not None:
+            for path in self.directory.glob("*.npz"):
+                path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _path(directory: Path, key: GridKey) -> Path:
+        """Get path of stored geometry.
+
+        Args:
+            directory: directory of stored geometries
+            key: category, version and downsample of grid
+
+        Returns:
+            path
+        """
+        category, version, downsample = key
+        return directory / f"{category}_{version}_{downsample}.npz"
+
+    def _read(self, path: Path) -> Optional[GridGeometry]:
+        """Read stored geometry.
+
+        Args:
+            path: path of stored geometry
+
+        Returns:
+            geometry or None if not stored
+        """
+        try:
+            with np.load(path) as arrays:
+                return GridGeometry(arrays["latitudes"], arrays["longitudes"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _write(self, path: Path, geometry: GridGeometry) -> None:
+        """Write geometry atomically.
+
+        Args:
+            path: path of stored geometry
+            geometry: geometry
+        """
+        tmp_path = path.with_name(path.stem + f".{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, latitudes=geometry.latitudes, longitudes=geometry.longitudes)
+        os.replace(tmp_path, path)
+        logger.debug(f"Stored grid geometry {path.name}.")
+
+
+_grid_cache = GridGeometryCache()
+
+
+def get_grid_cache() -> GridGeometryCache:
+    """Get the grid geometry cache used by all clients.
+
+    Returns:
+        grid geometry cache
+    """
+    return _grid_cache
+
+
+def set_grid_cache(cache: Optional[GridGeometryCache]) -> None:
+    """Set the grid geometry cache used by all clients.
+
+    Args:
+        cache: grid geometry cache, None resets to a new in-memory cache
+    """
+    global _grid_cache
+
+    _grid_cache = GridGeometryCache() if cache is None else cache
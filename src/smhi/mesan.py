@@ -2,18 +2,29 @@
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple, Union
 
 import arrow
+import numpy as np
 import pandas as pd
 from requests.structures import CaseInsensitiveDict
 
 from smhi.constants import (
+    MESAN_CUBE_MAX_WORKERS,
     MESAN_LEVELS_UNIT,
     MESAN_PARAMETER_DESCRIPTIONS,
     MESAN_URL,
 )
+from smhi.grid import (
+    GridCube,
+    GridGeometry,
+    GridKey,
+    GridSampler,
+    SampleMethod,
+    get_grid_cache,
+)
 from smhi.models.mesan_model import (
     MesanCreatedTime,
     MesanGeoMultiPoint,
@@ -37,8 +48,12 @@ from smhi.utils import format_datetime, get_request
 logger = logging.getLogger(__name__)
 
 
-class Mesan:
-    """SMHI Mesan module."""
+class BaseMesan:
+    """Shared url building and parsing of the SMHI Mesan module.
+
+    Builds urls and response models but makes no requests,
+    see Mesan for the client.
+    """
 
     __parameters_model: Parameter = MesanParameter
     __created_time_model: ApprovedTime = MesanCreatedTime
@@ -52,13 +67,17 @@ class Mesan:
     _version: int = 2
     _base_url: str = MESAN_URL
     _parameter_descriptions: Dict[str, str] = MESAN_PARAMETER_DESCRIPTIONS
+    _cached_endpoints: tuple[str, ...] = (
+        "parameter.json",
+        "geotype/polygon.json",
+        "geotype/multipoint.json",
+    )
 
     def __init__(self) -> None:
-        """Initialise Mesan."""
+        """Initialise base Mesan."""
         self._base_url: str = self._base_url.format(
             category=self._category, version=self._version
         )
-        self._parameters = self._get_parameters()
 
     @property
     def parameter_descriptions(self) -> Dict[str, str]:
@@ -69,38 +88,38 @@ class Mesan:
         """
         return self._parameter_descriptions
 
-    @property
-    def parameters(self) -> Parameter:
-        """Get parameters from object state.
+    def _build_parameters(
+        self, url: str, data: dict, headers: Mapping[str, str], status: int
+    ) -> Parameter:
+        """Build parameters model from response.
 
-        Returns:
-            parameter model
-        """
-        return self._parameters
-
-    def _get_parameters(self) -> Parameter:
-        """Get parameters from SMHI.
+        Args:
+            url: url of request
+            data: data of response
+            headers: headers of response
+            status: status of response
 
         Returns:
             parameter model
         """
-        url = self._base_url + "parameter.json"
-        data, headers, status = self._get_data(url)
-
         return self.__parameters_model(
             url=url, status=status, headers=headers, parameter=data["parameter"]
         )
 
-    @property
-    def created_time(self) -> ApprovedTime:
-        """Get created time.
+    def _build_created_time(
+        self, url: str, data: dict, headers: Mapping[str, str], status: int
+    ) -> ApprovedTime:
+        """Build created time model from response.
+
+        Args:
+            url: url of request
+            data: data of response
+            headers: headers of response
+            status: status of response
 
         Returns:
             created time model
         """
-        url = self._base_url + "createdtime.json"
-        data, headers, status = self._get_data(url)
-
         return self.__created_time_model(
             url=url,
             status=status,
@@ -109,30 +128,38 @@ class Mesan:
             reference_time=data["referenceTime"],
         )
 
-    @property
-    def times(self) -> ValidTime:
-        """Get valid time.
+    def _build_times(
+        self, url: str, data: dict, headers: Mapping[str, str], status: int
+    ) -> ValidTime:
+        """Build valid time model from response.
+
+        Args:
+            url: url of request
+            data: data of response
+            headers: headers of response
+            status: status of response
 
         Returns:
             valid time model
         """
-        url = self._base_url + "times.json"
-        data, headers, status = self._get_data(url)
-
         return self.__times_model(
             url=url, status=status, headers=headers, times=data["time"]
         )
 
-    @property
-    def geo_polygon(self) -> GeoPolygon:
-        """Get geographic area polygon.
+    def _build_geo_polygon(
+        self, url: str, data: dict, headers: Mapping[str, str], status: int
+    ) -> GeoPolygon:
+        """Build geographic area polygon model from response.
+
+        Args:
+            url: url of request
+            data: data of response
+            headers: headers of response
+            status: status of response
 
         Returns:
             polygon model
         """
-        url = self._base_url + "geotype/polygon.json"
-        data, headers, status = self._get_data(url)
-
         return self.__geo_polygon_model(
             url=url,
             status=status,
@@ -141,19 +168,20 @@ class Mesan:
             coordinates=data["coordinates"],
         )
 
-    def get_geo_multipoint(self, downsample: int = 2) -> GeoMultiPoint:
-        """Get geographic area multipoint.
+    def _build_geo_multipoint(
+        self, url: str, data: dict, headers: Mapping[str, str], status: int
+    ) -> GeoMultiPoint:
+        """Build geographic area multipoint model from response.
 
         Args:
-            downsample: downsample parameter
+            url: url of request
+            data: data of response
+            headers: headers of response
+            status: status of response
 
         Returns:
             multipoint polygon model
         """
-        downsample = self._check_downsample(downsample)
-        url = self._base_url + f"geotype/multipoint.json?downsample={downsample}"
-        data, headers, status = self._get_data(url)
-
         return self.__geo_multipoint_model(
             url=url,
             status=status,
@@ -162,22 +190,28 @@ class Mesan:
             coordinates=data["coordinates"],
         )
 
-    def get_point(
+    def _build_point(
         self,
+        url: str,
+        data: dict,
+        headers: Mapping[str, str],
+        status: int,
         latitude: float,
         longitude: float,
     ) -> Point:
-        """Get data for given lon, lat and parameter.
+        """Build point data model from response.
 
         Args:
+            url: url of request
+            data: data of response
+            headers: headers of response
+            status: status of response
             latitude: latitude
             longitude: longitude
 
         Returns:
             point data model
         """
-        url = self._base_url + f"geotype/point/lon/{longitude}/lat/{latitude}/data.json"
-        data, headers, status = self._get_data(url)
         data_table = self._format_data_point(data)
         data["geometry"]["coordinates"] = [
             [data["geometry"]["coordinates"][0]],
@@ -196,34 +230,33 @@ class Mesan:
             df=data_table,
         )
 
-    def get_multipoint(
+    def _build_multipoint(
         self,
-        times: Union[str, datetime],
+        url: str,
+        data: dict,
+        headers: Mapping[str, str],
+        status: int,
         parameter: str,
-        geo: bool = True,
-        downsample: int = 2,
+        geo: bool,
+        downsample: int,
+        geometry: Optional[GridGeometry] = None,
     ) -> MultiPoint:
-        """Get multipoint data.
+        """Build multipoint data model from response.
 
         Args:
-            times: valid time
+            url: url of request
+            data: data of response
+            headers: headers of response
+            status: status of response
             parameter: parameter
             geo: fetch geography data
             downsample: downsample
+            geometry: grid geometry to attach, if the response has none
 
         Returns:
             multipoint data model
-
-        Raises:
-            ValueError
         """
-        times = format_datetime(times)
-        if self._check_times(times) is False:
-            raise ValueError(f"Invalid time {times}.")
-
-        url = self._build_multipoint_url(times, parameter, geo, downsample)
-        data, headers, status = self._get_data(url)
-        data_table = self._format_data_multipoint(data, parameter)
+        data_table = self._format_data_multipoint(data, parameter, geometry)
 
         return self.__multipoint_data_model(
             parameter=parameter,
@@ -239,6 +272,126 @@ class Mesan:
             df=data_table,
         )
 
+    def _build_point_url(self, latitude: float, longitude: float) -> str:
+        """Build point url.
+
+        Args:
+            latitude: latitude
+            longitude: longitude
+
+        Returns:
+            valid point url
+        """
+        return (
+            self._base_url + f"geotype/point/lon/{longitude}/lat/{latitude}/data.json"
+        )
+
+    def _build_geo_multipoint_url(self, downsample: int) -> str:
+        """Build geographic area multipoint url.
+
+        Args:
+            downsample: downsample
+
+        Returns:
+            valid geographic area multipoint url
+        """
+        downsample = self._check_downsample(downsample)
+        return self._base_url + f"geotype/multipoint.json?downsample={downsample}"
+
+    def _build_cube(
+        self,
+        times: Sequence[Union[str, datetime]],
+        parameters: Sequence[str],
+        downsample: int,
+        geometry: GridGeometry,
+    ) -> Tuple[GridCube, Dict[Tuple[int, int], str]]:
+        """Build empty cube and the multipoint urls of its values.
+
+        Args:
+            times: valid times
+            parameters: parameters
+            downsample: downsample
+            geometry: grid geometry
+
+        Returns:
+            cube filled with NaN
+            multipoint url by time and parameter position
+
+        Raises:
+            ValueError
+        """
+        urls = {}
+        for i, time in enumerate(times):
+            valid_time = format_datetime(time)
+            if self._check_times(valid_time) is False:
+                raise ValueError(f"Invalid time {valid_time}.")
+
+            for j, parameter in enumerate(parameters):
+                urls[i, j] = self._build_multipoint_url(
+                    valid_time, parameter, False, downsample
+                )
+
+        valid_times = [arrow.get(time).to("utc").datetime for time in times]
+
+        return GridCube(valid_times, parameters, geometry), urls
+
+    def _fill_cube(self, cube: GridCube, position: Tuple[int, int], data: dict) -> None:
+        """Fill cube with the values of a multipoint response.
+
+        Args:
+            cube: cube to fill
+            position: time and parameter position in cube
+            data: data of multipoint response
+
+        Raises:
+            ValueError
+        """
+        i, j = position
+        values = data["timeSeries"][0]["data"][cube.parameters[j]]
+
+        if len(values) != len(cube.geometry):
+            raise ValueError("Grid geometry does not match the multipoint data.")
+
+        cube.values[i, j] = values
+
+    def _report_cube_error(
+        self, cube: GridCube, position: Tuple[int, int], error: Exception
+    ) -> None:
+        """Log and record failed request of cube values, which are left as NaN.
+
+        Args:
+            cube: cube
+            position: time and parameter position in cube
+            error: error of request
+        """
+        time, parameter = cube.times[position[0]], cube.parameters[position[1]]
+        logger.warning(f"Could not get {parameter} at {time}: {error}")
+        cube.errors[time, parameter] = error
+
+    def _grid_key(self, downsample: int) -> GridKey:
+        """Get key of the multipoint grid in the grid geometry cache.
+
+        Args:
+            downsample: downsample
+
+        Returns:
+            category, version and bounded downsample
+        """
+        return self._category, self._version, self._check_downsample(downsample)
+
+    def _is_cached_endpoint(self, url: str) -> bool:
+        """Check if url is a rarely changing endpoint that can be cached.
+
+        Args:
+            url: url to check
+
+        Returns:
+            true if cacheable
+        """
+        return url.startswith(
+            tuple(self._base_url + endpoint for endpoint in self._cached_endpoints)
+        )
+
     def _check_downsample(self, downsample: int) -> int:
         """Check that downsample parameter is within valid bounds.
 
@@ -257,21 +410,6 @@ class Mesan:
         else:
             return downsample
 
-    def _get_data(self, url) -> tuple[dict[str, Any], CaseInsensitiveDict[str], bool]:
-        """Get requested data.
-
-        Args:
-            url: url to get from
-
-        Returns:
-            data of response
-            headers of response
-            status of response
-        """
-        response = get_request(url)
-
-        return json.loads(response.content), response.headers, response.status_code
-
     def _format_data_point(self, data: dict) -> pd.DataFrame:
         """Format data for point request.
 
@@ -281,40 +419,54 @@ class Mesan:
         Returns:
             data_table: pandas DataFrame
         """
-        # Convert timeSeries list to DataFrame
-        records = []
-        for item in data["timeSeries"]:
-            time = item["time"]
-            for key, value in item["data"].items():
-                records.append({"times": time, "name": key, "value": value})
+        time_series = data["timeSeries"]
+        names = sorted({name for item in time_series for name in item["data"]})
 
-        df_exploded = pd.DataFrame(records)
-        df_exploded["times"] = df_exploded["times"].apply(
-            lambda x: arrow.get(x).datetime
+        times = pd.to_datetime(
+            [item["time"] for item in time_series], format="ISO8601", utc=True
         )
-
-        data_table = df_exploded.pivot_table(
-            index="times", columns="name", values="value", aggfunc="first"
+        data_table = pd.DataFrame(
+            {name: [item["data"].get(name) for item in time_series] for name in names},
+            index=pd.DatetimeIndex(times, name="times"),
+            columns=pd.Index(names, name="name"),
+            dtype="float64",
         )
+        data_table = data_table[~data_table.index.duplicated(keep="first")]
 
-        return data_table
+        return data_table.sort_index()
 
-    def _format_data_multipoint(self, data: dict, param: str) -> Optional[pd.DataFrame]:
+    def _format_data_multipoint(
+        self, data: dict, param: str, geometry: Optional[GridGeometry] = None
+    ) -> Optional[pd.DataFrame]:
         """Format data for multipoint request.
 
+        Coordinates of a grid geometry are attached without copying.
+
         Args:
             data: data in dictionary
             param: parameter to extract
+            geometry: grid geometry to attach, if the response has none
 
         Returns:
             data_table: pandas DataFrame
+
+        Raises:
+            ValueError
         """
-        formatted_data = {"value": data["timeSeries"][0]["data"][param]}
+        values = np.asarray(data["timeSeries"][0]["data"][param], dtype=np.float64)
+        formatted_data = {"value": values}
+
         if "geometry" in data:
-            formatted_data["lat"] = [x[1] for x in data["geometry"]["coordinates"]]
-            formatted_data["lon"] = [x[0] for x in data["geometry"]["coordinates"]]
+            geometry = GridGeometry.from_coordinates(data["geometry"]["coordinates"])
 
-        return pd.DataFrame(formatted_data)
+        if geometry is not None:
+            if len(geometry) != len(values):
+                raise ValueError("Grid geometry does not match the multipoint data.")
+
+            formatted_data["lat"] = geometry.latitudes
+            formatted_data["lon"] = geometry.longitudes
+
+        return pd.DataFrame(formatted_data, copy=False)
 
     def _build_multipoint_url(
         self,
@@ -358,3 +510,239 @@ class Mesan:
         """
         times = format_datetime(test_time)
         return -1 < (arrow.now("Z").shift(hours=-1) - arrow.get(times)).days < 1
+
+
+class Mesan(BaseMesan):
+    """SMHI Mesan module."""
+
+    def __init__(self) -> None:
+        """Initialise Mesan."""
+        super().__init__()
+        self._parameters = self._get_parameters()
+
+    @property
+    def parameters(self) -> Parameter:
+        """Get parameters from object state.
+
+        Returns:
+            parameter model
+        """
+        return self._parameters
+
+    def _get_parameters(self) -> Parameter:
+        """Get parameters from SMHI.
+
+        Returns:
+            parameter model
+        """
+        url = self._base_url + "parameter.json"
+        return self._build_parameters(url, *self._get_data(url))
+
+    @property
+    def created_time(self) -> ApprovedTime:
+        """Get created time.
+
+        Returns:
+            created time model
+        """
+        url = self._base_url + "createdtime.json"
+        return self._build_created_time(url, *self._get_data(url))
+
+    @property
+    def times(self) -> ValidTime:
+        """Get valid time.
+
+        Returns:
+            valid time model
+        """
+        url = self._base_url + "times.json"
+        return self._build_times(url, *self._get_data(url))
+
+    @property
+    def geo_polygon(self) -> GeoPolygon:
+        """Get geographic area polygon.
+
+        Returns:
+            polygon model
+        """
+        url = self._base_url + "geotype/polygon.json"
+        return self._build_geo_polygon(url, *self._get_data(url))
+
+    def get_geo_multipoint(self, downsample: int = 2) -> GeoMultiPoint:
+        """Get geographic area multipoint.
+
+        Args:
+            downsample: downsample parameter
+
+        Returns:
+            multipoint polygon model
+        """
+        url = self._build_geo_multipoint_url(downsample)
+        return self._build_geo_multipoint(url, *self._get_data(url))
+
+    def get_grid_geometry(self, downsample: int = 2) -> GridGeometry:
+        """Get coordinates of the multipoint grid, cached after the first request.
+
+        Args:
+            downsample: downsample parameter
+
+        Returns:
+            grid geometry
+        """
+        key = self._grid_key(downsample)
+        geometry = get_grid_cache().get(key)
+
+        if geometry is None:
+            url = self._build_geo_multipoint_url(downsample)
+            data, _, _ = self._get_data(url)
+            geometry = GridGeometry.from_coordinates(data["coordinates"])
+            get_grid_cache().set(key, geometry)
+
+        return geometry
+
+    def get_cube(
+        self,
+        times: Sequence[Union[str, datetime]],
+        parameters: Sequence[str],
+        downsample: int = 2,
+        max_workers: int = MESAN_CUBE_MAX_WORKERS,
+    ) -> GridCube:
+        """Get multipoint data of several parameters and times as one cube.
+
+        Values are requested concurrently in a bounded thread pool and written
+        directly into the cube. A failing request is logged and reported in the
+        errors of the cube, leaving its values as NaN.
+
+        Args:
+            times: valid times
+            parameters: parameters
+            downsample: downsample
+            max_workers: maximum number of concurrent requests
+
+        Returns:
+            cube with values of shape time, parameter and grid point
+
+        Raises:
+            ValueError
+        """
+        geometry = self.get_grid_geometry(downsample)
+        cube, urls = self._build_cube(times, parameters, downsample, geometry)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                position: executor.submit(self._get_cube_values, cube, position, url)
+                for position, url in urls.items()
+            }
+
+            for position, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    self._report_cube_error(cube, position, e)
+
+        return cube
+
+    def get_sampler(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        downsample: int = 2,
+        method: SampleMethod = "bilinear",
+    ) -> GridSampler:
+        """Get sampler of multipoint values at many sites.
+
+        The sampler is built once from the cached grid geometry and can then
+        sample the values of any multipoint request with the same downsample.
+
+        Args:
+            latitudes: latitudes of sites
+            longitudes: longitudes of sites
+            downsample: downsample parameter
+            method: sample method, bilinear or nearest
+
+        Returns:
+            grid sampler
+        """
+        geometry = self.get_grid_geometry(downsample)
+        return GridSampler(geometry, latitudes, longitudes, method)
+
+    def get_point(
+        self,
+        latitude: float,
+        longitude: float,
+    ) -> Point:
+        """Get data for given lon, lat and parameter.
+
+        Args:
+            latitude: latitude
+            longitude: longitude
+
+        Returns:
+            point data model
+        """
+        url = self._build_point_url(latitude, longitude)
+        return self._build_point(url, *self._get_data(url), latitude, longitude)
+
+    def get_multipoint(
+        self,
+        times: Union[str, datetime],
+        parameter: str,
+        geo: bool = True,
+        downsample: int = 2,
+    ) -> MultiPoint:
+        """Get multipoint data.
+
+        Only values are requested. Coordinates are attached from the cached
+        grid geometry.
+
+        Args:
+            times: valid time
+            parameter: parameter
+            geo: attach coordinates of grid points
+            downsample: downsample
+
+        Returns:
+            multipoint data model
+
+        Raises:
+            ValueError
+        """
+        times = format_datetime(times)
+        if self._check_times(times) is False:
+            raise ValueError(f"Invalid time {times}.")
+
+        geometry = self.get_grid_geometry(downsample) if geo is True else None
+        url = self._build_multipoint_url(times, parameter, False, downsample)
+        return self._build_multipoint(
+            url, *self._get_data(url), parameter, geo, downsample, geometry
+        )
+
+    def _get_cube_values(
+        self, cube: GridCube, position: Tuple[int, int], url: str
+    ) -> None:
+        """Get multipoint values and fill them into cube.
+
+        Args:
+            cube: cube to fill
+            position: time and parameter position in cube
+            url: multipoint url
+        """
+        data, _, _ = self._get_data(url)
+        self._fill_cube(cube, position, data)
+
+    def _get_data(self, url) -> tuple[dict[str, Any], CaseInsensitiveDict[str], int]:
+        """Get requested data.
+
+        Only the rarely changing endpoints go through the response cache.
+
+        Args:
+            url: url to get from
+
+        Returns:
+            data of response
+            headers of response
+            status of response
+        """
+        response = get_request(url, use_cache=self._is_cached_endpoint(url))
+
+        return json.loads(response.content), response.headers, response.status_code
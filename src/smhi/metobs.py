@@ -3,13 +3,21 @@
 import io
 import logging
 from collections import defaultdict
-from typing import Any, Dict, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union, cast
 
 import pandas as pd
 from requests.structures import CaseInsensitiveDict
 
-from smhi.constants import METOBS_AVAILABLE_PERIODS
+from smhi.cache import MemoCache
+from smhi.constants import (
+    METOBS_AVAILABLE_PERIODS,
+    METOBS_BULK_MAX_WORKERS,
+    METOBS_CSV_ENGINE,
+    METOBS_STREAM_CHUNK_SIZE,
+)
 from smhi.models.metobs_model import (
+    MetobsBulkModel,
     MetobsCategoryModel,
     MetobsDataModel,
     MetobsLink,
@@ -18,11 +26,13 @@ from smhi.models.metobs_model import (
     MetobsStationModel,
     MetobsVersionModel,
 )
-from smhi.models.variable_model import MetobsModels
+from smhi.models.variable_model import CsvEngine, MetobsModels
 from smhi.utils import get_request
 
 logger = logging.getLogger(__name__)
 
+metobs_cache = MemoCache()
+
 
 class BaseMetobs:
     """BaseMetobs class."""
@@ -125,6 +135,22 @@ class Versions(BaseMetobs):
         self.url = url
         self.data = model.data
 
+    @classmethod
+    def cached(cls, data_type: str = "json") -> "Versions":
+        """Get versions from the in-process cache, fetching them if needed.
+
+        Every caller gets the same versions object, which must not be modified.
+
+        Args:
+            data_type: data_type of request
+
+        Returns:
+            versions object
+        """
+        return metobs_cache.get_or_set(
+            (cls.__name__, data_type), lambda: cls(data_type)
+        )
+
 
 class Parameters(BaseMetobs):
     """Get parameters for version 1 of Metobs API."""
@@ -156,7 +182,7 @@ class Parameters(BaseMetobs):
             raise NotImplementedError("Only supports version 1.0.")
 
         if versions_object is None:
-            versions_object = Versions()
+            versions_object = Versions.cached(data_type)
 
         url, _ = self._get_url(versions_object.data, "key", version, data_type)
         model = self._get_and_parse_request(url, MetobsVersionModel)
@@ -168,6 +194,28 @@ class Parameters(BaseMetobs):
         self.resource = model.resource
         self.data = model.data
 
+    @classmethod
+    def cached(
+        cls, version: Union[str, int] = "1.0", data_type: str = "json"
+    ) -> "Parameters":
+        """Get parameters from the in-process cache, fetching them if needed.
+
+        Every caller gets the same parameters object, which must not be modified.
+
+        Args:
+            version: selected version
+            data_type: data_type of request
+
+        Returns:
+            parameters object
+        """
+        version = "1.0" if version == 1 else version
+
+        return metobs_cache.get_or_set(
+            (cls.__name__, version, data_type),
+            lambda: cls(version=version, data_type=data_type),
+        )
+
 
 class Stations(BaseMetobs):
     """Get stations from parameter for version 1 of Metobs API."""
@@ -224,6 +272,39 @@ class Stations(BaseMetobs):
         self.station = model.station
         self.data = model.data
 
+    @classmethod
+    def cached(
+        cls,
+        parameter: Optional[int] = None,
+        parameter_title: Optional[str] = None,
+        version: Union[str, int] = "1.0",
+        data_type: str = "json",
+    ) -> "Stations":
+        """Get stations from the in-process cache, fetching them if needed.
+
+        Every caller gets the same stations object, which must not be modified.
+
+        Args:
+            parameter: integer parameter key to get
+            parameter_title: exact parameter title to get
+            version: selected version
+            data_type: data_type of request
+
+        Returns:
+            stations object
+        """
+        version = "1.0" if version == 1 else version
+
+        return metobs_cache.get_or_set(
+            (cls.__name__, version, parameter, parameter_title, data_type),
+            lambda: cls(
+                Parameters.cached(version, data_type),
+                parameter,
+                parameter_title,
+                data_type,
+            ),
+        )
+
 
 class Periods(BaseMetobs):
     """Get periods from station for version 1 of Metobs API.
@@ -295,6 +376,56 @@ class Periods(BaseMetobs):
         self.period = model.period
         self.data = model.data
 
+    @classmethod
+    def cached(
+        cls,
+        parameter: Optional[int] = None,
+        station: Optional[int] = None,
+        station_name: Optional[str] = None,
+        station_set: Optional[str] = None,
+        parameter_title: Optional[str] = None,
+        version: Union[str, int] = "1.0",
+        data_type: str = "json",
+    ) -> "Periods":
+        """Get periods from the in-process cache, fetching them if needed.
+
+        Every caller gets the same periods object, which must not be modified.
+
+        Args:
+            parameter: integer parameter key to get
+            station: integer station key to get
+            station_name: exact station name to get
+            station_set: station set to get
+            parameter_title: exact parameter title to get
+            version: selected version
+            data_type: data_type of request
+
+        Returns:
+            periods object
+        """
+        version = "1.0" if version == 1 else version
+        key = (
+            cls.__name__,
+            version,
+            parameter,
+            parameter_title,
+            station,
+            station_name,
+            station_set,
+            data_type,
+        )
+
+        return metobs_cache.get_or_set(
+            key,
+            lambda: cls(
+                Stations.cached(parameter, parameter_title, version, data_type),
+                station,
+                station_name,
+                station_set,
+                data_type,
+            ),
+        )
+
 
 class Data(BaseMetobs):
     """Get data from period for version 1 of Metobs API."""
@@ -303,12 +434,21 @@ class Data(BaseMetobs):
     _metobs_parameter_tim: List[str] = ["Datum", "Tid (UTC)"]
     _metobs_parameter_dygn: List[str] = ["Representativt dygn"]
     _metobs_parameter_manad: List[str] = ["Representativ månad"]
+    _metobs_date_format: str = "%Y-%m-%d"
+    _metobs_month_format: str = "%Y-%m"
+    _metobs_datetime_columns: List[str] = (
+        _metobs_parameter_tim
+        + _metobs_parameter_dygn
+        + _metobs_parameter_manad
+        + ["Från Datum Tid (UTC)", "Till Datum Tid (UTC)"]
+    )
 
     def __init__(
         self,
         periods_in_station: Periods,
         period: Optional[str] = None,
         data_type: str = "json",
+        engine: CsvEngine = METOBS_CSV_ENGINE,
     ) -> None:
         """Get data from period.
 
@@ -317,6 +457,7 @@ class Data(BaseMetobs):
             period: select period from:
                     latest-hour, latest-day, latest-months or corrected-archive
             data_type: data_type of request
+            engine: pandas CSV parser engine, one of c, pyarrow or python
 
         Raises:
             TypeError: data_type not supported
@@ -327,36 +468,16 @@ class Data(BaseMetobs):
         if data_type != "json":
             raise TypeError("Only json supported.")
 
-        if period is None:
-            period = periods_in_station.data[0]
-            logger.info(f"No period selected, selecting: {period}.")
-
-        if self._check_available_periods(periods_in_station.data, period):
-            logger.info(
-                "Found only one period to download. "
-                + f"Overriding the user selected {period} with the found {periods_in_station.data[0]}."
-            )
-            period = periods_in_station.data[0]
-
-        if period not in self._metobs_available_periods:
-            raise NotImplementedError(
-                "Select a supported period: "
-                + ", ".join([p for p in self._metobs_available_periods.keys()])
-            )
+        period = self._select_period(periods_in_station.data, period)
 
         self.periods_in_station = periods_in_station
         self.selected_period = period
+        self.engine = engine
 
         url, _ = self._get_url(periods_in_station.period, "key", period, data_type)
         model = self._get_and_parse_request(url, MetobsPeriodModel)
 
         data_model = self._get_data(model.data)
-        stationdata = data_model.stationdata
-        stationdata = self._clean_columns(stationdata)
-        stationdata = self._drop_nan(stationdata)
-
-        if self._has_datetime_columns(stationdata) is True and not stationdata.empty:
-            stationdata = self._set_dataframe_index(stationdata)
 
         self.url = url
 
@@ -365,9 +486,126 @@ class Data(BaseMetobs):
         self.station = data_model.station
         self.parameter = data_model.parameter
         self.period = data_model.period
-        self.df = stationdata
+        self.df = data_model.stationdata
+
+    @classmethod
+    def bulk(
+        cls,
+        stations_in_parameter: Stations,
+        station_ids: Optional[Sequence[int]] = None,
+        period: Optional[str] = None,
+        max_workers: int = METOBS_BULK_MAX_WORKERS,
+        data_type: str = "json",
+        engine: CsvEngine = METOBS_CSV_ENGINE,
+    ) -> MetobsBulkModel:
+        """Get data from many stations concurrently.
+
+        Periods and data of each station are fetched in a bounded thread pool.
+        A failing station is logged and reported without aborting the others.
+
+        Args:
+            stations_in_parameter: stations object
+            station_ids: integer station keys to get, defaults to all stations
+            period: select period from:
+                    latest-hour, latest-day, latest-months or corrected-archive
+            max_workers: maximum number of concurrent stations
+            data_type: data_type of request
+            engine: pandas CSV parser engine, one of c, pyarrow or python
+
+        Returns:
+            bulk model with data objects and errors keyed by station id
+        """
+        if station_ids is None:
+            station_ids = [station.id for station in stations_in_parameter.station]
+
+        bulk = MetobsBulkModel()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                station: executor.submit(
+                    cls._get_station,
+                    stations_in_parameter,
+                    station,
+                    period,
+                    data_type,
+                    engine,
+                )
+                for station in dict.fromkeys(station_ids)
+            }
+
+            for station, future in futures.items():
+                try:
+                    bulk.data[station] = future.result()
+                except Exception as e:
+                    logger.warning(f"Could not get data from station {station}: {e}")
+                    bulk.errors[station] = e
+
+        return bulk
+
+    @classmethod
+    def _get_station(
+        cls,
+        stations_in_parameter: Stations,
+        station: int,
+        period: Optional[str],
+        data_type: str,
+        engine: CsvEngine,
+    ) -> "Data":
+        """Get periods and data from station.
+
+        Args:
+            stations_in_parameter: stations object
+            station: integer station key to get
+            period: selected period
+            data_type: data_type of request
+            engine: pandas CSV parser engine
+
+        Returns:
+            data object
+        """
+        periods = Periods(stations_in_parameter, station, data_type=data_type)
+
+        return cls(periods, period, data_type, engine)
+
+    @classmethod
+    def _select_period(
+        cls, data: Tuple[Optional[str], ...], period: Optional[str]
+    ) -> str:
+        """Select period to download from the available periods.
+
+        Args:
+            data: available periods
+            period: select period from:
+                    latest-hour, latest-day, latest-months or corrected-archive
+
+        Returns:
+            selected period
+
+        Raises:
+            NotImplementedError: period not implemented
+        """
+        if period is None:
+            period = data[0]
+            logger.info(f"No period selected, selecting: {period}.")
+
+        if cls._check_available_periods(data, period):
+            logger.info(
+                "Found only one period to download. "
+                + f"Overriding the user selected {period} with the found {data[0]}."
+            )
+            period = data[0]
+
+        if period not in cls._metobs_available_periods:
+            raise NotImplementedError(
+                "Select a supported period: "
+                + ", ".join([p for p in cls._metobs_available_periods.keys()])
+            )
 
-    def _check_available_periods(self, data: Tuple[Optional[str]], period: str) -> bool:
+        return period
+
+    @classmethod
+    def _check_available_periods(
+        cls, data: Tuple[Optional[str], ...], period: Optional[str]
+    ) -> bool:
         """Check available periods.
 
         Args:
@@ -381,7 +619,7 @@ class Data(BaseMetobs):
         return (
             len(data) == 1
             and data[0] != period
-            and period in self._metobs_available_periods
+            and period in cls._metobs_available_periods
         )
 
     def _get_data(
@@ -396,6 +634,26 @@ class Data(BaseMetobs):
         Returns:
             data model
         """
+        link = self._get_data_link(raw_data, type)
+
+        return self._request_and_parse(link)
+
+    @classmethod
+    def _get_data_link(
+        cls, raw_data: list[MetobsLink], type: str = "text/plain"
+    ) -> str:
+        """Get link to the selected data file.
+
+        Args:
+            raw_data: raw data
+            type: type of request
+
+        Returns:
+            link to data file
+
+        Raises:
+            NotImplementedError
+        """
         link = [
             link.href for item in raw_data for link in item.link if link.type == type
         ]
@@ -407,50 +665,279 @@ class Data(BaseMetobs):
                 "Found several CSV files to download, this is currently not supported."
             )
 
-        csv_content = self._request_and_decode(link[0])
+        return link[0]
+
+    @classmethod
+    def _parse_data(
+        cls, csv_content: list[str], engine: CsvEngine = METOBS_CSV_ENGINE
+    ) -> MetobsDataModel:
+        """Parse decoded CSV files into a data model with indexed station data.
+
+        Args:
+            csv_content: decoded list of csv files
+            engine: pandas CSV parser engine
 
+        Returns:
+            data model
+        """
         # these are the two cases I've found. Generalise if there are others
         if len(csv_content) == 2:
-            data_model = MetobsDataModel(
-                parameter=self._parse_csv(csv_content[0]),
-                stationdata=self._parse_csv(csv_content[1]),
-            )
+            metadata, stationdata = csv_content[:1], csv_content[1]
         else:
-            data_model = MetobsDataModel(
-                station=self._parse_csv(csv_content[0]),
-                parameter=self._parse_csv(csv_content[1]),
-                period=self._parse_csv(csv_content[2]),
-                stationdata=self._parse_csv(csv_content[3]),
-            )
+            metadata, stationdata = csv_content[:3], csv_content[3]
+
+        data_model = cls._build_data_model([cls._parse_csv(csv) for csv in metadata])
+        data_model.stationdata = cls._parse_stationdata(
+            stationdata, stationdata.split("\n", 1)[0], data_model.parameter, engine
+        )
 
         return data_model
 
-    def _parse_csv(self, csv) -> pd.DataFrame:
+    @classmethod
+    def _parse_stream(
+        cls, chunks: Iterable[bytes], engine: CsvEngine = METOBS_CSV_ENGINE
+    ) -> MetobsDataModel:
+        """Parse streamed CSV file into a data model with indexed station data.
+
+        The small metadata sections are read line by line, while the station data
+        section is fed straight from the stream into the CSV parser.
+
+        Args:
+            chunks: byte chunks of the CSV file
+            engine: pandas CSV parser engine
+
+        Returns:
+            data model
+        """
+        text = io.TextIOWrapper(
+            io.BufferedReader(_ChunkReader(chunks)), encoding="utf-8"
+        )
+        sections: list[str] = []
+        lines: list[str] = []
+
+        for line in iter(text.readline, ""):
+            if line.strip() == "":
+                if lines:
+                    sections.append("".join(lines))
+                    lines = []
+                continue
+
+            if not lines and cls._is_data_header(line):
+                data_model = cls._build_data_model(
+                    [cls._parse_csv(csv) for csv in sections[:3]]
+                )
+                data_model.stationdata = cls._parse_stationdata(
+                    cast(IO[str], _PrependedReader(line, text)),
+                    line,
+                    data_model.parameter,
+                    engine,
+                )
+                return data_model
+
+            lines.append(line)
+
+        if lines:
+            sections.append("".join(lines))
+
+        return cls._parse_data(sections, engine)
+
+    @classmethod
+    def _build_data_model(cls, metadata: list[pd.DataFrame]) -> MetobsDataModel:
+        """Build data model from parsed metadata sections.
+
+        Args:
+            metadata: parsed metadata sections
+
+        Returns:
+            data model without station data
+        """
+        if len(metadata) == 1:
+            return MetobsDataModel(parameter=metadata[0])
+
+        return MetobsDataModel(
+            station=metadata[0], parameter=metadata[1], period=metadata[2]
+        )
+
+    @classmethod
+    def _parse_stationdata(
+        cls,
+        csv: Union[str, IO[str]],
+        header: str,
+        parameter: Optional[pd.DataFrame],
+        engine: CsvEngine,
+    ) -> pd.DataFrame:
+        """Parse station data section with explicit dtypes and index it.
+
+        Args:
+            csv: csv string or text stream, starting with the header
+            header: header line of the section
+            parameter: parsed parameter section
+            engine: pandas CSV parser engine
+
+        Returns:
+            station data dataframe
+        """
+        dtype = cls._get_dtypes(header.rstrip("\n").split(";"), parameter)
+
+        if engine == "pyarrow":
+            # pyarrow skips every row shorter than the header
+            stationdata = cls._parse_csv(
+                cls._drop_extra_columns(csv, header), engine, dtype
+            )
+        else:
+            stationdata = cls._clean_columns(cls._parse_csv(csv, engine, dtype))
+
+        stationdata = cls._drop_nan(stationdata)
+
+        if cls._has_datetime_columns(stationdata) is True and not stationdata.empty:
+            stationdata = cls._set_dataframe_index(stationdata)
+
+        return stationdata
+
+    @classmethod
+    def _drop_extra_columns(cls, csv: Union[str, IO[str]], header: str) -> IO[str]:
+        """Drop non-data columns from the header and the first rows.
+
+        Only the header and the first rows carry the trailing Tidsutsnitt
+        columns, all later rows have the data columns only.
+
+        Args:
+            csv: csv string or text stream, starting with the header
+            header: header line of the section
+
+        Returns:
+            text stream with the data columns only
+        """
+        if isinstance(csv, str):
+            csv = io.StringIO(csv)
+
+        columns = header.rstrip("\n").split(";")
+        n_cols = columns.index("") if "" in columns else len(columns) - 1
+
+        lines = []
+        for line in iter(csv.readline, ""):
+            fields = line.rstrip("\n").split(";")
+            if len(fields) <= n_cols:
+                lines.append(line)
+                break
+            lines.append(";".join(fields[:n_cols]) + "\n")
+
+        return cast(IO[str], _PrependedReader("".join(lines), csv))
+
+    @classmethod
+    def _get_dtypes(
+        cls, columns: list[str], parameter: Optional[pd.DataFrame]
+    ) -> Dict[str, Any]:
+        """Get dtypes of the known station data columns.
+
+        Datetime columns are kept as strings and parsed when indexing, values
+        of the parameter are floats and quality codes are categories.
+
+        Args:
+            columns: columns of the header
+            parameter: parsed parameter section
+
+        Returns:
+            dtype by column
+        """
+        values = set()
+        if parameter is not None and "Parameternamn" in parameter.columns:
+            values = set(parameter["Parameternamn"])
+
+        dtype: Dict[str, Any] = {}
+        for column in columns:
+            if column in cls._metobs_datetime_columns:
+                dtype[column] = str
+            elif column in values:
+                dtype[column] = "float64"
+            elif column == "Kvalitet":
+                dtype[column] = "category"
+
+        # the last column holds free text about the period and is always dropped
+        if columns[-1] != "":
+            dtype[columns[-1]] = str
+
+        return dtype
+
+    @classmethod
+    def _is_data_header(cls, line: str) -> bool:
+        """Check if line is the header of the station data section.
+
+        Args:
+            line: line of CSV file
+
+        Returns:
+            boolean
+        """
+        columns = line.rstrip("\n").split(";")
+        return any(
+            c in columns
+            for c in cls._metobs_parameter_tim
+            + cls._metobs_parameter_dygn
+            + cls._metobs_parameter_manad
+        )
+
+    @classmethod
+    def _parse_csv(
+        cls,
+        csv: Union[str, IO[str]],
+        engine: CsvEngine = "c",
+        dtype: Optional[Dict[str, Any]] = None,
+    ) -> pd.DataFrame:
         """Parse CSV files with pandas.
 
         Args:
-            csv: csv string
+            csv: csv string or text stream
+            engine: pandas CSV parser engine
+            dtype: dtype by column
 
         Returns:
             pandas dataframe
         """
-        return pd.read_csv(io.StringIO(csv), sep=";", on_bad_lines="skip")
+        if isinstance(csv, str):
+            csv = io.StringIO(csv)
+
+        return pd.read_csv(
+            csv, sep=";", on_bad_lines="skip", engine=engine, dtype=dtype
+        )
 
-    def _request_and_decode(self, link: str) -> list[str]:
-        """Request CSV and decode it.
+    def _request_and_parse(self, link: str) -> MetobsDataModel:
+        """Request CSV and parse it while it is downloaded.
 
         Args:
             link: link to fetch from
 
+        Returns:
+            data model
+        """
+        response = get_request(link, use_cache=False, stream=True)
+
+        try:
+            return self._parse_stream(
+                response.iter_content(chunk_size=METOBS_STREAM_CHUNK_SIZE), self.engine
+            )
+        finally:
+            response.close()
+
+    @classmethod
+    def _decode(cls, content: bytes) -> list[str]:
+        """Decode CSV response into its sections.
+
+        Args:
+            content: content of response
+
         Returns:
             decoded list of csv files
         """
-        response = get_request(link)
-        return response.content.decode("utf-8").split("\n\n")
+        return content.decode("utf-8").split("\n\n")
 
-    def _set_dataframe_index(self, stationdata: pd.DataFrame) -> pd.DataFrame:
+    @classmethod
+    def _set_dataframe_index(cls, stationdata: pd.DataFrame) -> pd.DataFrame:
         """Set dataframe index based on datetime column.
 
+        Date and time columns are combined column-wise and each unique value
+        is parsed only once with an explicit format.
+
         Args:
             data: station dataframe
 
@@ -461,26 +948,73 @@ class Data(BaseMetobs):
             TypeError
         """
         columns = stationdata.columns
-        if any([c for c in self._metobs_parameter_tim if c in columns]):
-            datetime_columns = self._metobs_parameter_tim
-        elif any([c for c in self._metobs_parameter_dygn if c in columns]):
-            datetime_columns = self._metobs_parameter_dygn
-        elif any([c for c in self._metobs_parameter_manad if c in columns]):
-            datetime_columns = self._metobs_parameter_manad
+        if any([c for c in cls._metobs_parameter_tim if c in columns]):
+            datetime_columns = cls._metobs_parameter_tim
+            date, time = datetime_columns
+            index = cls._parse_datetime(
+                stationdata[date], cls._metobs_date_format
+            ) + cls._parse_unique(stationdata[time])
+        elif any([c for c in cls._metobs_parameter_dygn if c in columns]):
+            datetime_columns = cls._metobs_parameter_dygn
+            index = cls._parse_datetime(
+                stationdata[datetime_columns[0]], cls._metobs_date_format
+            )
+        elif any([c for c in cls._metobs_parameter_manad if c in columns]):
+            datetime_columns = cls._metobs_parameter_manad
+            index = cls._parse_datetime(
+                stationdata[datetime_columns[0]], cls._metobs_month_format
+            )
         else:
             raise TypeError("Can't parse type.")
 
-        stationdata.set_index(
-            pd.to_datetime(
-                stationdata[datetime_columns].agg(" ".join, axis=1), utc=True
-            ),
-            inplace=True,
-        )
+        stationdata.set_index(index, inplace=True)
         stationdata.drop(datetime_columns, axis=1, inplace=True)
 
         return stationdata
 
-    def _drop_nan(self, df: pd.DataFrame, n_cols: int = 2) -> pd.DataFrame:
+    @classmethod
+    def _parse_datetime(cls, column: pd.Series, format: str) -> pd.DatetimeIndex:
+        """Parse datetime column, falling back to an inferred format.
+
+        Args:
+            column: column of datetime strings
+            format: expected format
+
+        Returns:
+            UTC datetime index
+        """
+        try:
+            return cls._parse_unique(column, format)
+        except ValueError:
+            logger.debug(f"Column {column.name} doesn't match {format}, inferring.")
+            return cls._parse_unique(column, "mixed")
+
+    @classmethod
+    def _parse_unique(cls, column: pd.Series, format: Optional[str] = None) -> Any:
+        """Parse each unique value of a column only once.
+
+        Args:
+            column: column of strings
+            format: datetime format, or None to parse durations
+
+        Returns:
+            parsed values in the order of the column
+        """
+        codes, uniques = pd.factorize(column)
+
+        # missing values have code -1, which picks the appended NaT
+        parsed: pd.Index
+        if format is None:
+            parsed = pd.to_timedelta(uniques).append(pd.TimedeltaIndex([pd.NaT]))
+        else:
+            parsed = pd.to_datetime(uniques, format=format, utc=True).append(
+                pd.DatetimeIndex([pd.NaT], tz="UTC")
+            )
+
+        return parsed[codes]
+
+    @classmethod
+    def _drop_nan(cls, df: pd.DataFrame, n_cols: int = 2) -> pd.DataFrame:
         """Drop nan from dataframe rows by first first n cols.
 
         Args:
@@ -493,7 +1027,8 @@ class Data(BaseMetobs):
 
         return df
 
-    def _clean_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+    @classmethod
+    def _clean_columns(cls, df: pd.DataFrame) -> pd.DataFrame:
         """Clean dataframe from non-data columns.
 
         Always drop the last column.
@@ -503,12 +1038,15 @@ class Data(BaseMetobs):
         """
         df = df.iloc[:, :-1]
         columns = df.columns
-        remove_columns = [col for col in columns if "unnamed" in col.lower()]
+        remove_columns = [
+            col for col in columns if col == "" or "unnamed" in col.lower()
+        ]
         df.drop(columns=remove_columns, inplace=True)
 
         return df
 
-    def _has_datetime_columns(self, df: pd.DataFrame) -> bool:
+    @classmethod
+    def _has_datetime_columns(cls, df: pd.DataFrame) -> bool:
         """Check if datafram has any datetime column.
 
         Args:
@@ -517,9 +1055,103 @@ class Data(BaseMetobs):
         return any(
             [
                 c
-                for c in self._metobs_parameter_tim
-                + self._metobs_parameter_dygn
-                + self._metobs_parameter_manad
+                for c in cls._metobs_parameter_tim
+                + cls._metobs_parameter_dygn
+                + cls._metobs_parameter_manad
                 if c in df.columns
             ]
         )
+
+
+class _ChunkReader(io.RawIOBase):
+    """Readable raw stream over an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        """Initialise chunk reader.
+
+        Args:
+            chunks: byte chunks
+        """
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        """Stream is readable."""
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """Read bytes into buffer.
+
+        Args:
+            buffer: buffer to read into
+
+        Returns:
+            number of bytes read, zero at the end of the stream
+        """
+        while not self._buffer:
+            self._buffer = next(self._chunks, b"")
+            if not self._buffer:
+                return 0
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+
+        return size
+
+
+class _PrependedReader(io.TextIOBase):
+    """Text stream reading an already consumed line before the rest of a stream."""
+
+    def __init__(self, head: str, stream: IO[str]) -> None:
+        """Initialise prepended reader.
+
+        Args:
+            head: text to read first
+            stream: text stream to read after head
+        """
+        self._head = head
+        self._stream = stream
+
+    def readable(self) -> bool:
+        """Stream is readable."""
+        return True
+
+    def read(self, size: Optional[int] = -1, /) -> str:
+        """Read at most size characters, or all if size is negative.
+
+        Args:
+            size: number of characters
+
+        Returns:
+            text
+        """
+        if size is None:
+            size = -1
+
+        if not self._head:
+            return self._stream.read(size)
+
+        if size < 0:
+            head, self._head = self._head, ""
+            return head + self._stream.read()
+
+        head, self._head = self._head[:size], self._head[size:]
+
+        return head
+
+    def readline(self, size: Optional[int] = -1, /) -> str:  # type: ignore[override]
+        """Read one line.
+
+        Args:
+            size: maximum number of characters
+
+        Returns:
+            line
+        """
+        if not self._head:
+            return self._stream.readline(-1 if size is None else size)
+
+        head, self._head = self._head, ""
+
+        return head
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 from pydantic import BaseModel, ConfigDict, Field, field_validator
@@ -209,3 +209,33 @@ class MetobsDataModel(BaseModel):
     parameter: Optional[pd.DataFrame] = None
     period: Optional[pd.DataFrame] = None
     stationdata: Optional[pd.DataFrame] = None
+
+
+class MetobsBulkModel(BaseModel):
+    """Bulk data model, holding data and failures keyed by station id."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    data: Dict[int, Any] = Field(default_factory=dict)
+    errors: Dict[int, Exception] = Field(default_factory=dict)
+
+    @property
+    def frames(self) -> Dict[int, pd.DataFrame]:
+        return {station: data.df for station, data in self.data.items()}
+
+    @property
+    def df(self) -> pd.DataFrame:
+        if len(self.data) == 0:
+            return pd.DataFrame()
+
+        return pd.concat(self.frames, names=["station", None])
+
+
+class MetobsSyncState(BaseModel):
+    """Sync state of a station and parameter."""
+
+    parameter: int
+    station: int
+    period: str
+    last_time: Optional[datetime] = None
+    synced_at: datetime
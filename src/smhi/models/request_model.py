@@ -0,0 +1,35 @@
+import random
+from typing import Tuple
+
+from pydantic import BaseModel, Field
+
+from smhi.constants import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_RETRY_BACKOFF,
+    HTTP_RETRY_BACKOFF_MAX,
+    HTTP_RETRY_MAX_ATTEMPTS,
+    HTTP_RETRY_STATUS,
+)
+
+
+class RetryPolicy(BaseModel):
+    """Retry policy for GET requests."""
+
+    max_attempts: int = Field(default=HTTP_RETRY_MAX_ATTEMPTS, ge=1)
+    backoff: float = Field(default=HTTP_RETRY_BACKOFF, ge=0)
+    backoff_max: float = Field(default=HTTP_RETRY_BACKOFF_MAX, ge=0)
+    jitter: bool = True
+    respect_retry_after: bool = True
+    retry_status: Tuple[int, ...] = HTTP_RETRY_STATUS
+    connect_timeout: float = HTTP_CONNECT_TIMEOUT
+    read_timeout: float = HTTP_READ_TIMEOUT
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return self.connect_timeout, self.read_timeout
+
+    def delay(self, attempt: int) -> float:
+        """Exponential backoff for a failed attempt, with full jitter if enabled."""
+        delay = min(self.backoff_max, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, delay) if self.jitter else delay
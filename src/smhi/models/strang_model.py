@@ -1,10 +1,10 @@
 from datetime import datetime
-from typing import Annotated, Callable, Dict, Optional
+from typing import Annotated, Callable, Dict, List, Optional, Tuple
 
 import pandas as pd
 import pandera.pandas as pa
 from pandera.typing import DataFrame, Index, Series
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class StrangPointSchema(pa.DataFrameModel):
@@ -67,3 +67,43 @@ class StrangMultiPoint(BaseModel):
     status: int
     headers: Dict[str, str]
     df: Optional[DataFrame[StrangMultiPointSchema]]
+
+
+class StrangBulkPoint(BaseModel):
+    """Bulk point model, holding points and failures keyed by site and parameter.
+
+    Sites are positions in the requested coordinates. Sites in the same grid
+    cell share the point of the first site in the cell, see sites.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    latitudes: List[float]
+    longitudes: List[float]
+    sites: List[int]
+    data: Dict[Tuple[int, int], StrangPoint] = Field(default_factory=dict)
+    errors: Dict[Tuple[int, int], Exception] = Field(default_factory=dict)
+
+    @property
+    def frames(self) -> Dict[Tuple[int, int], pd.Series]:
+        return {
+            key: point.df["value"]
+            for key, point in self.data.items()
+            if point.df is not None
+        }
+
+    @property
+    def df(self) -> pd.DataFrame:
+        frames = self.frames
+        if len(frames) == 0:
+            return pd.DataFrame()
+
+        return pd.concat(frames, axis=1, names=["site", "parameter"]).sort_index(axis=1)
+
+    @property
+    def long_df(self) -> pd.DataFrame:
+        frames = self.frames
+        if len(frames) == 0:
+            return pd.DataFrame()
+
+        return pd.concat(frames, names=["site", "parameter"]).to_frame()
@@ -1,6 +1,6 @@
 """Type variables."""
 
-from typing import TypeVar
+from typing import Literal, TypeVar
 
 from smhi.models.mesan_model import (
     MesanCreatedTime,
@@ -46,3 +46,5 @@ GeoPolygon = TypeVar("GeoPolygon", MesanGeoPolygon, MetfctsGeoPolygon)
 GeoMultiPoint = TypeVar("GeoMultiPoint", MesanGeoMultiPoint, MetfctsGeoMultiPoint)
 Point = TypeVar("Point", MesanPoint, MetfctsPoint)
 MultiPoint = TypeVar("MultiPoint", MesanMultiPoint, MetfctsMultiPoint)
+
+CsvEngine = Literal["c", "pyarrow", "python"]
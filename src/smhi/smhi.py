@@ -1,14 +1,13 @@
 """Read SMHI data."""
 
 import logging
-import time
-from typing import Any, List, Optional, Tuple
+from typing import Any, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
-from geopy import distance
-from geopy.extra.rate_limiter import RateLimiter
-from geopy.geocoders import Nominatim
 
+from smhi.constants import IDW_MIN_DISTANCE
+from smhi.geo import StationIndex, get_geocoder
 from smhi.metobs import Data, Parameters, Periods, Stations
 from smhi.models.metobs_model import MetobsLinks
 
@@ -24,7 +23,7 @@ class SMHI:
         Raises:
             ValueError
         """
-        self.parameters = Parameters()
+        self.parameters = Parameters.cached()
 
         if self.parameters is None:
             raise ValueError("No parameters available.")
@@ -38,7 +37,7 @@ class SMHI:
         Returns:
             stations
         """
-        return Stations(self.parameters, parameter).data
+        return Stations.cached(parameter).data
 
     def get_stations_from_title(self, title: Optional[str] = None) -> List[MetobsLinks]:
         """Get stations from title.
@@ -49,7 +48,29 @@ class SMHI:
         Returns:
             stations
         """
-        return Stations(self.parameters, parameter_title=title).data
+        return Stations.cached(parameter_title=title).data
+
+    def get_nearest_stations(
+        self,
+        parameter: int,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        k: int = 1,
+    ) -> pd.DataFrame:
+        """Get the k nearest stations of parameter for many sites.
+
+        Args:
+            parameter: station parameter
+            latitudes: latitudes of sites
+            longitudes: longitudes of sites
+            k: number of stations per site
+
+        Returns:
+            station id, name and distance in km, indexed by site and rank
+        """
+        stations = Stations.cached(parameter)
+
+        return StationIndex.of(stations).nearest_many(latitudes, longitudes, k)
 
     def get_data(
         self,
@@ -67,8 +88,8 @@ class SMHI:
         Returns:
             data
         """
-        stations = Stations(Parameters(), parameter)
-        periods = Periods(stations, station)
+        stations = Stations.cached(parameter)
+        periods = Periods.cached(parameter, station)
         data = Data(periods)
 
         return self._interpolate(distance, stations, periods, data)
@@ -89,13 +110,72 @@ class SMHI:
         Returns:
             data
         """
-        stations = Stations(Parameters(), parameter)
+        stations = Stations.cached(parameter)
         station = self._find_stations_by_city(stations, city, distance)[0][0]
-        periods = Periods(stations, station)
+        periods = Periods.cached(parameter, station)
         data = Data(periods)
 
         return self._interpolate(distance, stations, periods, data)
 
+    def get_interpolated_data(
+        self,
+        parameter: int,
+        latitude: float,
+        longitude: float,
+        distance: float = 50,
+        k: Optional[int] = None,
+        power: float = 2,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """Get inverse distance weighted estimate of parameter at a location.
+
+        Data of all stations within distance are aligned on the union of their
+        timestamps. Each timestamp is estimated from the stations with data for it,
+        weighted by the inverse distance to the power of power. A power of zero
+        gives the plain mean of the k nearest stations.
+
+        Args:
+            parameter: data parameter
+            latitude: latitude of location
+            longitude: longitude of location
+            distance: maximum station distance in km
+            k: maximum number of nearest stations, defaults to all within distance
+            power: power of inverse distance weights
+            period: select period from:
+                    latest-hour, latest-day, latest-months or corrected-archive
+
+        Returns:
+            estimate and number of contributing stations per timestamp
+
+        Raises:
+            ValueError
+        """
+        stations = Stations.cached(parameter)
+        nearby_stations = self._find_stations_from_gps(
+            stations, latitude, longitude, distance
+        )[:k]
+
+        bulk = Data.bulk(stations, [s[0] for s in nearby_stations], period)
+        distances = {s[0]: s[2] for s in nearby_stations}
+        series = {
+            station: data.df.select_dtypes("number").iloc[:, 0]
+            for station, data in bulk.data.items()
+            if not data.df.select_dtypes("number").empty
+        }
+
+        if len(series) == 0:
+            raise ValueError(f"No data within {distance} km of location.")
+
+        column = next(iter(series.values())).name
+        values = pd.concat(series, axis=1).sort_index()
+        estimate, count = self._idw(
+            values.to_numpy(dtype=np.float64),
+            np.array([distances[s] for s in values.columns], dtype=np.float64),
+            power,
+        )
+
+        return pd.DataFrame({column: estimate, "stations": count}, index=values.index)
+
     def _find_stations_from_gps(
         self,
         station_response: Stations,
@@ -117,19 +197,12 @@ class SMHI:
         if not dist:
             dist = 0
 
-        user_pos = (latitude, longitude)
-        all_stations = station_response.station
-        nearby_stations = [
-            (s.id, s.name, distance.distance(user_pos, (s.latitude, s.longitude)).km)
-            for s in all_stations
-        ]
+        index = StationIndex.of(station_response)
 
         if dist == 0:
-            return [min(nearby_stations, key=lambda x: x[2])]
-
-        nearby_stations = [x for x in nearby_stations if x[2] <= dist]
+            return index.nearest(latitude, longitude, geodesic=True)
 
-        return sorted(nearby_stations, key=lambda x: x[2])
+        return index.within(latitude, longitude, dist, geodesic=True)
 
     def _find_stations_by_city(
         self, station_response: Stations, city: str, dist: float = 0
@@ -144,12 +217,10 @@ class SMHI:
         Returns:
             nearby stations
         """
-        geolocator = Nominatim(user_agent="ifk-smhi")
-        geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
-        loc = geocode(city)
+        latitude, longitude = get_geocoder().geocode(city)
 
         return self._find_stations_from_gps(
-            station_response, latitude=loc.latitude, longitude=loc.longitude, dist=dist
+            station_response, latitude=latitude, longitude=longitude, dist=dist
         )
 
     def _interpolate(
@@ -163,31 +234,116 @@ class SMHI:
             return data
 
         lat, lon = (periods.position[0].latitude, periods.position[0].longitude)
-        missing_df = self._find_missing_data(data.df)
         all_nearby_stations = self._find_stations_from_gps(stations, lat, lon, distance)
 
-        for nearby_station in all_nearby_stations[1:]:
-            time.sleep(1)
-            nearby_data = Data(Periods(stations, nearby_station[0]))
-            data.df = self._iterate_over_time(data.df, nearby_data.df, missing_df)
-            missing_df = self._find_missing_data(data.df)
+        if not self._find_missing_data(data.df).empty:
+            station_ids = [station[0] for station in all_nearby_stations[1:]]
+            nearby_data = Data.bulk(stations, station_ids).data
+            data.df = self._fill_gaps(
+                data.df, [nearby_data[i].df for i in station_ids if i in nearby_data]
+            )
 
         data.df = data.df.sort_index()
 
         return data
 
-    def _iterate_over_time(
-        self, df: pd.DataFrame, nearby_df: pd.DataFrame, missing_df: pd.DataFrame
+    def _fill_gaps(
+        self, df: pd.DataFrame, nearby_dfs: Sequence[pd.DataFrame]
     ) -> pd.DataFrame:
-        """Iterate over time."""
-        for tajm, _ in missing_df.iterrows():
-            earliertime = df[df.index < tajm].index.max()
-            condition = (nearby_df.index > earliertime) & (nearby_df.index < tajm)
+        """Fill gaps in data with observations from nearby stations.
+
+        Gaps are detected once in the original data. Each timestamp inside a gap
+        is filled at most once, from the nearest station that has data for it.
+
+        Args:
+            df: data to fill
+            nearby_dfs: data of nearby stations, nearest first
+
+        Returns:
+            filled data
+        """
+        starts, ends = self._find_gaps(df.index)
+        if len(starts) == 0:
+            return df
+
+        filled = [df]
+        taken = df.index
+        for nearby_df in nearby_dfs:
+            times = self._to_datetime64(nearby_df.index)
+            position = np.searchsorted(starts, times, side="left") - 1
+            in_gap = (position >= 0) & (times < ends[np.maximum(position, 0)])
+
+            rows = nearby_df[in_gap]
+            rows = rows[~rows.index.isin(taken) & ~rows.index.duplicated()]
+            if rows.empty:
+                continue
+
+            filled.append(rows)
+            taken = taken.append(rows.index)
+
+        if len(filled) == 1:
+            return df
+
+        filled_df = pd.concat(filled, axis=0, join="outer")
+
+        for column in df.select_dtypes("category").columns:
+            filled_df[column] = filled_df[column].astype("category")
+
+        return filled_df
+
+    def _find_gaps(self, index: pd.Index) -> Tuple[np.ndarray, np.ndarray]:
+        """Find gaps longer than the median time step.
+
+        Args:
+            index: datetime index
+
+        Returns:
+            start times of gaps in UTC
+            end times of gaps in UTC
+        """
+        times = np.sort(self._to_datetime64(index))
+        steps = np.diff(times)
+
+        if len(steps) == 0:
+            return steps, steps
+
+        gaps = steps > np.median(steps)
+
+        return times[:-1][gaps], times[1:][gaps]
+
+    def _to_datetime64(self, index: pd.Index) -> np.ndarray:
+        """Convert datetime index to a comparable array of UTC datetimes.
+
+        Args:
+            index: datetime index, naive or timezone aware
+
+        Returns:
+            datetime64 array
+        """
+        return pd.DatetimeIndex(index).to_numpy(dtype="datetime64[ns]")
+
+    def _idw(
+        self, values: np.ndarray, distances: np.ndarray, power: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Inverse distance weighted mean over stations, ignoring missing values.
+
+        Args:
+            values: values with a row per timestamp and a column per station
+            distances: distances in km of stations
+            power: power of inverse distance weights
+
+        Returns:
+            weighted mean per timestamp, nan where no station has data
+            number of stations with data per timestamp
+        """
+        weights = np.maximum(distances, IDW_MIN_DISTANCE) ** -power
+        available = ~np.isnan(values)
+        weight_sums = available @ weights
 
-            if len(nearby_df[condition]) > 0:
-                df = pd.concat([df, nearby_df], axis=0, join="outer")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            estimate = np.where(available, values, 0.0) @ weights / weight_sums
 
-        return df
+        return estimate, available.sum(axis=1)
 
     def _find_missing_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Find missing data."""
@@ -0,0 +1,427 @@
+"""Compact on-disk store of grid values."""
+
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Literal, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from smhi.constants import GRID_STORE_STEP
+from smhi.grid import GridCube, GridGeometry, GridSampler
+
+logger = logging.getLogger(__name__)
+
+
+class GridStore:
+    """Archive of grid values in memory-mapped float32 files.
+
+    The grid geometry is stored once. Values are stored per parameter in one
+    file per month, with a row of all grid points per time step, next to a mask
+    of the written time steps. Reads map the files with np.memmap, so a time
+    slice reads its rows only and a point history reads only the pages holding
+    the requested grid points.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        geometry: Optional[GridGeometry] = None,
+        step: timedelta = GRID_STORE_STEP,
+    ) -> None:
+        """Open or create store.
+
+        Args:
+            directory: directory of store
+            geometry: grid geometry, required when creating a store
+            step: time step of stored values, must divide a day
+
+        Raises:
+            ValueError
+        """
+        self.directory = Path(directory)
+        meta_path = self.directory / "store.json"
+
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            with np.load(self.directory / "geometry.npz") as arrays:
+                self.geometry = GridGeometry(arrays["latitudes"], arrays["longitudes"])
+            self.step = timedelta(seconds=meta["step"])
+
+            if geometry is not None and not self._same_geometry(geometry):
+                raise ValueError("Grid geometry differs from the stored geometry.")
+
+            return None
+
+        if geometry is None:
+            raise ValueError(f"No store in {self.directory}, a geometry is required.")
+
+        if step <= timedelta(0) or timedelta(days=1) % step:
+            raise ValueError("Time step must divide a day.")
+
+        self.geometry = geometry
+        self.step = step
+        self.directory.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            self.directory / "geometry.npz",
+            latitudes=geometry.latitudes,
+            longitudes=geometry.longitudes,
+        )
+        meta_path.write_text(
+            json.dumps({"step": step.total_seconds(), "points": len(geometry)})
+        )
+
+    def write(
+        self,
+        parameter: str,
+        time: Union[str, datetime],
+        values: Union[Sequence[float], np.ndarray],
+    ) -> None:
+        """Write values of all grid points of a parameter at a time.
+
+        Args:
+            parameter: parameter
+            time: valid time, naive times are taken as UTC
+            values: values of grid points
+
+        Raises:
+            ValueError
+        """
+        values = np.asarray(values, dtype=np.float32)
+        if values.shape != (len(self.geometry),):
+            raise ValueError("Values do not match the grid geometry.")
+
+        self._write(parameter, [GridCube._to_utc(time)], values[None])
+
+    def write_cube(self, cube: GridCube) -> None:
+        """Write all values of a cube.
+
+        Args:
+            cube: cube on the grid of the store
+
+        Raises:
+            ValueError
+        """
+        if not self._same_geometry(cube.geometry):
+            raise ValueError("Grid geometry differs from the stored geometry.")
+
+        for j, parameter in enumerate(cube.parameters):
+            positions = [
+                i
+                for i, time in enumerate(cube.times)
+                if (time, parameter) not in cube.errors
+            ]
+            self._write(
+                parameter,
+                [cube.times[i] for i in positions],
+                cube.values[positions, j],
+            )
+
+    def read(
+        self,
+        parameters: Sequence[str],
+        start: Union[str, datetime],
+        end: Union[str, datetime],
+    ) -> GridCube:
+        """Read values of all grid points between two times.
+
+        Only times written for at least one of the parameters are returned,
+        values not written are NaN.
+
+        Args:
+            parameters: parameters
+            start: first valid time, inclusive
+            end: last valid time, inclusive
+
+        Returns:
+            cube of values
+        """
+        times, rows = self._read_rows(parameters, start, end, slice(None))
+        return GridCube(times, parameters, self.geometry, rows)
+
+    def read_points(
+        self,
+        parameter: str,
+        positions: Sequence[int],
+        start: Union[str, datetime],
+        end: Union[str, datetime],
+    ) -> pd.DataFrame:
+        """Read time series of grid points between two times.
+
+        Args:
+            parameter: parameter
+            positions: positions of grid points
+            start: first valid time, inclusive
+            end: last valid time, inclusive
+
+        Returns:
+            values with a column per grid point, indexed by time
+        """
+        columns = np.asarray(positions, dtype=np.int64)
+        times, rows = self._read_rows([parameter], start, end, columns)
+
+        return pd.DataFrame(rows[:, 0], index=times.rename("time"), columns=columns)
+
+    def sample(
+        self,
+        parameter: str,
+        sampler: GridSampler,
+        start: Union[str, datetime],
+        end: Union[str, datetime],
+    ) -> pd.DataFrame:
+        """Read time series at the sites of a sampler between two times.
+
+        Only the grid points used by the sampler are read.
+
+        Args:
+            parameter: parameter
+            sampler: grid sampler on the grid of the store
+            start: first valid time, inclusive
+            end: last valid time, inclusive
+
+        Returns:
+            values with a column per site, indexed by time
+
+        Raises:
+            ValueError
+        """
+        if not self._same_geometry(sampler.geometry):
+            raise ValueError("Grid geometry differs from the stored geometry.")
+
+        columns, inverse = np.unique(sampler.indices, return_inverse=True)
+        times, rows = self._read_rows([parameter], start, end, columns)
+        values = rows[:, 0][:, inverse.reshape(sampler.indices.shape)]
+
+        return pd.DataFrame(
+            (values * sampler.weights).sum(axis=-1), index=times.rename("time")
+        )
+
+    def _write(
+        self, parameter: str, times: Sequence[pd.Timestamp], rows: np.ndarray
+    ) -> None:
+        """Write rows of a parameter, mapping each month once.
+
+        Args:
+            parameter: parameter
+            times: UTC times of rows
+            rows: values with a row per time
+
+        Raises:
+            ValueError
+        """
+        located = [self._locate(time) for time in times]
+
+        for month in dict.fromkeys(month for month, _ in located):
+            positions = [i for i, (m, _) in enumerate(located) if m == month]
+            slots = [located[i][1] for i in positions]
+            data, mask = self._map(parameter, month, "r+")
+
+            data[slots] = rows[positions]
+            mask[slots] = 1
+            data.flush()
+            mask.flush()
+
+    def _read_rows(
+        self,
+        parameters: Sequence[str],
+        start: Union[str, datetime],
+        end: Union[str, datetime],
+        columns: Union[slice, np.ndarray],
+    ) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """Read written rows of parameters between two times.
+
+        Args:
+            parameters: parameters
+            start: first valid time, inclusive
+            end: last valid time, inclusive
+            columns: grid point columns to read
+
+        Returns:
+            written times
+            values with shape time, parameter and column
+        """
+        n_columns = len(np.arange(len(self.geometry))[columns])
+        times, blocks = [], []
+
+        for month, first, last in self._chunks(start, end):
+            chunks = [
+                self._map(p, month, "r") if self._exists(p, month) else None
+                for p in parameters
+            ]
+            written = np.zeros(last - first, dtype=bool)
+            for chunk in chunks:
+                if chunk is not None:
+                    written |= chunk[1][first:last].astype(bool)
+
+            slots = first + np.flatnonzero(written)
+            if len(slots) == 0:
+                continue
+
+            block = np.full(
+                (len(slots), len(parameters), n_columns), np.nan, dtype=np.float32
+            )
+            for j, chunk in enumerate(chunks):
+                if chunk is not None:
+                    data, mask = chunk
+                    rows = (
+                        data[slots, columns]
+                        if isinstance(columns, slice)
+                        else data[np.ix_(slots, columns)]
+                    )
+                    block[:, j] = rows
+                    block[mask[slots] == 0, j] = np.nan
+
+            times.append(
+                month + pd.to_timedelta(slots * self.step.total_seconds(), "s")
+            )
+            blocks.append(block)
+
+        if len(blocks) == 0:
+            empty = np.empty((0, len(parameters), n_columns), dtype=np.float32)
+            return pd.DatetimeIndex([], tz="UTC"), empty
+
+        return pd.DatetimeIndex(np.concatenate(times)), np.concatenate(blocks)
+
+    def _paths(self, parameter: str, month: pd.Timestamp) -> Tuple[Path, Path]:
+        """Get paths of values and mask of a parameter and month.
+
+        Args:
+            parameter: parameter
+            month: first time of month
+
+        Returns:
+            values path
+            mask path
+        """
+        data_path = self.directory / parameter / f"{month:%Y-%m}.f32"
+        return data_path, data_path.with_suffix(".mask")
+
+    def _exists(self, parameter: str, month: pd.Timestamp) -> bool:
+        """Check if a parameter and month is stored.
+
+        Args:
+            parameter: parameter
+            month: first time of month
+
+        Returns:
+            true if stored
+        """
+        return self._paths(parameter, month)[1].exists()
+
+    def _map(
+        self, parameter: str, month: pd.Timestamp, mode: Literal["r", "r+"]
+    ) -> Tuple[np.memmap, np.memmap]:
+        """Map values and mask of a parameter and month, creating missing files.
+
+        Args:
+            parameter: parameter
+            month: first time of month
+            mode: r to read, r+ to write
+
+        Returns:
+            values and mask
+        """
+        data_path, mask_path = self._paths(parameter, month)
+        n_slots = self._slots(month)
+
+        if not mask_path.exists():
+            data_path.parent.mkdir(parents=True, exist_ok=True)
+            self._create(data_path, n_slots * len(self.geometry) * 4)
+            self._create(mask_path, n_slots)
+            logger.debug(f"Created {parameter} chunk {month:%Y-%m}.")
+
+        return (
+            np.memmap(
+                data_path,
+                dtype=np.float32,
+                mode=mode,
+                shape=(n_slots, len(self.geometry)),
+            ),
+            np.memmap(mask_path, dtype=np.uint8, mode=mode, shape=(n_slots,)),
+        )
+
+    def _create(self, path: Path, size: int) -> None:
+        """Create a zero filled file, sparse where the file system supports it.
+
+        Args:
+            path: path of file
+            size: size in bytes
+        """
+        tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.truncate(size)
+        os.replace(tmp_path, path)
+
+    def _chunks(
+        self, start: Union[str, datetime], end: Union[str, datetime]
+    ) -> Iterator[Tuple[pd.Timestamp, int, int]]:
+        """Iterate over months and their slot ranges between two times.
+
+        Args:
+            start: first valid time, inclusive
+            end: last valid time, inclusive
+
+        Yields:
+            first time of month, first slot and slot after last
+        """
+        first_time, last_time = GridCube._to_utc(start), GridCube._to_utc(end)
+        month = first_time.normalize().replace(day=1)
+
+        while month <= last_time:
+            next_month = month + pd.offsets.MonthBegin(1)
+            first = max(0, -((month - first_time) // self.step))
+            last = min(self._slots(month), (last_time - month) // self.step + 1)
+
+            if first < last:
+                yield month, first, last
+
+            month = next_month
+
+    def _locate(self, time: pd.Timestamp) -> Tuple[pd.Timestamp, int]:
+        """Locate the month and slot of a time.
+
+        Args:
+            time: UTC time
+
+        Returns:
+            first time of month
+            slot of time in month
+
+        Raises:
+            ValueError
+        """
+        month = time.normalize().replace(day=1)
+        slot, remainder = divmod(time - month, self.step)
+
+        if remainder:
+            raise ValueError(f"Time {time} is not on the time step of the store.")
+
+        return month, slot
+
+    def _slots(self, month: pd.Timestamp) -> int:
+        """Get number of time steps in month.
+
+        Args:
+            month: first time of month
+
+        Returns:
+            number of time steps
+        """
+        return (month + pd.offsets.MonthBegin(1) - month) // self.step
+
+    def _same_geometry(self, geometry: GridGeometry) -> bool:
+        """Check if geometry is the stored geometry.
+
+        Args:
+            geometry: grid geometry
+
+        Returns:
+            true if equal
+        """
+        return geometry is self.geometry or (
+            np.array_equal(geometry.latitudes, self.geometry.latitudes)
+            and np.array_equal(geometry.longitudes, self.geometry.longitudes)
+        )
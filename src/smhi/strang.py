@@ -5,41 +5,65 @@ See validation of model: https://strang.smhi.se/validation/validation.html
 
 import json
 import logging
+import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from functools import partial
-from typing import Any, Optional
+from typing import Any, Literal, Mapping, Optional, Sequence, Tuple
 
 import arrow
+import numpy as np
 import pandas as pd
 from requests.structures import CaseInsensitiveDict
 
 from smhi.constants import (
+    STRANG_AGGREGATION_FREQUENCIES,
+    STRANG_GRID_PARAMETER,
+    STRANG_GRID_VALID_TIME,
     STRANG_MULTIPOINT_URL,
     STRANG_PARAMETERS,
     STRANG_POINT_URL,
+    STRANG_POINTS_MAX_WORKERS,
     STRANG_TIME_INTERVALS,
+    STRANG_WINDOW_MAX_WORKERS,
 )
+from smhi.grid import GridGeometry, GridKey, GridSampler, get_grid_cache
+from smhi.models.request_model import RetryPolicy
 from smhi.models.strang_model import (
+    StrangBulkPoint,
     StrangMultiPoint,
     StrangParameter,
     StrangPoint,
 )
-from smhi.utils import format_datetime, get_request
+from smhi.utils import (
+    TRANSIENT_EXCEPTIONS,
+    RetryableHTTPError,
+    _get_retry_delay,
+    format_datetime,
+    get_request,
+    get_retry_policy,
+)
 
 logger = logging.getLogger(__name__)
 
+Aggregation = Literal["mean", "sum", "energy"]
+
 
 class RequestType(Enum):
     POINT = 1
     MULTIPOINT = 2
 
 
-class Strang:
-    """SMHI Strang class. Only supports category strang1g and version 1."""
+class BaseStrang:
+    """Shared url building and parsing of the SMHI Strang class.
+
+    Builds urls and response models but makes no requests,
+    see Strang for the client.
+    """
 
     def __init__(self) -> None:
-        """Initialise Strang object."""
+        """Initialise base Strang object."""
         self._category = "strang1g"
         self._version = 1
 
@@ -73,16 +97,147 @@ class Strang:
 
         return list(self._available_parameters.keys())
 
-    def get_point(
+    def to_raster(
+        self, multipoint: StrangMultiPoint, dtype: Any = np.float32
+    ) -> np.ndarray:
+        """Map multipoint data onto a raster of the Strang grid.
+
+        Args:
+            multipoint: strang multipoint model
+            dtype: dtype of raster
+
+        Returns:
+            raster of rows and columns, NaN where a grid point has no value
+
+        Raises:
+            ValueError: grid not structured or coordinates not on the grid
+        """
+        return self.to_rasters([multipoint], dtype)[0]
+
+    def to_rasters(
+        self, multipoints: Sequence[StrangMultiPoint], dtype: Any = np.float32
+    ) -> np.ndarray:
+        """Stack multipoint data of several times into rasters of the Strang grid.
+
+        The grid is taken from the grid geometry cache, or from the first
+        multipoint data if not cached. Values are copied into one preallocated
+        array, located on the grid without a lookup when their coordinates are
+        in grid order.
+
+        Args:
+            multipoints: strang multipoint models
+            dtype: dtype of rasters
+
+        Returns:
+            rasters of shape time, rows and columns, NaN where a grid point has
+            no value
+
+        Raises:
+            ValueError: grid not structured or coordinates not on the grid
+        """
+        geometry, values = self._stack_multipoints(multipoints, dtype)
+
+        return geometry.to_raster(values, dtype=dtype)
+
+    def aggregate_point(
+        self,
+        point: StrangPoint,
+        time_interval: str = "daily",
+        how: Aggregation = "mean",
+        timezone: str = "UTC",
+    ) -> pd.DataFrame:
+        """Aggregate point data into hourly, daily or monthly values.
+
+        Values are binned by their time in the given timezone, so that days and
+        months follow local midnight, including days of 23 or 25 hours at
+        daylight saving changes.
+
+        Args:
+            point: strang point model
+            time_interval: interval to aggregate to
+                           [valid values: hourly, daily, monthly]
+            how: mean, sum, or energy as the time integral of hourly values,
+                 e.g. in Wh/m² for irradiance in W/m², NaN in intervals
+                 with missing values
+            timezone: timezone of days and months, e.g. Europe/Stockholm
+
+        Returns:
+            aggregated values indexed by the local start of each interval
+
+        Raises:
+            ValueError: wrong interval or aggregation, or energy of data that
+                        is not hourly
+        """
+        if point.df is None:
+            return pd.DataFrame(
+                {"value": []}, index=pd.DatetimeIndex([], tz=timezone, name="date_time")
+            )
+
+        return self._aggregate(
+            point.df[["value"]], point.time_interval, time_interval, how, timezone
+        )
+
+    def aggregate_multipoint(
+        self,
+        multipoints: Sequence[StrangMultiPoint],
+        time_interval: str = "daily",
+        how: Aggregation = "mean",
+        timezone: str = "UTC",
+    ) -> pd.DataFrame:
+        """Aggregate multipoint data of several times into intervals.
+
+        The multipoint data are stacked on the Strang grid, see to_rasters,
+        and aggregated for all grid points at once.
+
+        Args:
+            multipoints: strang multipoint models of the same parameter
+            time_interval: interval to aggregate to
+                           [valid values: hourly, daily, monthly]
+            how: mean, sum, or energy as the time integral of hourly values,
+                 e.g. in Wh/m² for irradiance in W/m², NaN in intervals
+                 with missing values
+            timezone: timezone of days and months, e.g. Europe/Stockholm
+
+        Returns:
+            aggregated values with a column per grid point, indexed by the local
+            start of each interval, see Strang.get_grid_geometry for the grid
+
+        Raises:
+            ValueError: wrong interval or aggregation, energy of data that is
+                        not hourly, or multipoint data without valid time
+        """
+        if any(multipoint.valid_time is None for multipoint in multipoints):
+            raise ValueError("Multipoint data must have a valid time.")
+
+        intervals = {multipoint.time_interval for multipoint in multipoints}
+        if len(intervals) > 1:
+            raise ValueError("Multipoint data must have the same time interval.")
+
+        _, values = self._stack_multipoints(multipoints, np.float64)
+        times = pd.DatetimeIndex(
+            [pd.Timestamp(multipoint.valid_time) for multipoint in multipoints]
+        )
+        data = pd.DataFrame(
+            values,
+            index=times.tz_convert("UTC"),
+            columns=pd.RangeIndex(values.shape[1], name="point"),
+            copy=False,
+        )
+
+        return self._aggregate(
+            data.sort_index(), next(iter(intervals), None), time_interval, how, timezone
+        )
+
+    def _prepare_point(
         self,
         latitude: float,
         longitude: float,
         parameter: int,
-        time_from: Optional[str] = None,
-        time_to: Optional[str] = None,
-        time_interval: Optional[str] = None,
-    ) -> StrangPoint:
-        """Get data for given lon, lat and parameter.
+        time_from: Optional[str],
+        time_to: Optional[str],
+        time_interval: Optional[str],
+    ) -> tuple[StrangParameter, str, Optional[str], Optional[str]]:
+        """Validate point request and build its url.
 
         Args:
             latitude: latitude
@@ -94,18 +249,16 @@ class Strang:
                            [valid values: hourly, daily, monthly] (optional)
 
         Returns:
-            strange point model
+            strang parameter
+            url
+            parsed time from
+            parsed time to
 
         Raises:
             ValueError: wrong value of latitude and/or longitude
             NotImplementedError: parameter not supported
         """
-        strang_parameter = self._available_parameters[parameter]
-        if strang_parameter.key is None:
-            raise NotImplementedError(
-                "Parameter not implemented."
-                + " Try client.parameters to list available parameters."
-            )
+        strang_parameter = self._get_parameter(parameter)
 
         if longitude is None or latitude is None:
             raise ValueError("Wrong value of latitude and/or longitude provided.")
@@ -116,26 +269,13 @@ class Strang:
         raw_url = self._point_raw_url
         url = self._build_base_point_url(raw_url, strang_parameter, longitude, latitude)
         url = self._build_time_point_url(url, time_from, time_to, time_interval)
-        data, header, status = self._get_and_load_data(url, RequestType["POINT"])
 
-        return StrangPoint(
-            parameter_key=strang_parameter.key,
-            parameter_meaning=strang_parameter.meaning,
-            longitude=longitude,
-            latitude=latitude,
-            time_from=time_from,
-            time_to=time_to,
-            time_interval=time_interval,
-            url=url,
-            status=status,
-            headers=header,
-            df=data,
-        )
+        return strang_parameter, url, time_from, time_to
 
-    def get_multipoint(
-        self, parameter: int, valid_time: str, time_interval: Optional[str] = None
-    ) -> StrangMultiPoint:
-        """Get full spatial data for given parameter and time.
+    def _prepare_multipoint(
+        self, parameter: int, valid_time: str, time_interval: Optional[str]
+    ) -> tuple[StrangParameter, str, str]:
+        """Validate multipoint request and build its url.
 
         Args:
             parameter: parameter
@@ -145,18 +285,15 @@ class Strang:
                             daily, monthly] (optional)
 
         Returns:
-            strange multipoint model
+            strang parameter
+            url
+            parsed valid time
 
         Raises:
             TypeError: wrong type of valid time
             NotImplementedError: parameter not supported
         """
-        strang_parameter = self._available_parameters[parameter]
-        if strang_parameter.key is None:
-            raise NotImplementedError(
-                "Parameter not implemented."
-                + " Try client.parameters to list available parameters."
-            )
+        strang_parameter = self._get_parameter(parameter)
 
         try:
             valid_time = arrow.get(valid_time).isoformat()
@@ -166,19 +303,346 @@ class Strang:
         raw_url = self._multipoint_raw_url
         url = self._build_base_multipoint_url(raw_url, strang_parameter, valid_time)
         url = self._build_time_multipoint_url(url, time_interval)
-        data, header, status = self._get_and_load_data(url, RequestType["MULTIPOINT"])
 
+        return strang_parameter, url, valid_time
+
+    def _prepare_windows(
+        self,
+        parameter: StrangParameter,
+        latitude: float,
+        longitude: float,
+        time_from: Optional[str],
+        time_to: Optional[str],
+        time_interval: Optional[str],
+        window: str,
+    ) -> list[str]:
+        """Split point request into urls of consecutive time windows.
+
+        Windows start at the boundaries of the given frequency, the first window
+        starts at time from and the last ends at time to. Consecutive windows
+        share their boundary, which is removed when the windows are joined.
+
+        Args:
+            parameter: strang parameter
+            latitude: latitude
+            longitude: longitude
+            time_from: parsed time from, defaults to first time of parameter
+            time_to: parsed time to, defaults to now
+            time_interval: interval of data
+            window: pandas frequency of windows, e.g. YS for calendar years
+
+        Returns:
+            urls of windows in time order
+
+        Raises:
+            ValueError: window not a valid frequency
+        """
+        start = pd.Timestamp(time_from or parameter.time_from)
+        end = pd.Timestamp(time_to or parameter.time_to()).floor("s")
+        edges = pd.DatetimeIndex([start, end]).union(
+            pd.date_range(start, end, freq=window)
+        )
+
+        base_url = self._build_base_point_url(
+            self._point_raw_url, parameter, longitude, latitude
+        )
+        return [
+            self._build_time_point_url(
+                base_url, first.isoformat(), last.isoformat(), time_interval
+            )
+            for first, last in zip(edges[:-1], edges[1:])
+        ]
+
+    def _concat_windows(
+        self, frames: list[Optional[pd.DataFrame]]
+    ) -> Optional[pd.DataFrame]:
+        """Join point data of consecutive time windows.
+
+        Args:
+            frames: point data of windows in time order
+
+        Returns:
+            point data without duplicated window boundaries
+        """
+        frames = [frame for frame in frames if frame is not None]
+        if len(frames) == 0:
+            return None
+
+        data = pd.concat(frames)
+
+        return data[~data.index.duplicated(keep="first")]
+
+    def _aggregate(
+        self,
+        data: pd.DataFrame,
+        data_interval: Optional[str],
+        time_interval: str,
+        how: Aggregation,
+        timezone: str,
+    ) -> pd.DataFrame:
+        """Aggregate values in local time intervals with pandas resampling.
+
+        Args:
+            data: values indexed by UTC time
+            data_interval: interval of the data, None for hourly
+            time_interval: interval to aggregate to
+            how: mean, sum or energy
+            timezone: timezone of intervals
+
+        Returns:
+            aggregated values indexed by the local start of each interval,
+            energy is NaN in intervals with missing values
+
+        Raises:
+            ValueError
+        """
+        if time_interval not in STRANG_AGGREGATION_FREQUENCIES:
+            raise ValueError("Time interval must be hourly, daily or monthly.")
+
+        if how not in ("mean", "sum", "energy"):
+            raise ValueError(f"Unknown aggregation {how}.")
+
+        if how == "energy" and data_interval not in (None, "hourly"):
+            raise ValueError("Energy can only be computed from hourly data.")
+
+        frequency = STRANG_AGGREGATION_FREQUENCIES[time_interval]
+        resampler = data.tz_convert(timezone).resample(frequency)
+        aggregated = resampler.mean() if how == "mean" else resampler.sum(min_count=1)
+        aggregated.index.name = "date_time"
+
+        if how == "energy" and not aggregated.empty:
+            step = self._get_step(data.index)
+            expected = self._count_steps(aggregated.index, frequency, step)
+            aggregated = aggregated.mul(step / pd.Timedelta(hours=1))
+            aggregated = aggregated.where(resampler.count().ge(expected, axis=0))
+
+        return aggregated
+
+    def _get_step(self, index: pd.Index) -> pd.Timedelta:
+        """Get time step of values, the shortest distance between two times.
+
+        Gaps in the data are longer than the step and do not change it.
+
+        Args:
+            index: sorted times of values
+
+        Returns:
+            time step, one hour for a single value
+        """
+        if len(index) < 2:
+            return pd.Timedelta(hours=1)
+
+        return pd.Timedelta(index.to_series().diff().min())
+
+    def _count_steps(
+        self, intervals: pd.Index, frequency: str, step: pd.Timedelta
+    ) -> pd.Series:
+        """Count time steps in each local interval of a complete series.
+
+        Args:
+            intervals: local starts of intervals
+            frequency: pandas frequency of intervals
+            step: time step of values
+
+        Returns:
+            number of steps per interval
+        """
+        end = intervals[-1] + 2 * pd.tseries.frequencies.to_offset(frequency)
+        steps = pd.Series(1, index=pd.date_range(intervals[0], end, freq=step))
+
+        return steps.resample(frequency).count().reindex(intervals)
+
+    def _stack_multipoints(
+        self, multipoints: Sequence[StrangMultiPoint], dtype: Any
+    ) -> Tuple[GridGeometry, np.ndarray]:
+        """Stack values of multipoint data on the Strang grid.
+
+        Args:
+            multipoints: strang multipoint models
+            dtype: dtype of values
+
+        Returns:
+            grid geometry
+            values with a row per multipoint and a column per grid point
+
+        Raises:
+            ValueError: coordinates not on the grid
+        """
+        frames = [multipoint.df for multipoint in multipoints]
+        geometry = self._get_grid_geometry(frames)
+
+        values = np.full((len(frames), len(geometry)), np.nan, dtype=dtype)
+        for row, df in zip(values, frames):
+            if df is not None:
+                positions = geometry.locate(df["lat"].to_numpy(), df["lon"].to_numpy())
+                row[positions] = df["value"].to_numpy()
+
+        return geometry, values
+
+    def _group_sites(
+        self,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        geometry: Optional[GridGeometry],
+    ) -> np.ndarray:
+        """Group sites by the grid cell they fall in.
+
+        Args:
+            latitudes: latitudes of sites
+            longitudes: longitudes of sites
+            geometry: grid geometry, every site is its own group if not given
+
+        Returns:
+            first site in the grid cell of each site, sites outside the grid
+            are not grouped
+        """
+        sites = np.arange(len(latitudes))
+        if geometry is None:
+            return sites
+
+        sampler = GridSampler(geometry, latitudes, longitudes, "nearest")
+        cells = np.where(
+            np.isnan(sampler.weights[:, 0]), -1 - sites, sampler.indices[:, 0]
+        )
+        _, first, inverse = np.unique(cells, return_index=True, return_inverse=True)
+
+        return first[inverse]
+
+    def _get_grid_geometry(
+        self, frames: Sequence[Optional[pd.DataFrame]]
+    ) -> GridGeometry:
+        """Get grid geometry from the cache, or from multipoint data if not cached.
+
+        Args:
+            frames: multipoint data
+
+        Returns:
+            grid geometry
+
+        Raises:
+            ValueError: no grid cached and no multipoint data
+        """
+        key = self._grid_key()
+        geometry = get_grid_cache().get(key)
+
+        if geometry is None:
+            df = next((df for df in frames if df is not None), None)
+            if df is None:
+                raise ValueError("No grid cached and no multipoint data.")
+
+            geometry = GridGeometry(df["lat"], df["lon"])
+            get_grid_cache().set(key, geometry)
+
+        return geometry
+
+    def _grid_key(self) -> GridKey:
+        """Get key of the multipoint grid in the grid geometry cache.
+
+        Returns:
+            category, version and downsample, which is always 1
+        """
+        return self._category, self._version, 1
+
+    def _build_point(
+        self,
+        parameter: StrangParameter,
+        latitude: float,
+        longitude: float,
+        time_from: Optional[str],
+        time_to: Optional[str],
+        time_interval: Optional[str],
+        url: str,
+        data: Optional[pd.DataFrame],
+        headers: Mapping[str, str],
+        status: int,
+    ) -> StrangPoint:
+        """Build point model from response.
+
+        Args:
+            parameter: strang parameter
+            latitude: latitude
+            longitude: longitude
+            time_from: parsed time from
+            time_to: parsed time to
+            time_interval: interval of data
+            url: url of request
+            data: parsed data
+            headers: headers of response
+            status: status of response
+
+        Returns:
+            strange point model
+        """
+        return StrangPoint(
+            parameter_key=parameter.key,
+            parameter_meaning=parameter.meaning,
+            longitude=longitude,
+            latitude=latitude,
+            time_from=time_from,
+            time_to=time_to,
+            time_interval=time_interval,
+            url=url,
+            status=status,
+            headers=headers,
+            df=data,
+        )
+
+    def _build_multipoint(
+        self,
+        parameter: StrangParameter,
+        valid_time: str,
+        time_interval: Optional[str],
+        url: str,
+        data: Optional[pd.DataFrame],
+        headers: Mapping[str, str],
+        status: int,
+    ) -> StrangMultiPoint:
+        """Build multipoint model from response.
+
+        Args:
+            parameter: strang parameter
+            valid_time: parsed valid time
+            time_interval: interval of data
+            url: url of request
+            data: parsed data
+            headers: headers of response
+            status: status of response
+
+        Returns:
+            strange multipoint model
+        """
         return StrangMultiPoint(
-            parameter_key=strang_parameter.key,
-            parameter_meaning=strang_parameter.meaning,
+            parameter_key=parameter.key,
+            parameter_meaning=parameter.meaning,
             valid_time=valid_time,
             time_interval=time_interval,
             url=url,
             status=status,
-            headers=header,
+            headers=headers,
             df=data,
         )
 
+    def _get_parameter(self, parameter: int) -> StrangParameter:
+        """Get available strang parameter.
+
+        Args:
+            parameter: parameter
+
+        Returns:
+            strang parameter
+
+        Raises:
+            NotImplementedError: parameter not supported
+        """
+        strang_parameter = self._available_parameters[parameter]
+        if strang_parameter.key is None:
+            raise NotImplementedError(
+                "Parameter not implemented."
+                + " Try client.parameters to list available parameters."
+            )
+
+        return strang_parameter
+
     def _build_base_point_url(
         self,
         url: partial[str],
@@ -280,28 +744,24 @@ class Strang:
 
         return url
 
-    def _get_and_load_data(
-        self, url: str, request: RequestType
-    ) -> tuple[pd.DataFrame, CaseInsensitiveDict[str], int]:
-        """Fetch requested point data and parse it with datetime.
+    def _load_data(
+        self, content: bytes, request: RequestType
+    ) -> Optional[pd.DataFrame]:
+        """Load requested data and parse it with datetime.
 
         Args:
-            url: url to fetch from
+            content: content of response
+            request: type of request
 
         Returns:
             data
-            header
-            status code
         """
-        response = get_request(url)
-        data = df = json.loads(response.content)
+        data = json.loads(content)
 
         if request == RequestType.POINT:
-            df = self._parse_point_data(data)
+            return self._parse_point_data(data)
         else:
-            df = self._parse_multipoint_data(data)
-
-        return df, response.headers, response.status_code
+            return self._parse_multipoint_data(data)
 
     def _parse_datetime(
         self, date_time: Optional[str], parameter: StrangParameter
@@ -340,19 +800,25 @@ class Strang:
     ) -> Optional[pd.DataFrame]:
         """Parse point data into a pandas DataFrame.
 
+        Times and values are extracted as columns and times are parsed in one
+        pass, instead of per entry.
+
         Args:
-            url: url of request
+            data: data as a list
 
         Returns
             pandas dataframe
         """
-        for entry in data:
-            entry["date_time"] = arrow.get(entry["date_time"]).datetime
-
-        data_pd = pd.DataFrame(data)
-        data_pd.set_index("date_time", inplace=True)
+        times = pd.to_datetime(
+            [entry["date_time"] for entry in data], format="ISO8601", utc=True
+        )
+        values = np.array([entry["value"] for entry in data], dtype="float64")
 
-        return data_pd
+        return pd.DataFrame(
+            {"value": values},
+            index=pd.DatetimeIndex(times, name="date_time"),
+            copy=False,
+        )
 
     def _parse_multipoint_data(
         self, data: list[CaseInsensitiveDict[Any]]
@@ -366,3 +832,286 @@ class Strang:
             data_pd: pandas dataframe
         """
         return pd.DataFrame(data)
+
+
+class Strang(BaseStrang):
+    """SMHI Strang class. Only supports category strang1g and version 1."""
+
+    def get_point(
+        self,
+        latitude: float,
+        longitude: float,
+        parameter: int,
+        time_from: Optional[str] = None,
+        time_to: Optional[str] = None,
+        time_interval: Optional[str] = None,
+        window: Optional[str] = None,
+        max_workers: int = STRANG_WINDOW_MAX_WORKERS,
+    ) -> StrangPoint:
+        """Get data for given lon, lat and parameter.
+
+        Long periods can be split into time windows, e.g. one per year, which are
+        requested concurrently in a bounded thread pool. A window failing with a
+        transient error is retried on its own, within the retry policy, and the
+        windows are joined in time order.
+
+        Args:
+            latitude: latitude
+            longitude: longitude
+            parameter: parameter
+            time_from: get data from (optional),
+            time_to: get data to (optional),
+            time_interval: interval of data
+                           [valid values: hourly, daily, monthly] (optional)
+            window: pandas frequency of time windows, e.g. YS for calendar
+                    years, requests the whole period at once if not given
+            max_workers: maximum number of concurrent windows
+
+        Returns:
+            strange point model
+
+        Raises:
+            ValueError: wrong value of latitude and/or longitude
+            NotImplementedError: parameter not supported
+        """
+        strang_parameter, url, time_from, time_to = self._prepare_point(
+            latitude, longitude, parameter, time_from, time_to, time_interval
+        )
+        if window is None:
+            data, header, status = self._get_and_load_data(url, RequestType["POINT"])
+        else:
+            data, header, status = self._get_windows(
+                self._prepare_windows(
+                    strang_parameter,
+                    latitude,
+                    longitude,
+                    time_from,
+                    time_to,
+                    time_interval,
+                    window,
+                ),
+                max_workers,
+            )
+
+        return self._build_point(
+            strang_parameter,
+            latitude,
+            longitude,
+            time_from,
+            time_to,
+            time_interval,
+            url,
+            data,
+            header,
+            status,
+        )
+
+    def get_points(
+        self,
+        latitudes: Sequence[float],
+        longitudes: Sequence[float],
+        parameters: Sequence[int],
+        time_from: Optional[str] = None,
+        time_to: Optional[str] = None,
+        time_interval: Optional[str] = None,
+        dedupe: bool = False,
+        max_workers: int = STRANG_POINTS_MAX_WORKERS,
+    ) -> StrangBulkPoint:
+        """Get data of many sites and parameters concurrently.
+
+        Points of each site and parameter are fetched in a bounded thread pool.
+        A failing point is logged and reported without aborting the others.
+
+        Args:
+            latitudes: latitudes of sites
+            longitudes: longitudes of sites
+            parameters: parameters
+            time_from: get data from (optional),
+            time_to: get data to (optional),
+            time_interval: interval of data
+                           [valid values: hourly, daily, monthly] (optional)
+            dedupe: request sites in the same grid cell once
+            max_workers: maximum number of concurrent requests
+
+        Returns:
+            bulk point model with points and errors keyed by site and parameter
+
+        Raises:
+            ValueError: latitudes and longitudes not equally long
+            NotImplementedError: parameter not supported
+        """
+        site_latitudes = np.asarray(latitudes, dtype=np.float64)
+        site_longitudes = np.asarray(longitudes, dtype=np.float64)
+        if site_latitudes.shape != site_longitudes.shape or site_latitudes.ndim != 1:
+            raise ValueError("Latitudes and longitudes must be equally long 1D arrays.")
+
+        parameters = list(dict.fromkeys(parameters))
+        for parameter in parameters:
+            self._get_parameter(parameter)
+
+        geometry = self.get_grid_geometry() if dedupe else None
+        sites = self._group_sites(site_latitudes, site_longitudes, geometry)
+        members: dict[int, list[int]] = defaultdict(list)
+        for site, first in enumerate(sites.tolist()):
+            members[first].append(site)
+
+        bulk = StrangBulkPoint(
+            latitudes=site_latitudes.tolist(),
+            longitudes=site_longitudes.tolist(),
+            sites=sites.tolist(),
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                (first, parameter): executor.submit(
+                    self.get_point,
+                    bulk.latitudes[first],
+                    bulk.longitudes[first],
+                    parameter,
+                    time_from,
+                    time_to,
+                    time_interval,
+                )
+                for first in members
+                for parameter in parameters
+            }
+
+            for (first, parameter), future in futures.items():
+                try:
+                    point = future.result()
+                except Exception as e:
+                    logger.warning(
+                        f"Could not get parameter {parameter} of site {first}: {e}"
+                    )
+                    for site in members[first]:
+                        bulk.errors[site, parameter] = e
+                else:
+                    for site in members[first]:
+                        bulk.data[site, parameter] = point
+
+        return bulk
+
+    def get_grid_geometry(self) -> GridGeometry:
+        """Get coordinates of the multipoint grid, cached after the first request.
+
+        Returns:
+            grid geometry
+
+        Raises:
+            ValueError: grid not in multipoint response
+        """
+        geometry = get_grid_cache().get(self._grid_key())
+
+        if geometry is None:
+            multipoint = self.get_multipoint(
+                STRANG_GRID_PARAMETER, STRANG_GRID_VALID_TIME
+            )
+            geometry = self._get_grid_geometry([multipoint.df])
+
+        return geometry
+
+    def get_multipoint(
+        self, parameter: int, valid_time: str, time_interval: Optional[str] = None
+    ) -> StrangMultiPoint:
+        """Get full spatial data for given parameter and time.
+
+        Args:
+            parameter: parameter
+            valid_time: valid time
+            time_interval: interval of data
+                           [valid values: hourly,
+                            daily, monthly] (optional)
+
+        Returns:
+            strange multipoint model
+
+        Raises:
+            TypeError: wrong type of valid time
+            NotImplementedError: parameter not supported
+        """
+        strang_parameter, url, valid_time = self._prepare_multipoint(
+            parameter, valid_time, time_interval
+        )
+        data, header, status = self._get_and_load_data(url, RequestType["MULTIPOINT"])
+
+        return self._build_multipoint(
+            strang_parameter, valid_time, time_interval, url, data, header, status
+        )
+
+    def _get_windows(
+        self, urls: list[str], max_workers: int
+    ) -> tuple[Optional[pd.DataFrame], CaseInsensitiveDict[str], int]:
+        """Fetch point data of time windows concurrently and join them.
+
+        Args:
+            urls: urls of windows in time order
+            max_workers: maximum number of concurrent windows
+
+        Returns:
+            data
+            header of first window
+            status code of first window
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._get_window, urls))
+
+        _, header, status = results[0]
+
+        return self._concat_windows([data for data, _, _ in results]), header, status
+
+    def _get_window(
+        self, url: str
+    ) -> tuple[Optional[pd.DataFrame], CaseInsensitiveDict[str], int]:
+        """Fetch point data of a time window, retrying it on transient errors.
+
+        Window attempts replace the attempts of the request, so a window is
+        sent at most as many times as the retry policy allows. Errors that do
+        not go away on retry, e.g. a point outside the grid or a client error,
+        are raised right away.
+
+        Args:
+            url: url of window
+
+        Returns:
+            data
+            header
+            status code
+        """
+        retry = get_retry_policy()
+        single = retry.model_copy(update={"max_attempts": 1})
+        attempt = 1
+
+        while True:
+            try:
+                return self._get_and_load_data(url, RequestType.POINT, single)
+            except TRANSIENT_EXCEPTIONS as e:
+                if attempt >= retry.max_attempts:
+                    raise
+
+                delay = (
+                    _get_retry_delay(e, retry, attempt)
+                    if isinstance(e, RetryableHTTPError)
+                    else retry.delay(attempt)
+                )
+                logger.warning(f"Window {url} failed ({e}), retrying in {delay:.1f} s.")
+                time.sleep(delay)
+                attempt += 1
+
+    def _get_and_load_data(
+        self, url: str, request: RequestType, retry: Optional[RetryPolicy] = None
+    ) -> tuple[Optional[pd.DataFrame], CaseInsensitiveDict[str], int]:
+        """Fetch requested point data and parse it with datetime.
+
+        Args:
+            url: url to fetch from
+            request: type of request
+            retry: retry policy, defaults to the shared retry policy
+
+        Returns:
+            data
+            header
+            status code
+        """
+        response = get_request(url, retry=retry, use_cache=False)
+        df = self._load_data(response.content, request)
+
+        return df, response.headers, response.status_code
@@ -0,0 +1,233 @@
+"""Incremental sync of Metobs data to local storage."""
+
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import pandas as pd
+
+from smhi.constants import METOBS_CSV_ENGINE, METOBS_SYNC_WINDOWS
+from smhi.metobs import Data, Periods
+from smhi.models.metobs_model import MetobsSyncState
+from smhi.models.variable_model import CsvEngine
+
+logger = logging.getLogger(__name__)
+
+
+class MetobsSync:
+    """Keep local Metobs series of stations up to date.
+
+    The corrected archive of a station is downloaded once. Every later sync
+    only fetches the shortest latest period covering the time since the last
+    stored observation, and merges it onto the stored series.
+    """
+
+    def __init__(
+        self, directory: Union[str, Path], engine: CsvEngine = METOBS_CSV_ENGINE
+    ) -> None:
+        """Initialise sync.
+
+        Args:
+            directory: directory to store series and sync state in
+            engine: pandas CSV parser engine, one of c, pyarrow or python
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.engine = engine
+
+    def sync(self, parameter: int, station: int) -> pd.DataFrame:
+        """Sync series of station and parameter.
+
+        Args:
+            parameter: integer parameter key
+            station: integer station key
+
+        Returns:
+            synced series
+        """
+        now = datetime.now(timezone.utc)
+        periods = Periods.cached(parameter, station)
+        stored = self.load(parameter, station)
+        state = self.state(parameter, station)
+
+        last_time = (
+            state.last_time if state is not None and stored is not None else None
+        )
+
+        # closed stations only have an archive, which does not change
+        if (
+            stored is not None
+            and state is not None
+            and state.period == "corrected-archive"
+            and not any(period in METOBS_SYNC_WINDOWS for period in periods.data)
+        ):
+            logger.info(
+                f"Parameter {parameter} of station {station} only has a stored "
+                "corrected-archive, skipping sync."
+            )
+            return stored
+
+        period = self._select_period(periods.data, last_time, now)
+        logger.info(
+            f"Syncing parameter {parameter} of station {station} from {period}."
+        )
+
+        df = self._merge(stored, Data(periods, period, engine=self.engine).df)
+
+        if period == "corrected-archive" and "latest-months" in periods.data:
+            df = self._merge(df, Data(periods, "latest-months", engine=self.engine).df)
+
+        self._save(parameter, station, df, period, now)
+
+        return df
+
+    def load(self, parameter: int, station: int) -> Optional[pd.DataFrame]:
+        """Load stored series of station and parameter.
+
+        Args:
+            parameter: integer parameter key
+            station: integer station key
+
+        Returns:
+            stored series or None if not synced
+        """
+        data_path, _ = self._paths(parameter, station)
+
+        if not data_path.exists():
+            return None
+
+        return pd.read_pickle(data_path)
+
+    def state(self, parameter: int, station: int) -> Optional[MetobsSyncState]:
+        """Get sync state of station and parameter.
+
+        Args:
+            parameter: integer parameter key
+            station: integer station key
+
+        Returns:
+            sync state or None if not synced
+        """
+        _, state_path = self._paths(parameter, station)
+
+        try:
+            return MetobsSyncState.model_validate_json(state_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _select_period(
+        self,
+        available: Tuple[Optional[str], ...],
+        last_time: Optional[datetime],
+        now: datetime,
+    ) -> str:
+        """Select the shortest available period covering the time since last sync.
+
+        Args:
+            available: available periods of the station
+            last_time: time of the last stored observation
+            now: current time
+
+        Returns:
+            period
+        """
+        latest = [period for period in METOBS_SYNC_WINDOWS if period in available]
+
+        if last_time is not None:
+            for period in latest:
+                if now - last_time <= METOBS_SYNC_WINDOWS[period]:
+                    return period
+
+        if "corrected-archive" in available:
+            return "corrected-archive"
+
+        if not latest:
+            raise ValueError(f"No period to sync in {available}.")
+
+        # stations without an archive yet only have latest periods
+        if last_time is not None:
+            logger.warning(
+                f"No available period covers the gap since {last_time}, "
+                f"observations before {now - METOBS_SYNC_WINDOWS[latest[-1]]} "
+                "are missing."
+            )
+
+        return latest[-1]
+
+    def _merge(self, stored: Optional[pd.DataFrame], new: pd.DataFrame) -> pd.DataFrame:
+        """Merge new observations onto stored series.
+
+        New observations replace stored ones with the same timestamp.
+
+        Args:
+            stored: stored series
+            new: new observations
+
+        Returns:
+            merged series
+        """
+        if stored is None or stored.empty:
+            return new
+
+        if new.empty:
+            return stored
+
+        df = pd.concat([stored, new])
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+
+        for column in new.select_dtypes("category").columns:
+            df[column] = df[column].astype("category")
+
+        return df
+
+    def _save(
+        self,
+        parameter: int,
+        station: int,
+        df: pd.DataFrame,
+        period: str,
+        now: datetime,
+    ) -> None:
+        """Save series and sync state atomically.
+
+        Args:
+            parameter: integer parameter key
+            station: integer station key
+            df: series to save
+            period: period of the sync
+            now: time of the sync
+        """
+        data_path, state_path = self._paths(parameter, station)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+
+        state = MetobsSyncState(
+            parameter=parameter,
+            station=station,
+            period=period,
+            last_time=df.index.max() if not df.empty else None,
+            synced_at=now,
+        )
+
+        tmp_path = data_path.with_name(data_path.name + f".{os.getpid()}.tmp")
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, data_path)
+
+        tmp_path = state_path.with_name(state_path.name + f".{os.getpid()}.tmp")
+        tmp_path.write_text(state.model_dump_json())
+        os.replace(tmp_path, state_path)
+
+    def _paths(self, parameter: int, station: int) -> Tuple[Path, Path]:
+        """Get series and state paths of station and parameter.
+
+        Args:
+            parameter: integer parameter key
+            station: integer station key
+
+        Returns:
+            series path
+            state path
+        """
+        directory = self.directory / str(parameter)
+        return directory / f"{station}.pkl", directory / f"{station}.json"
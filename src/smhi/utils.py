@@ -1,45 +1,347 @@
 """Utility methods."""
 
 import logging
-from datetime import datetime
-from typing import Union
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Protocol, Union
 
 import arrow
 import requests
+from requests.adapters import HTTPAdapter
 
-from smhi.constants import OUT_OF_BOUNDS, STATUS_OK
+from smhi.cache import ResponseCache
+from smhi.constants import (
+    HTTP_NOT_MODIFIED,
+    HTTP_POOL_BLOCK,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    OUT_OF_BOUNDS,
+    STATUS_OK,
+)
+from smhi.models.request_model import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_retry_policy = RetryPolicy()
+_response_cache: Optional[ResponseCache] = None
 
-def get_request(url: str) -> requests.Response:
+
+class RetryResponse(Protocol):
+    """Response attributes used to decide when to retry.
+
+    Satisfied by both requests and httpx responses.
+    """
+
+    @property
+    def status_code(self) -> int: ...
+
+    @property
+    def headers(self) -> Mapping[str, str]: ...
+
+
+RETRY_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+class RetryableHTTPError(requests.exceptions.HTTPError):
+    """HTTP error of a response with a status in the retry policy, e.g. 503.
+
+    Keeps status code and headers of the response, so that a caller retrying the
+    request can respect Retry-After.
+    """
+
+    def __init__(
+        self, message: str, status_code: int, headers: Mapping[str, str]
+    ) -> None:
+        """Initialise retryable HTTP error.
+
+        Args:
+            message: message
+            status_code: status code of response
+            headers: headers of response
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers
+
+
+TRANSIENT_EXCEPTIONS = RETRY_EXCEPTIONS + (RetryableHTTPError,)
+
+
+def build_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    pool_block: bool = HTTP_POOL_BLOCK,
+) -> requests.Session:
+    """Build a keep-alive session with pooled connections.
+
+    Args:
+        pool_connections: number of per-host connection pools to keep
+        pool_maxsize: maximum number of connections kept per host
+        pool_block: block instead of opening extra connections when a pool is full
+
+    Returns:
+        session
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    return session
+
+
+def get_session() -> requests.Session:
+    """Get the shared session, building it on first use.
+
+    The session is shared between threads. Connection pools are thread-safe
+    and the session holds no per-request state for plain GET requests.
+
+    Returns:
+        session
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            _session = build_session()
+
+        return _session
+
+
+def set_session(session: Optional[requests.Session]) -> None:
+    """Set the shared session used by all clients.
+
+    Args:
+        session: session to use, None resets to a default session on next use
+    """
+    global _session
+
+    with _session_lock:
+        _session = session
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the retry policy used by all clients.
+
+    Returns:
+        retry policy
+    """
+    return _retry_policy
+
+
+def set_retry_policy(policy: Optional[RetryPolicy]) -> None:
+    """Set the retry policy used by all clients.
+
+    Args:
+        policy: retry policy, None resets to the default policy
+    """
+    global _retry_policy
+
+    _retry_policy = RetryPolicy() if policy is None else policy
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the response cache used by all clients.
+
+    Returns:
+        response cache, None if caching is disabled
+    """
+    return _response_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Set the response cache used by all clients. Caching is disabled by default.
+
+    Args:
+        cache: response cache, None disables caching
+    """
+    global _response_cache
+
+    _response_cache = cache
+
+
+def get_request(
+    url: str,
+    session: Optional[requests.Session] = None,
+    retry: Optional[RetryPolicy] = None,
+    use_cache: bool = True,
+    stream: bool = False,
+) -> requests.Response:
     """Get request from url.
 
+    Only GET requests are sent, which are idempotent and therefore safe to retry.
+    Connection errors, timeouts and the status codes in the retry policy are
+    retried with exponential backoff and jitter. A Retry-After header
+    from the server is respected.
+
+    If a response cache is set, fresh responses are served from it and stale
+    responses are revalidated with a conditional request. Streamed responses
+    are never cached and must be closed by the caller.
+
     Args:
         url: url to request from
+        session: session to request with, defaults to the shared session
+        retry: retry policy, defaults to the shared retry policy
+        use_cache: use the response cache, if one is set
+        stream: defer downloading the body until it is read
 
     Returns:
         response
 
     Raises:
         ValueError
+        RetryableHTTPError: status in the retry policy after the last attempt
         requests.exceptions.HTTPError
     """
-    logger.debug(f"Fetching from {url}.")
+    if retry is None:
+        retry = _retry_policy
+
+    cache = _response_cache if use_cache and not stream else None
+    cached = cache.get(url) if cache is not None else None
+
+    if cached is not None:
+        cached_response, fresh = cached
+        if fresh:
+            logger.debug(f"Using cached response for {url}.")
+            return cached_response
 
-    response = requests.get(url, timeout=200)
+    headers = cache.validators(cached[0]) if cache and cached else {}
+    response = _send_request(url, session, retry, headers, stream)
+
+    if cache is not None and cached is not None:
+        if response.status_code == HTTP_NOT_MODIFIED:
+            logger.debug(f"Cached response for {url} is still valid.")
+            cache.touch(url)
+            return cached[0]
 
     if response.status_code != STATUS_OK:
         if OUT_OF_BOUNDS in response.text.lower():
             raise ValueError("Request is out of bounds.")
 
+        if response.status_code in retry.retry_status:
+            raise RetryableHTTPError(
+                f"Could not request from {url}.",
+                response.status_code,
+                response.headers,
+            )
+
         raise requests.exceptions.HTTPError(f"Could not request from {url}.")
 
     logger.debug(f"Successful request from {url}.")
 
+    if cache is not None:
+        cache.set(url, response)
+
     return response
 
 
+def _send_request(
+    url: str,
+    session: Optional[requests.Session],
+    retry: Optional[RetryPolicy],
+    headers: Dict[str, str],
+    stream: bool = False,
+) -> requests.Response:
+    """Send GET request, retrying transient failures.
+
+    Args:
+        url: url to request from
+        session: session to request with, defaults to the shared session
+        retry: retry policy, defaults to the shared retry policy
+        headers: extra request headers
+        stream: defer downloading the body until it is read
+
+    Returns:
+        last response
+    """
+    logger.debug(f"Fetching from {url}.")
+
+    if session is None:
+        session = get_session()
+
+    if retry is None:
+        retry = _retry_policy
+
+    kwargs: Dict[str, Any] = {"headers": headers} if headers else {}
+    if stream:
+        kwargs["stream"] = True
+
+    for attempt in range(1, retry.max_attempts + 1):
+        last_attempt = attempt == retry.max_attempts
+
+        try:
+            response = session.get(url, timeout=retry.timeout, **kwargs)
+        except RETRY_EXCEPTIONS as e:
+            if last_attempt:
+                raise
+
+            delay = retry.delay(attempt)
+            logger.warning(f"Request to {url} failed ({e}), retrying in {delay:.1f} s.")
+            time.sleep(delay)
+            continue
+
+        if response.status_code not in retry.retry_status or last_attempt:
+            break
+
+        delay = _get_retry_delay(response, retry, attempt)
+        response.close()
+        logger.warning(
+            f"Request to {url} returned {response.status_code}, "
+            + f"retrying in {delay:.1f} s."
+        )
+        time.sleep(delay)
+
+    return response
+
+
+def _get_retry_delay(
+    response: RetryResponse, retry: RetryPolicy, attempt: int
+) -> float:
+    """Get delay before the next attempt, honouring Retry-After.
+
+    The delay asked for by the server is not capped by the backoff maximum.
+    HTTP dates without a timezone are taken as UTC.
+
+    Args:
+        response: failed response
+        retry: retry policy
+        attempt: number of the failed attempt
+
+    Returns:
+        delay in seconds
+    """
+    delay = retry.delay(attempt)
+    retry_after = response.headers.get("Retry-After") if response.headers else None
+
+    if not retry.respect_retry_after or retry_after is None:
+        return delay
+
+    try:
+        server_delay = float(retry_after)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return delay
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        server_delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+
+    return max(delay, server_delay)
+
+
 def format_datetime(test_time: Union[str, datetime]) -> str:
     """Format str and datetime to accepected time formats.
 
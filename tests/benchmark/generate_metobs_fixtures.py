@@ -0,0 +1,129 @@
+"""Generate the large Metobs CSV fixtures used by the benchmarks.
+
+The benchmarks generate them into a temporary directory. To keep a copy, run
+python tests/benchmark/generate_metobs_fixtures.py <directory>
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+STATION = (
+    "Stationsnamn;Stationsnummer;Stationsnät;Mäthöjd (meter över marken)\n"
+    + "Benchmark;1;Övriga stationer;2.0\n"
+)
+PERIOD = (
+    "Tidsperiod (fr.o.m);Tidsperiod (t.o.m);Höjd (meter över havet);"
+    + "Latitud (decimalgrader);Longitud (decimalgrader)\n"
+    + "{start};{end};23.0;59.5000;17.8000\n"
+)
+TRAILER = ";;Kvalitetskontrollerade historiska data (utom de senaste 3 mån)"
+
+
+def values(n, period):
+    """Seasonal values with one decimal.
+
+    Args:
+        n: number of values
+        period: number of values per year
+
+    Returns:
+        values as strings
+    """
+    rng = np.random.default_rng(0)
+    seasonal = 10 * np.sin(2 * np.pi * np.arange(n) / period)
+    return np.round(seasonal + rng.normal(0, 2, n), 1).astype(str)
+
+
+def write(directory, name, parameter, header, rows, start, end):
+    """Write a Metobs CSV file.
+
+    Args:
+        directory: directory to write to
+        name: file name
+        parameter: parameter section
+        header: header of station data
+        rows: rows of station data
+        start: start of period
+        end: end of period
+    """
+    content = "\n".join(
+        [
+            STATION,
+            parameter,
+            PERIOD.format(start=start, end=end),
+            header + "\n" + "\n".join(rows) + "\n",
+        ]
+    )
+    Path(directory, name).write_bytes(content.encode("utf-8"))
+
+
+def main(directory):
+    """Write hourly, daily and monthly fixtures.
+
+    Args:
+        directory: directory to write to
+    """
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+    times = pd.date_range("1961-01-01", periods=525_600, freq="h")
+    dates = times.strftime("%Y-%m-%d")
+    clock = times.strftime("%H:%M:%S")
+    rows = [
+        f"{d};{t};{v};G" + (TRAILER if i == 0 else "")
+        for i, (d, t, v) in enumerate(zip(dates, clock, values(len(times), 8766)))
+    ]
+    write(
+        directory,
+        "hourly.csv",
+        "Parameternamn;Beskrivning;Enhet\n"
+        + "Lufttemperatur;momentanvärde, 1 gång/tim;celsius\n",
+        "Datum;Tid (UTC);Lufttemperatur;Kvalitet;;Tidsutsnitt:",
+        rows,
+        times[0],
+        times[-1],
+    )
+
+    days = pd.date_range("1750-01-01", periods=100_000, freq="D")
+    rows = [
+        f"{d:%Y-%m-%d} 07:00:01;{d + pd.Timedelta(days=1):%Y-%m-%d} 07:00:00;"
+        + f"{d:%Y-%m-%d};{v};G"
+        + (TRAILER if i == 0 else "")
+        for i, (d, v) in enumerate(zip(days, values(len(days), 365.25)))
+    ]
+    write(
+        directory,
+        "daily.csv",
+        "Parameternamn;Beskrivning;Enhet\n"
+        + "Nederbördsmängd;summa 1 dygn, 1 gång/dygn kl 06;millimeter\n",
+        "Från Datum Tid (UTC);Till Datum Tid (UTC);Representativt dygn;"
+        + "Nederbördsmängd;Kvalitet;;Tidsutsnitt:",
+        rows,
+        days[0],
+        days[-1],
+    )
+
+    months = pd.date_range("1775-01-01", periods=3_000, freq="MS")
+    rows = [
+        f"{m:%Y-%m-%d} 00:00:00;{m + pd.offsets.MonthEnd(1):%Y-%m-%d} 23:59:59;"
+        + f"{m:%Y-%m};{v};G"
+        + (TRAILER if i == 0 else "")
+        for i, (m, v) in enumerate(zip(months, values(len(months), 12)))
+    ]
+    write(
+        directory,
+        "monthly.csv",
+        "Parameternamn;Beskrivning;Enhet\n"
+        + "Lufttemperatur;medel, 1 gång per månad;celsius\n",
+        "Från Datum Tid (UTC);Till Datum Tid (UTC);Representativ månad;"
+        + "Lufttemperatur;Kvalitet;;Tidsutsnitt:",
+        rows,
+        months[0],
+        months[-1],
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
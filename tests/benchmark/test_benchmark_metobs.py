@@ -0,0 +1,140 @@
+"""Metobs benchmarks.
+
+Opt-in, run with: SMHI_BENCHMARK=1 python -m pytest -s tests/benchmark
+The fixtures are generated by tests/benchmark/generate_metobs_fixtures.py.
+"""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+from generate_metobs_fixtures import main
+
+from smhi.metobs import Data
+
+pytestmark = pytest.mark.skipif(
+    os.environ.get("SMHI_BENCHMARK") != "1",
+    reason="Benchmarks are opt-in, set SMHI_BENCHMARK=1.",
+)
+
+REPEAT = 3
+
+
+@pytest.fixture(scope="session")
+def fixtures(tmp_path_factory):
+    """Generate fixtures once per session.
+
+    Returns:
+        directory of fixtures
+    """
+    directory = tmp_path_factory.mktemp("metobs")
+    main(directory)
+
+    return directory
+
+
+def read_fixture(path):
+    """Read fixture and parse its station data without index.
+
+    Args:
+        path: path of fixture
+
+    Returns:
+        content of fixture
+        station data
+    """
+    content = path.read_bytes()
+
+    sections = content.decode("utf-8").split("\n\n")
+    header = sections[3].split("\n", 1)[0]
+    dtype = Data._get_dtypes(header.split(";"), Data._parse_csv(sections[1]))
+    stationdata = Data._parse_csv(sections[3], dtype=dtype)
+
+    return content, Data._drop_nan(Data._clean_columns(stationdata))
+
+
+def set_index_joined(stationdata, datetime_columns):
+    """Set index the way it was done before vectorising, as a reference.
+
+    Args:
+        stationdata: station data
+        datetime_columns: datetime columns
+
+    Returns:
+        indexed station data
+    """
+    stationdata.set_index(
+        pd.to_datetime(stationdata[datetime_columns].agg(" ".join, axis=1), utc=True),
+        inplace=True,
+    )
+    stationdata.drop(datetime_columns, axis=1, inplace=True)
+
+    return stationdata
+
+
+def best_time(function, stationdata):
+    """Get best time of repeated calls on fresh copies of station data.
+
+    Args:
+        function: function indexing station data
+        stationdata: station data
+
+    Returns:
+        best time in seconds
+        last result
+    """
+    times = []
+    for _ in range(REPEAT):
+        copy = stationdata.copy()
+        start = time.perf_counter()
+        result = function(copy)
+        times.append(time.perf_counter() - start)
+
+    return min(times), result
+
+
+@pytest.mark.parametrize(
+    "name, datetime_columns, rows, min_speedup",
+    [
+        ("hourly.csv", Data._metobs_parameter_tim, 525_600, 10),
+        ("daily.csv", Data._metobs_parameter_dygn, 100_000, 5),
+        ("monthly.csv", Data._metobs_parameter_manad, 3_000, 2),
+    ],
+)
+def test_benchmark_set_dataframe_index(
+    fixtures, name, datetime_columns, rows, min_speedup
+):
+    """Benchmark vectorised index against joining datetime columns row by row."""
+    _, stationdata = read_fixture(fixtures / name)
+    assert len(stationdata) == rows
+
+    joined_time, expected = best_time(
+        lambda df: set_index_joined(df, datetime_columns), stationdata
+    )
+    vectorised_time, result = best_time(Data._set_dataframe_index, stationdata)
+
+    print(
+        f"\n{name}: {rows} rows, joined {joined_time:.3f} s, "
+        + f"vectorised {vectorised_time:.3f} s, "
+        + f"{joined_time / vectorised_time:.0f}x"
+    )
+
+    pd.testing.assert_index_equal(result.index, expected.index, check_names=False)
+    pd.testing.assert_frame_equal(result, expected, check_index_type=False)
+    assert joined_time / vectorised_time >= min_speedup
+
+
+@pytest.mark.parametrize("name", ["hourly.csv", "daily.csv", "monthly.csv"])
+def test_benchmark_parse_stream(fixtures, name):
+    """Benchmark parsing a whole CSV file."""
+    content, stationdata = read_fixture(fixtures / name)
+
+    start = time.perf_counter()
+    data = Data._parse_stream([content])
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{name}: parsed {len(stationdata)} rows in {elapsed:.3f} s")
+
+    assert len(data.stationdata) == len(stationdata)
+    assert data.stationdata.index.is_monotonic_increasing
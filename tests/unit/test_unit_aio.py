@@ -0,0 +1,259 @@
+"""SMHI async clients unit tests."""
+
+import asyncio
+import json
+
+import httpx
+import pandas as pd
+import pytest
+import requests
+from utils import get_response
+
+from smhi.aio import AsyncMesan, AsyncMetfcts, AsyncMetobs, AsyncStrang, AsyncTransport
+from smhi.mesan import Mesan
+from smhi.metfcts import Metfcts
+from smhi.metobs import Data
+from smhi.models.request_model import RetryPolicy
+
+METOBS_URL = "https://opendata-download-metobs.smhi.se/api"
+METOBS_RESPONSES = {
+    METOBS_URL + ".json": "tests/fixtures/metobs/versions.txt",
+    METOBS_URL + "/version/1.0.json": "tests/fixtures/metobs/parameters.txt",
+    METOBS_URL + "/version/1.0/parameter/1.json": "tests/fixtures/metobs/stations.txt",
+    METOBS_URL
+    + "/version/1.0/parameter/1/station/1.json": "tests/fixtures/metobs/periods.txt",
+    METOBS_URL + "/version/1.0/parameter/1/station/1/period/corrected-archive.json": (
+        "tests/fixtures/metobs/data.txt"
+    ),
+}
+METOBS_CSV_URL = (
+    METOBS_URL + "/version/1.0/parameter/1/station/1/period/corrected-archive/data.csv"
+)
+
+
+def build_transport(handler, **kwargs):
+    """Build transport with mocked requests.
+
+    Args:
+        handler: function handling requests
+        kwargs: transport arguments
+
+    Returns:
+        async transport
+    """
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncTransport(client=client, **kwargs)
+
+
+def mock_metobs_handler(calls):
+    """Build handler serving the Metobs fixtures.
+
+    Args:
+        calls: list collecting requested urls
+
+    Returns:
+        handler
+    """
+
+    def handler(request):
+        url = str(request.url)
+        calls.append(url)
+
+        if url == METOBS_CSV_URL:
+            with open("tests/fixtures/metobs/data.csv", "rb") as f:
+                return httpx.Response(200, content=f.read())
+
+        return httpx.Response(200, content=get_response(METOBS_RESPONSES[url]).content)
+
+    return handler
+
+
+class TestUnitAsyncTransport:
+    """Unit tests for async transport."""
+
+    def test_unit_transport_retry(self):
+        """Unit test transport retries transient failures."""
+        responses = [
+            httpx.ConnectError("fail"),
+            httpx.Response(503),
+            httpx.Response(200, content=b"ok"),
+        ]
+
+        def handler(request):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+
+            return response
+
+        async def run():
+            retry = RetryPolicy(backoff=0, jitter=False)
+            async with build_transport(handler, retry=retry) as transport:
+                return await transport.get("https://smhi.se")
+
+        assert asyncio.run(run()).content == b"ok"
+        assert responses == []
+
+    @pytest.mark.parametrize(
+        "text, expected_error",
+        [
+            ("Out of bounds", ValueError),
+            ("Not found", requests.exceptions.HTTPError),
+        ],
+    )
+    def test_unit_transport_fail(self, text, expected_error):
+        """Unit test transport failures."""
+
+        async def run():
+            transport = build_transport(lambda _: httpx.Response(404, text=text))
+            async with transport:
+                await transport.get("https://smhi.se")
+
+        with pytest.raises(expected_error):
+            asyncio.run(run())
+
+    def test_unit_transport_concurrency(self):
+        """Unit test transport bounds the number of concurrent requests."""
+        active = []
+        peak = []
+
+        async def handler(request):
+            active.append(request)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(request)
+            return httpx.Response(200)
+
+        async def run():
+            transport = AsyncTransport(
+                max_concurrency=2,
+                client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            )
+            async with transport:
+                await asyncio.gather(
+                    *[transport.get(f"https://smhi.se/{i}") for i in range(6)]
+                )
+
+        asyncio.run(run())
+        assert max(peak) == 2
+
+
+class TestUnitAsyncClients:
+    """Unit tests for async clients."""
+
+    def test_unit_mesan_get_point(self):
+        """Unit test async Mesan get_point matches Mesan."""
+        mocked_response = get_response("tests/fixtures/mesan/point.txt")
+        data = json.loads(mocked_response.content)
+        calls = []
+
+        def handler(request):
+            calls.append(str(request.url))
+            return httpx.Response(200, content=mocked_response.content)
+
+        async def run():
+            async with AsyncMesan(build_transport(handler)) as client:
+                return client._base_url, await client.get_point(58.0, 16.0)
+
+        base_url, point = asyncio.run(run())
+        expected = Mesan._build_point(Mesan.__new__(Mesan), "", data, {}, 200, 58, 16)
+
+        assert calls == [base_url + "geotype/point/lon/16.0/lat/58.0/data.json"]
+        assert point.status == 200
+        pd.testing.assert_frame_equal(point.df, expected.df)
+
+    def test_unit_metfcts_urls(self):
+        """Unit test async Metfcts uses the Metfcts endpoints."""
+        client = AsyncMetfcts(build_transport(lambda _: httpx.Response(200)))
+        assert client._category == Metfcts._category
+        assert "metfcst" in client._base_url
+
+    def test_unit_strang_get_point(self):
+        """Unit test async Strang get_point."""
+        mocked_response = get_response("tests/fixtures/strang/point.txt")
+
+        def handler(request):
+            return httpx.Response(200, content=mocked_response.content)
+
+        async def run():
+            async with AsyncStrang(build_transport(handler)) as client:
+                return await client.get_point(
+                    58.0, 16.0, 116, "2020-02-01", "2020-02-02", "hourly"
+                )
+
+        point = asyncio.run(run())
+
+        assert point.parameter_key == 116
+        assert list(point.df["value"]) == [0.0, 0.0]
+
+    def test_unit_strang_get_point_window(self):
+        """Unit test async Strang get_point with time windows."""
+        mocked_response = get_response("tests/fixtures/strang/point.txt")
+        urls = []
+
+        def handler(request):
+            urls.append(str(request.url))
+            return httpx.Response(200, content=mocked_response.content)
+
+        async def run():
+            async with AsyncStrang(build_transport(handler)) as client:
+                return await client.get_point(
+                    58.0, 16.0, 116, "2020-02-01", "2020-04-01", "hourly", "MS"
+                )
+
+        point = asyncio.run(run())
+
+        assert len(urls) == 2
+        assert list(point.df["value"]) == [0.0, 0.0]
+
+    @pytest.mark.parametrize(
+        "status, expected_error, expected_calls",
+        [(503, None, 3), (404, requests.exceptions.HTTPError, 1)],
+    )
+    def test_unit_strang_get_window(self, status, expected_error, expected_calls):
+        """Unit test async Strang retries windows on transient errors only."""
+        mocked_response = get_response("tests/fixtures/strang/point.txt")
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            if len(calls) < 3:
+                return httpx.Response(status, text="error")
+            return httpx.Response(200, content=mocked_response.content)
+
+        async def run():
+            retry = RetryPolicy(max_attempts=3, backoff=0)
+            async with AsyncStrang(build_transport(handler, retry=retry)) as client:
+                return await client._get_window("https://test/window")
+
+        if expected_error is None:
+            data, _, _ = asyncio.run(run())
+            assert list(data["value"]) == [0.0, 0.0]
+        else:
+            with pytest.raises(expected_error):
+                asyncio.run(run())
+
+        assert len(calls) == expected_calls
+
+    def test_unit_metobs_get_data(self):
+        """Unit test async Metobs deduplicates metadata and parses data."""
+        calls = []
+
+        async def run():
+            async with AsyncMetobs(build_transport(mock_metobs_handler(calls))) as c:
+                return await asyncio.gather(
+                    c.get_data(1, 1), c.get_data(1, 1), c.get_periods(1, 1)
+                )
+
+        data, _, periods = asyncio.run(run())
+
+        assert periods.key == "1"
+        assert calls.count(METOBS_URL + ".json") == 1
+        assert calls.count(METOBS_URL + "/version/1.0/parameter/1.json") == 1
+        assert calls.count(METOBS_CSV_URL) == 2
+
+        with open("tests/fixtures/metobs/data.csv", "rb") as f:
+            expected = Data._parse_data(Data._decode(f.read()))
+
+        pd.testing.assert_frame_equal(data.stationdata, expected.stationdata)
+        pd.testing.assert_frame_equal(data.station, expected.station)
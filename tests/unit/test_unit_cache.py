@@ -0,0 +1,149 @@
+"""Cache unit tests."""
+
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from smhi.cache import MemoCache, ResponseCache
+
+
+def get_response(content, headers=None):
+    """Build a response.
+
+    Args:
+        content: body of response
+        headers: headers of response
+
+    Returns:
+        response
+    """
+    response = requests.Response()
+    response.status_code = 200
+    response.headers.update(headers or {})
+    response._content = content
+
+    return response
+
+
+class TestUnitResponseCache:
+    """Unit tests for ResponseCache class."""
+
+    def test_unit_response_cache_get_set(self, tmp_path):
+        """Unit test for storing and reading responses."""
+        cache = ResponseCache(tmp_path)
+        assert cache.get("URL") is None
+
+        cache.set("URL", get_response(b"body", {"ETag": '"a"'}))
+        response, fresh = cache.get("URL")
+
+        assert fresh is True
+        assert response.content == b"body"
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"a"'
+        assert ResponseCache(tmp_path).get("URL")[0].content == b"body"
+
+    def test_unit_response_cache_ttl(self, tmp_path):
+        """Unit test for stale responses and revalidation."""
+        cache = ResponseCache(tmp_path, ttl=0)
+        headers = {"ETag": '"a"', "Last-Modified": "Mon, 01 Apr 2024 06:33:05 GMT"}
+        cache.set("URL", get_response(b"body", headers))
+        response, fresh = cache.get("URL")
+
+        assert fresh is False
+        assert cache.validators(response) == {
+            "If-None-Match": '"a"',
+            "If-Modified-Since": "Mon, 01 Apr 2024 06:33:05 GMT",
+        }
+        assert cache.validators(get_response(b"")) == {}
+
+        cache.ttl = 60
+        cache.touch("URL")
+        assert cache.get("URL")[1] is True
+
+    def test_unit_response_cache_evict(self, tmp_path):
+        """Unit test for size based eviction of least recently used entries."""
+        cache = ResponseCache(tmp_path, max_size=10)
+        cache.set("URL1", get_response(b"12345"))
+        meta_path, _ = cache._paths("URL1")
+        os.utime(meta_path, (time.time() - 10, time.time() - 10))
+        cache.set("URL2", get_response(b"12345"))
+        cache.set("URL3", get_response(b"12345"))
+
+        assert cache.get("URL1") is None
+        assert cache.get("URL2") is not None
+        assert cache.get("URL3") is not None
+
+        cache.clear()
+        assert cache.get("URL2") is None
+
+
+class TestUnitMemoCache:
+    """Unit tests for MemoCache class."""
+
+    def test_unit_memo_cache_get_or_set(self):
+        """Unit test for memoization and least recently used eviction."""
+        cache = MemoCache(max_entries=2)
+        factory = MagicMock(side_effect=lambda: object())
+
+        a = cache.get_or_set("a", factory)
+        assert cache.get_or_set("a", factory) is a
+        cache.get_or_set("b", factory)
+        cache.get_or_set("a", factory)
+        cache.get_or_set("c", factory)
+
+        assert len(cache) == 2
+        assert factory.call_count == 3
+        assert cache.get_or_set("a", factory) is a
+        cache.get_or_set("b", factory)
+        assert factory.call_count == 4
+
+        cache.clear()
+        assert len(cache) == 0
+
+    @patch("smhi.cache.time.monotonic")
+    def test_unit_memo_cache_ttl(self, mock_monotonic):
+        """Unit test for expiry of entries."""
+        cache = MemoCache(ttl=10)
+        mock_monotonic.return_value = 0
+        a = cache.get_or_set("a", object)
+
+        mock_monotonic.return_value = 9
+        assert cache.get_or_set("a", object) is a
+
+        mock_monotonic.return_value = 10
+        assert cache.get_or_set("a", object) is not a
+
+    def test_unit_memo_cache_factory_error(self):
+        """Unit test for removing the key lock when the factory fails."""
+        cache = MemoCache()
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_set("a", MagicMock(side_effect=ConnectionError()))
+
+        assert len(cache) == 0
+        assert cache._key_locks == {}
+        assert cache.get_or_set("a", lambda: "value") == "value"
+        assert cache._key_locks == {}
+
+    def test_unit_memo_cache_threads(self):
+        """Unit test for a single factory call from concurrent threads."""
+        cache = MemoCache()
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        threads = [
+            threading.Thread(target=cache.get_or_set, args=("a", factory))
+            for _ in range(8)
+        ]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+
+        assert len(calls) == 1
@@ -0,0 +1,201 @@
+"""Station index unit tests."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from geopy import distance
+
+from smhi.geo import Geocoder, StationIndex, _load_gazetteer, geo_cache
+
+STATIONS = [
+    SimpleNamespace(id=1, name="Akalla", latitude=59.5, longitude=17.8),
+    SimpleNamespace(id=2, name="Göteborg", latitude=57.7, longitude=11.9),
+    SimpleNamespace(id=3, name="Kiruna", latitude=67.8, longitude=20.2),
+    SimpleNamespace(id=4, name="Uppsala", latitude=59.8, longitude=17.6),
+    SimpleNamespace(id=5, name="Malmö", latitude=55.6, longitude=13.0),
+]
+
+
+def geodesic_reference(latitude, longitude):
+    """Get stations sorted by geodesic distance, one at a time."""
+    return sorted(
+        [
+            (
+                s.id,
+                s.name,
+                distance.distance((latitude, longitude), (s.latitude, s.longitude)).km,
+            )
+            for s in STATIONS
+        ],
+        key=lambda x: x[2],
+    )
+
+
+class TestUnitStationIndex:
+    """Unit tests for StationIndex class."""
+
+    @pytest.mark.parametrize("latitude, longitude", [(59.3, 18.0), (56.0, 14.0)])
+    @pytest.mark.parametrize("k", [0, 1, 3, 10])
+    def test_unit_nearest(self, latitude, longitude, k):
+        """Unit test for StationIndex nearest method."""
+        index = StationIndex(STATIONS)
+        expected = geodesic_reference(latitude, longitude)[:k]
+
+        assert index.nearest(latitude, longitude, k, geodesic=True) == expected
+
+        nearest = index.nearest(latitude, longitude, k)
+        assert [s[0] for s in nearest] == [s[0] for s in expected]
+        np.testing.assert_allclose(
+            [s[2] for s in nearest], [s[2] for s in expected], rtol=0.006
+        )
+
+    @pytest.mark.parametrize("radius", [0, 50, 500, 5000])
+    def test_unit_within(self, radius):
+        """Unit test for StationIndex within method."""
+        index = StationIndex(STATIONS)
+        expected = [s for s in geodesic_reference(59.3, 18.0) if s[2] <= radius]
+
+        assert index.within(59.3, 18.0, radius, geodesic=True) == expected
+        assert [s[0] for s in index.within(59.3, 18.0, radius)] == [
+            s[0] for s in expected
+        ]
+
+    def test_unit_haversine(self):
+        """Unit test for StationIndex haversine method with arrays."""
+        index = StationIndex(STATIONS)
+
+        distances = index.haversine([59.5, 55.6], [17.8, 13.0])
+
+        assert distances.shape == (2, len(STATIONS))
+        assert distances[0, 0] == pytest.approx(0)
+        assert distances[1, 4] == pytest.approx(0)
+        np.testing.assert_allclose(distances[0], index.haversine(59.5, 17.8))
+
+    def test_unit_of(self):
+        """Unit test for StationIndex of method."""
+        stations = SimpleNamespace(station=STATIONS)
+
+        index = StationIndex.of(stations)
+
+        assert StationIndex.of(stations) is index
+        assert len(index) == len(STATIONS)
+
+    @pytest.mark.parametrize("k", [0, 2, 10])
+    def test_unit_nearest_many(self, k, monkeypatch):
+        """Unit test for StationIndex nearest_many method."""
+        monkeypatch.setattr("smhi.geo.GEO_BATCH_SIZE", 2)
+        geo_cache.clear()
+        index = StationIndex(STATIONS)
+        latitudes = [59.3, 56.0, 67.0]
+        longitudes = [18.0, 14.0, 20.0]
+
+        df = index.nearest_many(latitudes, longitudes, k)
+
+        assert df.index.names == ["site", "rank"]
+        assert len(df) == 3 * min(k, len(STATIONS))
+        for site, (latitude, longitude) in enumerate(zip(latitudes, longitudes)):
+            expected = index.nearest(latitude, longitude, k)
+            if expected:
+                assert list(df.loc[site, "station"]) == [s[0] for s in expected]
+                np.testing.assert_allclose(
+                    df.loc[site, "distance"], [s[2] for s in expected]
+                )
+
+        with patch.object(index, "_nearest_many") as mock_nearest_many:
+            pd.testing.assert_frame_equal(
+                index.nearest_many(latitudes, longitudes, k), df
+            )
+            mock_nearest_many.assert_not_called()
+
+        with pytest.raises(ValueError):
+            index.nearest_many([1.0, 2.0], [1.0], k)
+
+
+class TestUnitGeocoder:
+    """Unit tests for Geocoder class."""
+
+    @pytest.mark.parametrize("name", ["Göteborg", "goteborg", " GÖTEBORG "])
+    @patch("geopy.geocoders.Nominatim.__new__")
+    def test_unit_geocode_gazetteer(self, mock_nominatim, name):
+        """Unit test geocode resolves gazetteer names without Nominatim."""
+        latitude, longitude = Geocoder().geocode(name)
+
+        assert latitude == pytest.approx(57.71, abs=0.01)
+        assert longitude == pytest.approx(11.97, abs=0.01)
+        mock_nominatim.assert_not_called()
+
+    @pytest.mark.parametrize(
+        "name, expected",
+        [
+            ("Åsa", (57.35, 12.12)),
+            ("asa", (59.6, 17.1)),
+            ("ÖLME", (59.37, 14.0)),
+            ("olme", None),
+            ("Älmhult", (56.55, 14.14)),
+            ("almhult", (56.55, 14.14)),
+        ],
+    )
+    @patch("geopy.geocoders.Nominatim.__new__")
+    def test_unit_geocode_gazetteer_diacritics(
+        self, mock_nominatim, tmp_path, name, expected
+    ):
+        """Unit test geocode keeps å, ä and ö apart in the gazetteer."""
+        path = tmp_path / "gazetteer.csv"
+        path.write_text(
+            "name;latitude;longitude\nÅsa;57.35;12.12\nAsa;59.6;17.1\n"
+            + "Ölme;59.37;14.0\nÖlmé;1.0;2.0\nÄlmhult;56.55;14.14\n",
+            encoding="utf-8",
+        )
+        geocode = mock_nominatim.return_value.geocode
+        geocode.return_value = None
+
+        _load_gazetteer.cache_clear()
+        try:
+            with patch("smhi.geo.GAZETTEER_PATH", path):
+                if expected is None:
+                    with pytest.raises(ValueError):
+                        Geocoder(min_delay=0).geocode(name)
+                else:
+                    assert Geocoder(min_delay=0).geocode(name) == expected
+        finally:
+            _load_gazetteer.cache_clear()
+
+    @patch("geopy.geocoders.Nominatim.__new__")
+    def test_unit_geocode_cache(self, mock_nominatim, tmp_path):
+        """Unit test geocode caches Nominatim lookups on disk."""
+        geocode = mock_nominatim.return_value.geocode
+        geocode.side_effect = lambda name: SimpleNamespace(latitude=1.0, longitude=2.0)
+        path = tmp_path / "geocode.json"
+
+        geocoder = Geocoder(path, gazetteer=False, min_delay=0)
+        assert geocoder.geocode("Bengtsfors") == (1.0, 2.0)
+        assert geocoder.geocode("bengtsfors") == (1.0, 2.0)
+        assert Geocoder(path, gazetteer=False).geocode("Bengtsfors") == (1.0, 2.0)
+
+        mock_nominatim.assert_called_once()
+        geocode.assert_called_once_with("Bengtsfors")
+
+    @patch("geopy.geocoders.Nominatim.__new__")
+    def test_unit_geocode_evict(self, mock_nominatim, tmp_path):
+        """Unit test geocode evicts the least recently used lookups."""
+        geocode = mock_nominatim.return_value.geocode
+        geocode.side_effect = lambda name: SimpleNamespace(latitude=1.0, longitude=2.0)
+        path = tmp_path / "geocode.json"
+
+        geocoder = Geocoder(path, gazetteer=False, max_entries=2, min_delay=0)
+        for name in ["a", "b", "a", "c"]:
+            geocoder.geocode(name)
+
+        assert list(Geocoder(path)._entries) == ["a", "c"]
+        assert geocode.call_count == 3
+
+    @patch("geopy.geocoders.Nominatim.__new__")
+    def test_unit_geocode_fail(self, mock_nominatim):
+        """Unit test geocode of unknown place."""
+        mock_nominatim.return_value.geocode.return_value = None
+
+        with pytest.raises(ValueError):
+            Geocoder(gazetteer=False, min_delay=0).geocode("Atlantis")
@@ -0,0 +1,234 @@
+"""Grid geometry unit tests."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from smhi.grid import GridCube, GridGeometry, GridGeometryCache, GridSampler
+
+KEY = ("mesan2g", 2, 2)
+
+
+def build_curvilinear_grid(rows=40, columns=30):
+    """Build a skewed and curved grid, ordered row by row.
+
+    Args:
+        rows: number of rows
+        columns: number of columns
+
+    Returns:
+        grid geometry
+    """
+    row, column = np.meshgrid(np.arange(rows), np.arange(columns), indexing="ij")
+    latitudes = 55 + row * 0.1 + column * 0.01
+    longitudes = 12 + column * 0.2 - row * 0.02 + 0.0005 * row * column
+
+    return GridGeometry(latitudes.ravel(), longitudes.ravel())
+
+
+def linear_field(latitudes, longitudes):
+    """Linear field of coordinates."""
+    return 3 * np.asarray(latitudes) - 2 * np.asarray(longitudes)
+
+
+class TestUnitGridGeometry:
+    """Unit tests for GridGeometry class."""
+
+    def test_unit_from_coordinates(self):
+        """Unit test building geometry from GeoJSON coordinates."""
+        geometry = GridGeometry.from_coordinates([[16.0, 58.0], [17.0, 59.0]])
+
+        assert len(geometry) == 2
+        np.testing.assert_array_equal(geometry.latitudes, [58.0, 59.0])
+        np.testing.assert_array_equal(geometry.longitudes, [16.0, 17.0])
+
+        with pytest.raises(ValueError):
+            geometry.latitudes[0] = 0
+
+    def test_unit_shape(self):
+        """Unit test inferring the shape of a structured grid."""
+        assert build_curvilinear_grid(40, 30).shape == (40, 30)
+        assert GridGeometry([58.0, 58.1, 58.3], [16.0, 16.0, 16.0]).shape is None
+
+    def test_unit_mismatch(self):
+        """Unit test geometry with mismatching coordinates."""
+        with pytest.raises(ValueError):
+            GridGeometry([58.0, 59.0], [16.0])
+
+    def test_unit_locate(self):
+        """Unit test locating grid points from their coordinates."""
+        geometry = build_curvilinear_grid(4, 3)
+        order = np.random.default_rng(0).permutation(len(geometry))[:5]
+
+        np.testing.assert_array_equal(
+            geometry.locate(geometry.latitudes, geometry.longitudes), np.arange(12)
+        )
+        np.testing.assert_array_equal(
+            geometry.locate(geometry.latitudes[order], geometry.longitudes[order]),
+            order,
+        )
+
+        with pytest.raises(ValueError):
+            geometry.locate([50.0], [10.0])
+
+    def test_unit_to_raster(self):
+        """Unit test mapping values onto a raster of the grid."""
+        geometry = build_curvilinear_grid(3, 4)
+        values = np.arange(24.0).reshape(2, 12)
+
+        raster = geometry.to_raster(values)
+        partial = geometry.to_raster([1.0, 2.0], np.array([11, 0]))
+
+        assert raster.shape == (2, 3, 4)
+        assert raster.dtype == np.float32
+        assert raster[1, 2, 1] == values[1, 9]
+        assert partial[0, 0] == 2.0 and partial[2, 3] == 1.0
+        assert np.isnan(partial).sum() == 10
+
+        with pytest.raises(ValueError):
+            GridGeometry([58.0, 58.1, 58.3], [16.0, 16.0, 16.0]).to_raster([1, 2, 3])
+
+
+class TestUnitGridSampler:
+    """Unit tests for GridSampler class."""
+
+    def test_unit_bilinear(self):
+        """Unit test bilinear sampling reproduces a linear field inside the grid."""
+        geometry = build_curvilinear_grid()
+        rng = np.random.default_rng(0)
+        latitudes = rng.uniform(56, 58, 200)
+        longitudes = rng.uniform(13, 17, 200)
+
+        sampler = GridSampler(geometry, latitudes, longitudes)
+        values = sampler(linear_field(geometry.latitudes, geometry.longitudes))
+
+        assert len(sampler) == 200
+        np.testing.assert_allclose(
+            values, linear_field(latitudes, longitudes), atol=1e-3
+        )
+        np.testing.assert_allclose(sampler.weights.sum(axis=1), 1)
+
+    def test_unit_grid_points(self):
+        """Unit test sampling at grid points returns the grid values."""
+        geometry = build_curvilinear_grid()
+        values = np.arange(len(geometry), dtype=np.float64)
+        sites = [0, 31, 555, len(geometry) - 1]
+
+        for method in ["bilinear", "nearest"]:
+            sampler = GridSampler(
+                geometry, geometry.latitudes[sites], geometry.longitudes[sites], method
+            )
+            np.testing.assert_allclose(sampler(values), values[sites], atol=1e-6)
+
+    @pytest.mark.parametrize("method", ["bilinear", "nearest"])
+    def test_unit_outside(self, method):
+        """Unit test sites outside the grid get NaN."""
+        geometry = build_curvilinear_grid()
+        sampler = GridSampler(geometry, [50.0, 57.0], [0.0, 15.0], method)
+
+        values = sampler(linear_field(geometry.latitudes, geometry.longitudes))
+
+        assert np.isnan(values[0])
+        assert not np.isnan(values[1])
+
+    def test_unit_leading_axes(self):
+        """Unit test sampling values with leading time and parameter axes."""
+        geometry = build_curvilinear_grid()
+        sampler = GridSampler(geometry, [56.0, 57.0], [14.0, 15.0])
+
+        values = np.ones((3, 2, len(geometry)))
+
+        np.testing.assert_allclose(sampler(values), np.ones((3, 2, 2)))
+        with pytest.raises(ValueError):
+            sampler(values[..., 1:])
+
+    def test_unit_unstructured(self):
+        """Unit test bilinear sampling of an unstructured grid."""
+        geometry = GridGeometry([58.0, 58.1, 58.3], [16.0, 16.0, 16.0])
+
+        with pytest.raises(ValueError):
+            GridSampler(geometry, [58.0], [16.0])
+
+        sampler = GridSampler(geometry, [58.09], [16.0], "nearest")
+        assert sampler([1.0, 2.0, 3.0]) == [2.0]
+
+
+class TestUnitGridCube:
+    """Unit tests for GridCube class."""
+
+    def build_cube(self):
+        """Build cube with two times, two parameters and three grid points."""
+        geometry = GridGeometry([58.0, 58.1, 58.2], [16.0, 16.1, 16.2])
+        values = np.arange(12, dtype=np.float32).reshape(2, 2, 3)
+
+        return GridCube(
+            ["2024-03-31T06:00:00Z", "2024-03-31T07:00:00Z"],
+            ["t", "ws"],
+            geometry,
+            values,
+        )
+
+    def test_unit_empty(self):
+        """Unit test cube is filled with NaN by default."""
+        cube = GridCube(["2024-03-31T06"], ["t"], GridGeometry([58.0], [16.0]))
+
+        assert cube.shape == (1, 1, 1)
+        assert cube.values.dtype == np.float32
+        assert np.isnan(cube.values).all()
+
+        with pytest.raises(ValueError):
+            GridCube(["2024-03-31T06"], ["t"], cube.geometry, np.zeros((1, 2, 1)))
+
+    def test_unit_sel(self):
+        """Unit test selections are views of the cube."""
+        cube = self.build_cube()
+
+        np.testing.assert_array_equal(cube.sel("2024-03-31T07", "ws"), [9, 10, 11])
+        np.testing.assert_array_equal(cube.sel(parameter="t"), [[0, 1, 2], [6, 7, 8]])
+        assert np.shares_memory(cube.sel("2024-03-31T06"), cube.values)
+
+    def test_unit_frames(self):
+        """Unit test frame and long table views."""
+        cube = self.build_cube()
+
+        frame = cube.frame("2024-03-31T06:00:00Z")
+        assert list(frame.columns) == ["t", "ws", "lat", "lon"]
+        assert list(frame["ws"]) == [3, 4, 5]
+
+        df = cube.to_frame()
+        assert df.index.names == ["time", "point"]
+        assert df.loc[(pd.Timestamp("2024-03-31T07:00:00Z"), 1), "ws"] == 10
+
+    def test_unit_sample(self):
+        """Unit test sampling the cube at sites."""
+        cube = self.build_cube()
+        sampler = GridSampler(cube.geometry, [58.1], [16.1], "nearest")
+
+        np.testing.assert_array_equal(cube.sample(sampler), [[[1], [4]], [[7], [10]]])
+
+
+class TestUnitGridGeometryCache:
+    """Unit tests for GridGeometryCache class."""
+
+    def test_unit_memory(self):
+        """Unit test in-memory cache."""
+        cache = GridGeometryCache()
+        geometry = GridGeometry([58.0], [16.0])
+
+        assert cache.get(KEY) is None
+        cache.set(KEY, geometry)
+        assert cache.get(KEY) is geometry
+
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_unit_disk(self, tmp_path):
+        """Unit test geometries are stored between cache instances."""
+        GridGeometryCache(tmp_path).set(KEY, GridGeometry([58.0, 59.0], [16.0, 17.0]))
+
+        geometry = GridGeometryCache(tmp_path).get(KEY)
+
+        assert [p.name for p in tmp_path.iterdir()] == ["mesan2g_2_2.npz"]
+        np.testing.assert_array_equal(geometry.latitudes, [58.0, 59.0])
+        np.testing.assert_array_equal(geometry.longitudes, [16.0, 17.0])
+        assert GridGeometryCache(tmp_path).get(("pmp3g", 2, 2)) is None
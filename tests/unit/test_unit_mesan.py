@@ -4,11 +4,18 @@ import json
 from unittest.mock import patch
 
 import arrow
+import numpy as np
 import pandas as pd
 import pytest
 from utils import get_response
 
-from smhi.constants import MESAN_LEVELS_UNIT, MESAN_PARAMETER_DESCRIPTIONS
+from smhi.constants import (
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    MESAN_LEVELS_UNIT,
+    MESAN_PARAMETER_DESCRIPTIONS,
+)
+from smhi.grid import GridGeometry, get_grid_cache, set_grid_cache
 from smhi.mesan import Mesan
 from smhi.models.mesan_model import MesanGeometry, MesanParameter, MesanParameterItem
 from smhi.utils import format_datetime
@@ -44,6 +51,14 @@ MOCK_MESAN_PARAMETERS = MesanParameter(
 )
 
 
+@pytest.fixture(autouse=True)
+def reset_grid_cache():
+    """Reset the shared grid cache between tests."""
+    set_grid_cache(None)
+    yield
+    set_grid_cache(None)
+
+
 @pytest.fixture
 def setup_point():
     """Read in Point response."""
@@ -219,7 +234,7 @@ class TestUnitMesan:
         assert data.status == mock_get_data.return_value[2]
 
     @pytest.mark.parametrize("lat, lon", [(0, 0), (1, 1)])
-    @patch("smhi.utils.requests.get")
+    @patch("smhi.utils.requests.Session.get")
     @patch("smhi.mesan.Mesan._get_parameters", return_value=MOCK_MESAN_PARAMETERS)
     def test_unit_mesan_get_point(
         self, mock_get_parameters, mock_requests_get, lat, lon, setup_point
@@ -238,7 +253,9 @@ class TestUnitMesan:
         data = client.get_point(lat, lon)
         url = BASE_URL + f"geotype/point/lon/{lon}/lat/{lat}/data.json"
 
-        mock_requests_get.assert_called_once_with(url, timeout=200)
+        mock_requests_get.assert_called_once_with(
+            url, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+        )
         assert data.latitude == lat
         assert data.longitude == lon
         assert data.url == url
@@ -257,11 +274,32 @@ class TestUnitMesan:
             data.df.astype(float), expected_answer.astype(float)
         )
 
+    def test_unit_mesan_format_data_point(self):
+        """Unit test for Mesan _format_data_point method."""
+        data = {
+            "timeSeries": [
+                {"time": "2024-03-31T07:00:00Z", "data": {"t": 2.5, "ws": 3}},
+                {"time": "2024-03-31T06:00:00Z", "data": {"t": 1}},
+                {"time": "2024-03-31T07:00:00Z", "data": {"t": 9, "ws": 9}},
+            ]
+        }
+
+        df = Mesan._format_data_point(Mesan.__new__(Mesan), data)
+        expected = pd.DataFrame(
+            {"t": [1.0, 2.5], "ws": [float("nan"), 3.0]},
+            index=pd.DatetimeIndex(
+                ["2024-03-31T06:00:00Z", "2024-03-31T07:00:00Z"], name="times"
+            ),
+        )
+        expected.columns.name = "name"
+
+        pd.testing.assert_frame_equal(df, expected)
+
     @pytest.mark.parametrize(
         "times, parameter, geo, downsample",
         [("2024-03-31T06", "air_temperature", True, 1)],
     )
-    @patch("smhi.utils.requests.get")
+    @patch("smhi.utils.requests.Session.get")
     @patch("smhi.mesan.Mesan._get_parameters", return_value=MOCK_MESAN_PARAMETERS)
     @patch("smhi.mesan.arrow.now", return_value=arrow.get("2024-03-31T07:14:10Z"))
     def test_unit_mesan_get_multipoint(
@@ -284,11 +322,16 @@ class TestUnitMesan:
             expected_answer,
         ) = setup_multipoint
         mock_requests_get.return_value = mock_response
+        get_grid_cache().set(
+            ("mesan2g", 2, downsample), GridGeometry([52.50044], [2.250475])
+        )
 
         client = Mesan()
         data = client.get_multipoint(times, parameter, geo, downsample)
         times = format_datetime(times)
 
+        assert "with-geo=false" in mock_requests_get.call_args.args[0]
+
         assert data.parameter == parameter
         assert data.parameter_meaning == MESAN_PARAMETER_DESCRIPTIONS[parameter]
         assert data.geo == geo
@@ -301,6 +344,64 @@ class TestUnitMesan:
         assert data.headers == mock_response.headers
         pd.testing.assert_frame_equal(data.df, expected_answer)
 
+    @patch("smhi.mesan.Mesan._get_data")
+    @patch("smhi.mesan.Mesan._get_parameters", return_value=MOCK_MESAN_PARAMETERS)
+    def test_unit_mesan_get_grid_geometry(self, mock_get_parameters, mock_get_data):
+        """Unit test for Mesan get_grid_geometry method."""
+        mock_get_data.return_value = (
+            {"type": "MultiPoint", "coordinates": [[16.0, 58.0], [17.0, 59.0]]},
+            {},
+            200,
+        )
+
+        client = Mesan()
+        geometry = client.get_grid_geometry(2)
+
+        assert client.get_grid_geometry(2) is geometry
+        mock_get_data.assert_called_once_with(
+            BASE_URL + "geotype/multipoint.json?downsample=2"
+        )
+        np.testing.assert_array_equal(geometry.latitudes, [58.0, 59.0])
+        np.testing.assert_array_equal(geometry.longitudes, [16.0, 17.0])
+
+        df = client._format_data_multipoint(
+            {"timeSeries": [{"data": {"t": [1, 2]}}]}, "t", geometry
+        )
+
+        assert np.shares_memory(df["lat"].to_numpy(), geometry.latitudes)
+        with pytest.raises(ValueError):
+            client._format_data_multipoint(
+                {"timeSeries": [{"data": {"t": [1]}}]}, "t", geometry
+            )
+
+    @patch("smhi.mesan.Mesan._check_times", return_value=True)
+    @patch("smhi.mesan.Mesan._get_data")
+    @patch("smhi.mesan.Mesan._get_parameters", return_value=MOCK_MESAN_PARAMETERS)
+    def test_unit_mesan_get_cube(
+        self, mock_get_parameters, mock_get_data, mock_check_times
+    ):
+        """Unit test for Mesan get_cube method."""
+
+        def get_data(url):
+            if "parameter/ws" in url:
+                raise ValueError("Out of bounds")
+
+            value = 1.0 if "T06" in url else 2.0
+            return {"timeSeries": [{"data": {"t": [value, value]}}]}, {}, 200
+
+        mock_get_data.side_effect = get_data
+        get_grid_cache().set(("mesan2g", 2, 2), GridGeometry([58, 59], [16, 17]))
+
+        cube = Mesan().get_cube(
+            ["2024-03-31T06:00:00Z", "2024-03-31T07:00:00Z"], ["t", "ws"], 2
+        )
+
+        assert cube.shape == (2, 2, 2)
+        np.testing.assert_array_equal(cube.sel(parameter="t"), [[1, 1], [2, 2]])
+        assert np.isnan(cube.sel(parameter="ws")).all()
+        assert sorted(p for _, p in cube.errors) == ["ws", "ws"]
+        assert all("with-geo=false" in c.args[0] for c in mock_get_data.call_args_list)
+
     @pytest.mark.parametrize(
         "times, parameter, geo, downsample, expected_answer",
         [
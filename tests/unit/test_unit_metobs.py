@@ -16,6 +16,7 @@ from smhi.metobs import (
     Periods,
     Stations,
     Versions,
+    metobs_cache,
 )
 from smhi.models.metobs_model import (
     MetobsCategoryModel,
@@ -63,6 +64,14 @@ class MockPeriods:
         self.data = data
 
 
+@pytest.fixture(autouse=True)
+def clear_metobs_cache():
+    """Clear the in-process Metobs cache between tests."""
+    metobs_cache.clear()
+    yield
+    metobs_cache.clear()
+
+
 @pytest.fixture
 def setup_versions():
     """Read in Versions response."""
@@ -161,7 +170,11 @@ def setup_data(setup_periods):
         "tests/fixtures/metobs/data_parameter.csv", index_col=0
     )
     mocked_period = pd.read_csv("tests/fixtures/metobs/data_period.csv", index_col=0)
-    mocked_data = pd.read_csv("tests/fixtures/metobs/data_data.csv", index_col=0)
+    mocked_data = pd.read_csv(
+        "tests/fixtures/metobs/data_data.csv",
+        index_col=0,
+        dtype={"Lufttemperatur": "float64", "Kvalitet": "category"},
+    )
     mocked_data.index = pd.to_datetime(mocked_data.index)
 
     return (
@@ -208,7 +221,9 @@ class TestUnitBaseMetobs:
         assert base.summary is None
         assert base.link is None
 
-    @patch("smhi.utils.requests.get", return_value=MockResponse(200, None, None))
+    @patch(
+        "smhi.utils.requests.Session.get", return_value=MockResponse(200, None, None)
+    )
     def test_unit_basemetobs_get_and_parse_request(self, mock_requests_get):
         """Unit test for BaseMetobs _get_and_parse_request method."""
         base = BaseMetobs()
@@ -259,7 +274,7 @@ class TestUnitVersions:
     """Unit tests for Versionss class."""
 
     @pytest.mark.parametrize("data_type", [("json"), ("yaml"), ("xml"), (None)])
-    @patch("smhi.utils.requests.get")
+    @patch("smhi.utils.requests.Session.get")
     def test_unit_versions_init(self, mock_requests_get, data_type, setup_versions):
         """Unit test for Parameters init method."""
         mock_response, expected_answer = setup_versions
@@ -283,6 +298,34 @@ class TestUnitVersions:
         assert versions.data == expected_answer.version
 
 
+class TestUnitMetobsCache:
+    """Unit tests for the in-process cache of the Metobs hierarchy."""
+
+    @patch("smhi.utils.requests.Session.get")
+    def test_unit_metobs_cached(
+        self, mock_requests_get, setup_versions, setup_parameters, setup_stations
+    ):
+        """Unit test for cached Versions, Parameters and Stations."""
+        mock_requests_get.side_effect = [
+            setup_versions[0],
+            setup_parameters[0],
+            setup_stations[0],
+        ]
+
+        stations = Stations.cached(1)
+        parameters = Parameters.cached(1)
+
+        assert Stations.cached(1) is stations
+        assert Parameters.cached("1.0") is parameters
+        assert Versions.cached() is parameters.versions_object
+        assert stations.parameters_in_version is parameters
+        assert mock_requests_get.call_count == 3
+
+        metobs_cache.clear()
+        mock_requests_get.side_effect = [setup_versions[0]]
+        assert Versions.cached() is not parameters.versions_object
+
+
 class TestUnitParameters:
     """Unit tests for Parameters class."""
 
@@ -298,7 +341,7 @@ class TestUnitParameters:
         ],
     )
     @patch("smhi.metobs.Versions")
-    @patch("smhi.utils.requests.get")
+    @patch("smhi.utils.requests.Session.get")
     def test_unit_parameters_init(
         self,
         mock_requests_get,
@@ -313,8 +356,9 @@ class TestUnitParameters:
         mock_requests_get.return_value = mock_response
 
         if supply_versions is False:
-            mock_versions_object.return_value = mock_versions
+            mock_versions_object.cached.return_value = mock_versions
             Parameters()
+            mock_versions_object.cached.assert_called_once()
 
             return None
 
@@ -352,7 +396,7 @@ class TestUnitStations:
             ("1", "Lufttemperatur", None),
         ],
     )
-    @patch("smhi.utils.requests.get")
+    @patch("smhi.utils.requests.Session.get")
     def test_unit_stations_init(
         self,
         mock_requests_get,
@@ -411,7 +455,7 @@ class TestUnitPeriods:
             (1, "Akalla", "all", "json"),
         ],
     )
-    @patch("smhi.utils.requests.get")
+    @patch("smhi.utils.requests.Session.get")
     def test_unit_periods_init(
         self,
         mock_requests_get,
@@ -484,7 +528,7 @@ class TestUnitData:
             ("corrected-archive", "json"),
         ],
     )
-    @patch("smhi.utils.requests.get")
+    @patch("smhi.utils.requests.Session.get")
     def test_unit_data_init(
         self,
         mock_requests_get,
@@ -523,3 +567,132 @@ class TestUnitData:
         pd.testing.assert_frame_equal(data.parameter, expected_parameter)
         pd.testing.assert_frame_equal(data.period, expected_period)
         pd.testing.assert_frame_equal(data.df, expected_data)
+
+    @patch("smhi.metobs.Periods")
+    @patch("smhi.metobs.Data.__init__", return_value=None)
+    def test_unit_data_bulk(self, mock_data_init, mock_periods):
+        """Unit test for Data bulk method."""
+        stations = MagicMock()
+        stations.station = [MagicMock(id=1), MagicMock(id=2), MagicMock(id=3)]
+
+        def mock_periods_init(stations, station, data_type):
+            if station == 2:
+                raise ValueError("Station 2 failed.")
+
+            return station
+
+        mock_periods.side_effect = mock_periods_init
+
+        bulk = Data.bulk(stations, max_workers=2)
+
+        assert list(bulk.data) == [1, 3]
+        assert list(bulk.errors) == [2]
+        assert isinstance(bulk.errors[2], ValueError)
+        assert mock_data_init.call_count == 2
+
+        index = pd.date_range("2020-01-01", periods=2, tz="UTC")
+        for station, data in bulk.data.items():
+            data.df = pd.DataFrame({"value": [station] * 2}, index=index)
+
+        assert list(bulk.frames) == [1, 3]
+        assert bulk.df.index.names == ["station", None]
+        assert list(bulk.df.loc[3, "value"]) == [3, 3]
+
+        bulk = Data.bulk(stations, station_ids=[3, 3, 1], period="latest-day")
+        assert list(bulk.data) == [3, 1]
+        mock_data_init.assert_any_call(3, "latest-day", "json", "c")
+        mock_data_init.assert_any_call(1, "latest-day", "json", "c")
+        assert mock_data_init.call_count == 4
+
+    @pytest.mark.parametrize(
+        "chunk_size, engine", [(1, "c"), (7, "python"), (4096, "pyarrow")]
+    )
+    def test_unit_data_parse_stream(self, chunk_size, engine):
+        """Unit test for Data _parse_stream method."""
+        if engine == "pyarrow":
+            pytest.importorskip("pyarrow")
+
+        content = get_data("tests/fixtures/metobs/data_rows.csv", "data")
+        expected = Data._parse_data(Data._decode(content))
+        chunks = MockResponse(200, None, content).iter_content(chunk_size)
+
+        data_model = Data._parse_stream(chunks, engine)
+
+        assert len(data_model.stationdata) == len(expected.stationdata) == 48
+
+        pd.testing.assert_frame_equal(data_model.station, expected.station)
+        pd.testing.assert_frame_equal(data_model.parameter, expected.parameter)
+        pd.testing.assert_frame_equal(data_model.period, expected.period)
+        pd.testing.assert_frame_equal(data_model.stationdata, expected.stationdata)
+
+    def test_unit_data_parse_stream_station_set(self):
+        """Unit test for Data _parse_stream method with a station set."""
+        content = (
+            "Parameternamn;Beskrivning;Enhet\n"
+            + "Lufttemperatur;momentanvärde, 1 gång/tim;celsius\n\n"
+            + "Stationsnamn;Stationsnummer;Datum;Tid (UTC);Lufttemperatur;Kvalitet;;\n"
+            + "Akalla;1;2024-01-01;00:00:00;-3.1;G;;\n"
+            + "Abisko;2;2024-01-01;00:00:00;-12.4;G;;\n"
+        ).encode("utf-8")
+
+        data_model = Data._parse_stream([content[:50], content[50:]])
+        expected = Data._parse_data(Data._decode(content))
+
+        assert data_model.station is None
+        pd.testing.assert_frame_equal(data_model.parameter, expected.parameter)
+        pd.testing.assert_frame_equal(data_model.stationdata, expected.stationdata)
+        assert list(data_model.stationdata["Stationsnummer"]) == [1, 2]
+
+    @pytest.mark.parametrize(
+        "columns, values",
+        [
+            (
+                ["Datum", "Tid (UTC)"],
+                [
+                    ["2020-01-01", "2020-01-01", "2020-01-02"],
+                    ["00:00:00", "13:00:00", "00:00:00"],
+                ],
+            ),
+            (["Representativt dygn"], [["2020-01-01", "2020-01-02", "2020-01-02"]]),
+            (["Representativ månad"], [["2020-01", "2020-02", "2020-03"]]),
+            (
+                ["Representativt dygn"],
+                [["2020-01-01", "2020-01-02 06:00", "2020-01-03"]],
+            ),
+        ],
+    )
+    def test_unit_data_set_dataframe_index(self, columns, values):
+        """Unit test for Data _set_dataframe_index method."""
+        stationdata = pd.DataFrame(
+            {**dict(zip(columns, values)), "Lufttemperatur": [1.0, 2.0, 3.0]}
+        )
+        expected = pd.to_datetime(
+            stationdata[columns].agg(" ".join, axis=1), utc=True, format="mixed"
+        )
+
+        stationdata = Data._set_dataframe_index(stationdata)
+
+        assert list(stationdata.columns) == ["Lufttemperatur"]
+        pd.testing.assert_index_equal(stationdata.index, pd.DatetimeIndex(expected))
+
+        with pytest.raises(TypeError):
+            Data._set_dataframe_index(pd.DataFrame({"Lufttemperatur": [1.0]}))
+
+    def test_unit_data_set_dataframe_index_missing(self):
+        """Unit test for Data _set_dataframe_index method with missing values."""
+        stationdata = pd.DataFrame(
+            {
+                "Datum": ["2020-01-01", None, "2020-01-02", "2020-01-02"],
+                "Tid (UTC)": ["00:00:00", "12:00:00", None, "06:00:00"],
+                "Lufttemperatur": [1.0, 2.0, 3.0, 4.0],
+            }
+        )
+
+        stationdata = Data._set_dataframe_index(stationdata)
+
+        pd.testing.assert_index_equal(
+            stationdata.index,
+            pd.DatetimeIndex(
+                ["2020-01-01 00:00", pd.NaT, pd.NaT, "2020-01-02 06:00"], tz="UTC"
+            ),
+        )
@@ -2,9 +2,13 @@
 
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pandas as pd
 import pytest
 
+from smhi.geo import Geocoder, set_geocoder
+from smhi.metobs import metobs_cache
+from smhi.models.metobs_model import MetobsBulkModel
 from smhi.smhi import SMHI
 
 
@@ -35,9 +39,17 @@ class MockStationModel:
         self.data = data
 
 
+@pytest.fixture(autouse=True)
+def clear_metobs_cache():
+    """Clear the in-process Metobs cache between tests."""
+    metobs_cache.clear()
+    yield
+    metobs_cache.clear()
+
+
 @pytest.fixture
-def setup_iterate_over_time():
-    """Iterate over time fixture."""
+def setup_fill_gaps():
+    """Fill gaps fixture."""
     df = pd.DataFrame(
         {
             "date": [
@@ -53,14 +65,20 @@ def setup_iterate_over_time():
     df = df.set_index("date")
 
     nearby_df = pd.DataFrame(
-        {"date": ["2024-04-22 10:00", "2024-04-22 11:00"], "Temperatur": [8, 9]}
+        {
+            "date": [
+                "2024-04-21 11:00",
+                "2024-04-22 10:00",
+                "2024-04-22 11:00",
+                "2024-04-22 13:00",
+            ],
+            "Temperatur": [5, 8, 9, 13],
+        }
     )
     nearby_df["date"] = pd.to_datetime(nearby_df["date"])
     nearby_df = nearby_df.set_index("date")
 
-    missing_df = df[df.index.to_series().diff() > df.index.to_series().diff().median()]
-
-    return df, nearby_df, missing_df
+    return df, nearby_df
 
 
 class TestUnitSMHI:
@@ -228,8 +246,10 @@ class TestUnitSMHI:
             city,
             distance
         """
+        set_geocoder(Geocoder(gazetteer=False, min_delay=0))
         client = SMHI()
         _ = client._find_stations_by_city(parameter, city, distance)
+        set_geocoder(None)
         mock_nominatim.assert_called_once()
         mock_find_from_gps.assert_called_once()
 
@@ -237,14 +257,14 @@ class TestUnitSMHI:
     @patch("smhi.metobs.Stations.__new__")
     @patch("smhi.metobs.Periods.__new__")
     @patch("smhi.metobs.Data.__new__")
-    @patch("smhi.smhi.SMHI._iterate_over_time")
+    @patch("smhi.smhi.SMHI._fill_gaps")
     @patch("smhi.smhi.SMHI._find_missing_data")
     @patch("smhi.smhi.SMHI._find_stations_from_gps")
     def test_interpolate(
         self,
         mock_find_from_gps,
         mock_find_missing_data,
-        mock_iterate_over_time,
+        mock_fill_gaps,
         mock_data_data,
         mock_period_data,
         mock_station_data,
@@ -255,7 +275,7 @@ class TestUnitSMHI:
         Args:
             mock_find_from_gps,
             mock_find_missing_data,
-            mock_iterate_over_time,
+            mock_fill_gaps,
             mock_data_data,
             mock_period_data,
             mock_station_data,
@@ -270,13 +290,55 @@ class TestUnitSMHI:
         else:
             mock_find_from_gps.assert_called_once()
 
-    def test_iterate_over_time(self, setup_iterate_over_time):
-        """Unit test for SMHI _iterate_over_time method."""
-        df, nearby_df, missing_df = setup_iterate_over_time
-        client = SMHI()
+    def test_fill_gaps(self, setup_fill_gaps):
+        """Unit test for SMHI _fill_gaps method."""
+        df, nearby_df = setup_fill_gaps
+        closer_df = nearby_df.iloc[[1]] * 10
+
+        data = SMHI._fill_gaps(SMHI.__new__(SMHI), df, [closer_df, nearby_df])
+
+        assert data.index.is_unique
+        assert list(data.sort_index()["Temperatur"]) == [1, 1, 1, 80, 9, 12]
+
+    def test_find_gaps(self, setup_fill_gaps):
+        """Unit test for SMHI _find_gaps method."""
+        df, _ = setup_fill_gaps
+
+        starts, ends = SMHI._find_gaps(SMHI.__new__(SMHI), df.index)
+
+        assert list(pd.to_datetime(starts)) == [pd.Timestamp("2024-04-21 12:00")]
+        assert list(pd.to_datetime(ends)) == [pd.Timestamp("2024-04-22 12:00")]
+
+    def test_idw(self):
+        """Unit test for SMHI _idw method."""
+        values = np.array([[1.0, 4.0], [1.0, np.nan], [np.nan, np.nan]])
+
+        estimate, count = SMHI._idw(SMHI.__new__(SMHI), values, np.array([1, 2]), 2)
+
+        np.testing.assert_allclose(estimate, [(1 + 4 / 4) / (1 + 1 / 4), 1, np.nan])
+        np.testing.assert_array_equal(count, [2, 1, 0])
+
+    @patch("smhi.smhi.Data.bulk")
+    @patch("smhi.smhi.SMHI._find_stations_from_gps")
+    @patch("smhi.smhi.Stations.cached")
+    def test_get_interpolated_data(self, mock_stations, mock_find_from_gps, mock_bulk):
+        """Unit test for SMHI get_interpolated_data method."""
+        index = pd.date_range("2024-04-21", periods=3, freq="h", tz="UTC")
+        frames = {
+            1: pd.DataFrame({"Temperatur": [1.0, 2.0], "Kvalitet": "G"}, index[:2]),
+            2: pd.DataFrame({"Temperatur": [3.0, 4.0], "Kvalitet": "G"}, index[1:]),
+        }
+        mock_find_from_gps.return_value = [(1, "a", 0.0), (2, "b", 10.0), (3, "c", 20)]
+        mock_bulk.return_value = MetobsBulkModel(
+            data={i: MagicMock(df=df) for i, df in frames.items()}
+        )
+
+        df = SMHI.__new__(SMHI).get_interpolated_data(8, 59, 17, 50, k=2, power=0)
 
-        data = client._iterate_over_time(df, nearby_df, missing_df)
-        assert data.tail(2).iloc[0]["Temperatur"] == nearby_df.iloc[0]["Temperatur"]
+        assert mock_bulk.call_args.args[1] == [1, 2]
+        assert list(df.columns) == ["Temperatur", "stations"]
+        assert list(df["Temperatur"]) == [1.0, 2.5, 4.0]
+        assert list(df["stations"]) == [1, 2, 1]
 
     def test_find_missing_data(self):
         """Unit test for SMHI _find_missing_data method."""
@@ -0,0 +1,97 @@
+"""Grid store unit tests."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from smhi.grid import GridCube, GridGeometry, GridSampler
+from smhi.store import GridStore
+
+GEOMETRY = GridGeometry(
+    np.repeat([58.0, 58.1, 58.2], 6), np.tile(np.arange(6) * 0.1 + 16, 3)
+)
+TIMES = pd.date_range("2024-01-31T22:00", periods=4, freq="h", tz="UTC")
+
+
+@pytest.fixture
+def setup_store(tmp_path):
+    """Store with hourly values around a month boundary."""
+    store = GridStore(tmp_path, GEOMETRY)
+    for i, time in enumerate(TIMES):
+        store.write("t", time, np.arange(18) + 100 * i)
+
+    return store
+
+
+class TestUnitGridStore:
+    """Unit tests for GridStore class."""
+
+    def test_unit_open(self, tmp_path, setup_store):
+        """Unit test reopening a store."""
+        store = GridStore(tmp_path)
+
+        np.testing.assert_array_equal(store.geometry.latitudes, GEOMETRY.latitudes)
+        assert store.step == pd.Timedelta(hours=1)
+        assert sorted(p.name for p in (tmp_path / "t").iterdir()) == [
+            "2024-01.f32",
+            "2024-01.mask",
+            "2024-02.f32",
+            "2024-02.mask",
+        ]
+
+        with pytest.raises(ValueError):
+            GridStore(tmp_path, GridGeometry([0.0], [0.0]))
+
+        with pytest.raises(ValueError):
+            GridStore(tmp_path / "missing")
+
+    def test_unit_read(self, setup_store):
+        """Unit test reading a time slice across months."""
+        cube = setup_store.read(["t", "ws"], "2024-01-31T23:00", "2024-02-01T00:00")
+
+        assert list(cube.times) == list(TIMES[1:3])
+        assert cube.values.dtype == np.float32
+        np.testing.assert_array_equal(
+            cube.sel(parameter="t"), [np.arange(18) + 100, np.arange(18) + 200]
+        )
+        assert np.isnan(cube.sel(parameter="ws")).all()
+
+        assert len(setup_store.read(["t"], "2023-01-01", "2023-12-31").times) == 0
+
+    def test_unit_read_points(self, setup_store):
+        """Unit test reading time series of grid points."""
+        df = setup_store.read_points("t", [3, 0], TIMES[0], TIMES[-1])
+
+        assert list(df.index) == list(TIMES)
+        assert list(df[3]) == [3, 103, 203, 303]
+        assert list(df[0]) == [0, 100, 200, 300]
+
+    def test_unit_sample(self, setup_store):
+        """Unit test reading time series at sites."""
+        sampler = GridSampler(GEOMETRY, [58.05, 58.1], [16.05, 16.1])
+
+        df = setup_store.sample("t", sampler, TIMES[0], TIMES[1])
+
+        np.testing.assert_allclose(df.to_numpy(), [[3.5, 7], [103.5, 107]], atol=1e-2)
+
+    def test_unit_write_cube(self, tmp_path):
+        """Unit test writing a cube, skipping failed values."""
+        cube = GridCube(TIMES[:2], ["t", "ws"], GEOMETRY)
+        cube.values[:] = 1
+        cube.errors[TIMES[1], "ws"] = ValueError("Out of bounds")
+        store = GridStore(tmp_path, GEOMETRY)
+
+        store.write_cube(cube)
+
+        assert list(store.read_points("ws", [0], TIMES[0], TIMES[-1]).index) == [
+            TIMES[0]
+        ]
+        assert len(store.read_points("t", [0], TIMES[0], TIMES[-1])) == 2
+
+    def test_unit_write_fail(self, setup_store):
+        """Unit test writing values off the grid or the time step."""
+        with pytest.raises(ValueError):
+            setup_store.write("t", TIMES[0], [1.0])
+
+        with pytest.raises(ValueError):
+            setup_store.write("t", "2024-01-01T00:30", np.zeros(18))
@@ -1,11 +1,14 @@
 """SMHI Strang unit tests."""
 
+import json
 from functools import partial
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import arrow
+import numpy as np
 import pandas as pd
 import pytest
+import requests
 from utils import get_response
 
 from smhi.constants import (
@@ -13,8 +16,18 @@ from smhi.constants import (
     STRANG_PARAMETERS,
     STRANG_POINT_URL,
 )
+from smhi.grid import GridGeometry, get_grid_cache, set_grid_cache
 from smhi.models.strang_model import StrangParameter
 from smhi.strang import Strang
+from smhi.utils import RetryableHTTPError, get_retry_policy
+
+
+@pytest.fixture(autouse=True)
+def reset_grid_cache():
+    """Reset the shared grid cache between tests."""
+    set_grid_cache(None)
+    yield
+    set_grid_cache(None)
 
 
 @pytest.fixture
@@ -88,7 +101,7 @@ class TestUnitStrang:
             (0, 0, STRANG_PARAMETERS[116], "2020-01-01", "2020-01-01", "hourly"),
         ],
     )
-    @patch("smhi.utils.requests.get")
+    @patch("smhi.utils.requests.Session.get")
     def test_unit_strang_get_point(
         self,
         mock_requests_get,
@@ -150,7 +163,7 @@ class TestUnitStrang:
             (STRANG_PARAMETERS[116], None, None),
         ],
     )
-    @patch("smhi.utils.requests.get")
+    @patch("smhi.utils.requests.Session.get")
     def test_unit_strang_get_multipoint(
         self, mock_requests_get, parameter, valid_time, time_interval, setup_multipoint
     ):
@@ -308,3 +321,266 @@ class TestUnitStrang:
                 client._parse_datetime(date_time, parameter)
         else:
             assert client._parse_datetime(date_time, parameter) == expected
+
+    @pytest.mark.parametrize(
+        "data, expected_values",
+        [
+            ([], []),
+            (
+                [
+                    {"date_time": "2020-02-01T00:00:00Z", "value": 1},
+                    {"date_time": "2020-02-01T01:00:00Z", "value": None},
+                ],
+                [1.0, None],
+            ),
+        ],
+    )
+    def test_unit_strang_parse_point_data(self, data, expected_values):
+        """Unit test for Strang _parse_point_data method."""
+        client = Strang()
+
+        df = client._parse_point_data(data)
+
+        assert list(df.columns) == ["value"]
+        assert df.index.name == "date_time"
+        assert str(df.index.dtype) == "datetime64[ns, UTC]"
+        assert df["value"].dtype == "float64"
+        assert df["value"].isna().tolist() == [v is None for v in expected_values]
+
+    def test_unit_strang_prepare_windows(self):
+        """Unit test for Strang _prepare_windows method."""
+        client = Strang()
+
+        urls = client._prepare_windows(
+            STRANG_PARAMETERS[117],
+            58,
+            16,
+            "2020-06-01T00:00:00+00:00",
+            "2022-03-01T00:00:00+00:00",
+            "hourly",
+            "YS",
+        )
+
+        assert [url.split("?")[1] for url in urls] == [
+            "from=2020-06-01T00:00:00+00:00&to=2021-01-01T00:00:00+00:00"
+            + "&interval=hourly",
+            "from=2021-01-01T00:00:00+00:00&to=2022-01-01T00:00:00+00:00"
+            + "&interval=hourly",
+            "from=2022-01-01T00:00:00+00:00&to=2022-03-01T00:00:00+00:00"
+            + "&interval=hourly",
+        ]
+
+    @patch("smhi.strang.time.sleep")
+    @patch("smhi.strang.Strang._get_and_load_data")
+    def test_unit_strang_get_point_window(self, mock_get_and_load_data, mock_sleep):
+        """Unit test for Strang get_point method with time windows."""
+        calls = []
+
+        def get_and_load_data(url, request, retry):
+            assert retry.max_attempts == 1
+            calls.append(url)
+            first, last, _ = [p.split("=")[1] for p in url.split("?")[1].split("&")]
+            if first.startswith("2021") and calls.count(url) == 1:
+                raise requests.exceptions.Timeout()
+
+            index = pd.date_range(first, last, freq="D", name="date_time")
+            return pd.DataFrame({"value": 1.0}, index), {"h": first}, 200
+
+        mock_get_and_load_data.side_effect = get_and_load_data
+
+        point = Strang().get_point(
+            58, 16, 117, "2020-12-30", "2022-01-02", "daily", window="YS"
+        )
+
+        assert len(calls) == 4
+        mock_sleep.assert_called_once()
+        assert point.headers == {"h": "2020-12-30T00:00:00+00:00"}
+        assert point.df.index.is_unique
+        assert point.df.index.is_monotonic_increasing
+        assert len(point.df) == 369
+
+    @pytest.mark.parametrize(
+        "error, expected_calls",
+        [
+            (ValueError("Request is out of bounds."), 1),
+            (requests.exceptions.HTTPError("Not found."), 1),
+            (json.JSONDecodeError("Expecting value", "", 0), 1),
+            (RetryableHTTPError("Unavailable.", 503, {"Retry-After": "0"}), 4),
+            (requests.exceptions.ConnectionError(), 4),
+        ],
+    )
+    @patch("smhi.strang.time.sleep")
+    @patch("smhi.strang.Strang._get_and_load_data")
+    def test_unit_strang_get_window(
+        self, mock_get_and_load_data, mock_sleep, error, expected_calls
+    ):
+        """Unit test for Strang _get_window retrying transient errors only."""
+        mock_get_and_load_data.side_effect = error
+
+        with pytest.raises(type(error)):
+            Strang()._get_window("URL")
+
+        assert get_retry_policy().max_attempts == 4
+        assert mock_get_and_load_data.call_count == expected_calls
+        assert mock_sleep.call_count == expected_calls - 1
+
+    @pytest.mark.parametrize("dedupe, expected_requests", [(False, 6), (True, 4)])
+    @patch("smhi.strang.Strang.get_point")
+    def test_unit_strang_get_points(
+        self, mock_get_point, dedupe, expected_requests, setup_point
+    ):
+        """Unit test for Strang get_points method."""
+        _, expected_answer = setup_point
+
+        def get_point(latitude, longitude, parameter, *args):
+            if latitude == 60:
+                raise ValueError("Out of bounds.")
+
+            return MagicMock(df=expected_answer * parameter)
+
+        mock_get_point.side_effect = get_point
+        get_grid_cache().set(
+            ("strang1g", 1, 1),
+            GridGeometry(
+                np.repeat([58.0, 58.1, 58.2], 6), np.tile(np.arange(6) * 0.1 + 16, 3)
+            ),
+        )
+
+        bulk = Strang().get_points(
+            [58.0, 58.01, 60], [16.0, 16.01, 16.0], [117, 118], dedupe=dedupe
+        )
+
+        assert mock_get_point.call_count == expected_requests
+        assert bulk.sites == ([0, 0, 2] if dedupe else [0, 1, 2])
+        assert sorted(bulk.errors) == [(2, 117), (2, 118)]
+        assert list(bulk.df.columns) == [(0, 117), (0, 118), (1, 117), (1, 118)]
+        assert list(bulk.df[1, 118]) == list(expected_answer["value"] * 118)
+        assert list(bulk.long_df.index.names) == ["site", "parameter", "date_time"]
+        assert len(bulk.long_df) == 4 * len(expected_answer)
+
+        with pytest.raises(ValueError):
+            Strang().get_points([58.0], [16.0, 17.0], [117])
+
+        with pytest.raises(NotImplementedError):
+            Strang().get_points([58.0], [16.0], [1])
+
+    @patch("smhi.strang.Strang.get_multipoint")
+    def test_unit_strang_get_grid_geometry(self, mock_get_multipoint, setup_multipoint):
+        """Unit test for Strang get_grid_geometry method."""
+        _, expected_answer = setup_multipoint
+        mock_get_multipoint.return_value = MagicMock(df=expected_answer)
+
+        client = Strang()
+        geometry = client.get_grid_geometry()
+        assert client.get_grid_geometry() is geometry
+
+        mock_get_multipoint.assert_called_once()
+        np.testing.assert_array_equal(geometry.latitudes, expected_answer["lat"])
+        np.testing.assert_array_equal(geometry.longitudes, expected_answer["lon"])
+
+    def test_unit_strang_to_rasters(self):
+        """Unit test for Strang to_rasters method."""
+        latitudes = np.repeat([58.0, 58.1, 58.2], 6)
+        longitudes = np.tile(np.arange(6) * 0.1 + 16, 3)
+        df = pd.DataFrame(
+            {"lat": latitudes, "lon": longitudes, "value": np.arange(18.0)}
+        )
+
+        client = Strang()
+        rasters = client.to_rasters(
+            [
+                MagicMock(df=df),
+                MagicMock(df=df.iloc[::-1] * [1, 1, 2]),
+                MagicMock(df=None),
+            ]
+        )
+        raster = client.to_raster(MagicMock(df=df.iloc[:5]))
+
+        assert rasters.shape == (3, 3, 6)
+        np.testing.assert_array_equal(rasters[0], np.arange(18).reshape(3, 6))
+        np.testing.assert_array_equal(rasters[1], 2 * rasters[0])
+        assert np.isnan(rasters[2]).all()
+        assert raster.shape == (3, 6) and np.isnan(raster).sum() == 13
+
+    @pytest.mark.parametrize(
+        "time_interval, how, timezone, expected",
+        [
+            ("daily", "energy", "Europe/Stockholm", [np.nan, 23.0, 24.0, np.nan]),
+            ("daily", "mean", "UTC", [1.0, 1.0, 1.0]),
+            ("monthly", "sum", "UTC", [48.0, 24.0]),
+        ],
+    )
+    def test_unit_strang_aggregate_point(self, time_interval, how, timezone, expected):
+        """Unit test for Strang aggregate_point method."""
+        index = pd.date_range(
+            "2024-03-30", periods=72, freq="h", tz="UTC", name="date_time"
+        )
+        point = MagicMock(
+            df=pd.DataFrame({"value": np.ones(72)}, index=index), time_interval=None
+        )
+
+        df = Strang().aggregate_point(point, time_interval, how, timezone)
+
+        np.testing.assert_array_equal(df["value"], expected)
+        assert str(df.index.tz) == timezone
+        assert df.index.name == "date_time"
+
+        point.time_interval = "daily"
+        with pytest.raises(ValueError):
+            Strang().aggregate_point(point, time_interval, "energy")
+
+        with pytest.raises(ValueError):
+            Strang().aggregate_point(point, "yearly")
+
+    def test_unit_strang_aggregate_point_energy_gap(self):
+        """Unit test for Strang aggregate_point method of energy with a gap."""
+        index = pd.date_range(
+            "2024-06-01", periods=72, freq="h", tz="UTC", name="date_time"
+        )
+        point = MagicMock(
+            df=pd.DataFrame({"value": np.full(72, 2.0)}, index=index).drop(index[30]),
+            time_interval="hourly",
+        )
+
+        energy = Strang().aggregate_point(point, "daily", "energy")
+        total = Strang().aggregate_point(point, "daily", "sum")
+
+        np.testing.assert_array_equal(energy["value"], [48.0, np.nan, 48.0])
+        np.testing.assert_array_equal(total["value"], [48.0, 46.0, 48.0])
+
+    def test_unit_strang_aggregate_multipoint(self):
+        """Unit test for Strang aggregate_multipoint method."""
+        df = pd.DataFrame(
+            {"lat": [58.0, 58.1], "lon": [16.0, 16.0], "value": [1.0, 2.0]}
+        )
+        multipoints = [
+            MagicMock(df=df * [1, 1, i], valid_time=time, time_interval="hourly")
+            for i, time in enumerate(
+                ["2024-06-01T21:00Z", "2024-06-01T22:00Z", "2024-06-01T23:00Z"], 1
+            )
+        ]
+
+        daily = Strang().aggregate_multipoint(
+            multipoints, "daily", "sum", "Europe/Stockholm"
+        )
+
+        assert list(daily.columns) == [0, 1]
+        assert list(daily.index) == [
+            pd.Timestamp("2024-06-01", tz="Europe/Stockholm"),
+            pd.Timestamp("2024-06-02", tz="Europe/Stockholm"),
+        ]
+        np.testing.assert_array_equal(daily.to_numpy(), [[1.0, 2.0], [5.0, 10.0]])
+
+    def test_unit_strang_aggregate_multipoint_energy(self):
+        """Unit test for Strang aggregate_multipoint method of energy."""
+        df = pd.DataFrame(
+            {"lat": [58.0, 58.1], "lon": [16.0, 16.0], "value": [1.0, np.nan]}
+        )
+        multipoints = [
+            MagicMock(df=df, valid_time=time, time_interval="hourly")
+            for time in pd.date_range("2024-06-01", periods=8, freq="3h", tz="UTC")
+        ]
+
+        energy = Strang().aggregate_multipoint(multipoints, "daily", "energy")
+
+        np.testing.assert_array_equal(energy.to_numpy(), [[24.0, np.nan]])
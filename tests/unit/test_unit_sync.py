@@ -0,0 +1,137 @@
+"""SMHI Metobs sync unit tests."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from smhi.sync import MetobsSync
+
+PERIODS = ("corrected-archive", "latest-months", "latest-day", "latest-hour")
+NOW = datetime(2024, 4, 1, 12, tzinfo=timezone.utc)
+
+
+def build_frame(start, periods, value):
+    """Build hourly station data frame.
+
+    Args:
+        start: first timestamp
+        periods: number of hours
+        value: value of all hours
+
+    Returns:
+        station data frame
+    """
+    index = pd.date_range(start, periods=periods, freq="h", tz="UTC")
+    return pd.DataFrame(
+        {
+            "Lufttemperatur": [float(value)] * periods,
+            "Kvalitet": pd.Categorical(["G"] * periods),
+        },
+        index=index,
+    )
+
+
+class TestUnitMetobsSync:
+    """Unit tests for MetobsSync class."""
+
+    @pytest.mark.parametrize(
+        "available, gap, expected_period",
+        [
+            (PERIODS, None, "corrected-archive"),
+            (PERIODS, timedelta(minutes=30), "latest-hour"),
+            (PERIODS, timedelta(hours=5), "latest-day"),
+            (PERIODS, timedelta(days=30), "latest-months"),
+            (PERIODS, timedelta(days=365), "corrected-archive"),
+            (PERIODS[1:], timedelta(days=365), "latest-months"),
+            (("corrected-archive",), timedelta(minutes=30), "corrected-archive"),
+            (PERIODS[:0:-1], None, "latest-months"),
+        ],
+    )
+    def test_unit_sync_select_period(self, tmp_path, available, gap, expected_period):
+        """Unit test for MetobsSync _select_period method."""
+        last_time = NOW - gap if gap is not None else None
+
+        assert (
+            MetobsSync(tmp_path)._select_period(available, last_time, NOW)
+            == expected_period
+        )
+
+    def test_unit_sync_select_period_gap(self, tmp_path, caplog):
+        """Unit test for MetobsSync _select_period method with uncovered gap."""
+        with caplog.at_level(logging.WARNING, logger="smhi.sync"):
+            period = MetobsSync(tmp_path)._select_period(
+                PERIODS[:0:-1], NOW - timedelta(days=365), NOW
+            )
+
+        assert period == "latest-months"
+        assert "No available period covers the gap" in caplog.text
+
+    def test_unit_sync_select_period_empty(self, tmp_path):
+        """Unit test for MetobsSync _select_period method without periods."""
+        with pytest.raises(ValueError):
+            MetobsSync(tmp_path)._select_period((), None, NOW)
+
+    @patch("smhi.sync.datetime")
+    @patch("smhi.sync.Data")
+    @patch("smhi.sync.Periods")
+    def test_unit_sync_archive_only(
+        self, mock_periods, mock_data, mock_datetime, tmp_path
+    ):
+        """Unit test for MetobsSync sync method of closed stations."""
+        mock_periods.cached.return_value = MagicMock(data=("corrected-archive",))
+        mock_datetime.now.return_value = NOW
+        archive = build_frame("2020-01-01", 24, 1)
+        mock_data.return_value = MagicMock(df=archive)
+        sync = MetobsSync(tmp_path)
+
+        sync.sync(1, 2)
+        mock_datetime.now.return_value = NOW + timedelta(days=1)
+        df = sync.sync(1, 2)
+
+        assert mock_data.call_count == 1
+        pd.testing.assert_frame_equal(df, archive)
+        assert sync.state(1, 2).period == "corrected-archive"
+
+    @patch("smhi.sync.datetime")
+    @patch("smhi.sync.Data")
+    @patch("smhi.sync.Periods")
+    def test_unit_sync(self, mock_periods, mock_data, mock_datetime, tmp_path):
+        """Unit test for MetobsSync sync method."""
+        mock_periods.cached.return_value = MagicMock(data=PERIODS)
+        mock_datetime.now.return_value = NOW
+        archive = build_frame("2024-01-01", 24, 1)
+        latest_months = build_frame("2024-01-01 12:00", 24 * 90, 2)
+        latest_day = build_frame(NOW - timedelta(hours=23), 24, 3)
+        mock_data.side_effect = [
+            MagicMock(df=archive),
+            MagicMock(df=latest_months),
+            MagicMock(df=latest_day),
+        ]
+        sync = MetobsSync(tmp_path)
+
+        assert sync.load(1, 2) is None
+        assert sync.state(1, 2) is None
+
+        df = sync.sync(1, 2)
+
+        assert [c.args[1] for c in mock_data.call_args_list] == [
+            "corrected-archive",
+            "latest-months",
+        ]
+        assert df.index.is_unique and df.index.is_monotonic_increasing
+        assert df.loc["2024-01-01 11:00", "Lufttemperatur"].item() == 1
+        assert df.loc["2024-01-01 12:00", "Lufttemperatur"].item() == 2
+        assert sync.state(1, 2).last_time == latest_months.index[-1]
+
+        mock_datetime.now.return_value = latest_months.index[-1] + timedelta(hours=6)
+        df = sync.sync(1, 2)
+
+        assert mock_data.call_args.args[1] == "latest-day"
+        assert df.index[-1] == latest_day.index[-1]
+        assert df.index.is_unique
+        assert df["Kvalitet"].dtype == "category"
+        pd.testing.assert_frame_equal(sync.load(1, 2), df)
+        assert sync.state(1, 2).period == "latest-day"
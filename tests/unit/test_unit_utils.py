@@ -0,0 +1,234 @@
+"""Test utils functions."""
+
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from utils import MockResponse
+
+from smhi.cache import ResponseCache
+from smhi.constants import HTTP_POOL_MAXSIZE
+from smhi.models.request_model import RetryPolicy
+from smhi.utils import (
+    RetryableHTTPError,
+    _get_retry_delay,
+    build_session,
+    format_datetime,
+    get_request,
+    get_response_cache,
+    get_retry_policy,
+    get_session,
+    set_response_cache,
+    set_retry_policy,
+    set_session,
+)
+
+
+@pytest.fixture
+def reset_session():
+    """Reset the shared session after each test."""
+    yield
+    set_session(None)
+
+
+class TestUnitUtils:
+    @pytest.mark.parametrize(
+        "test_time, expected_answer",
+        [
+            ("2024-03-31T07", "20240331T070000Z"),
+            ("2024-03-31T06:00", "20240331T060000Z"),
+            ("2024-03-30T07:00:00", "20240330T070000Z"),
+            ("2024-03-30T060000", "20240330T060000Z"),
+            ("2024-03-30T060000Z", "20240330T060000Z"),
+        ],
+    )
+    def test_format_datetime(self, test_time, expected_answer):
+        """Unit test _format_datetime."""
+        assert format_datetime(test_time) == expected_answer
+
+    def test_unit_build_session(self):
+        """Unit test build_session mounts pooled adapters."""
+        session = build_session(pool_maxsize=3)
+
+        adapter = session.get_adapter("https://opendata-download-metobs.smhi.se")
+        assert adapter._pool_maxsize == 3
+        assert session.get_adapter("http://example.com")._pool_maxsize == 3
+        assert build_session().get_adapter("https://x")._pool_maxsize == (
+            HTTP_POOL_MAXSIZE
+        )
+
+    def test_unit_get_session(self, reset_session):
+        """Unit test get_session reuses and set_session replaces the session."""
+        session = get_session()
+        assert get_session() is session
+
+        custom = requests.Session()
+        set_session(custom)
+        assert get_session() is custom
+
+        set_session(None)
+        assert get_session() is not custom
+
+    @patch("smhi.utils.requests.Session.get", return_value=MockResponse(200, {}, b""))
+    def test_unit_get_request(self, mock_requests_get, reset_session):
+        """Unit test get_request uses the shared or given session."""
+        get_request("URL")
+        get_request("URL")
+        assert mock_requests_get.call_count == 2
+
+        session = MagicMock()
+        session.get.return_value = MockResponse(200, {}, b"")
+        get_request("URL", session=session)
+        session.get.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "text, expected_error",
+        [
+            ("Out of bounds", ValueError),
+            ("Not found", requests.exceptions.HTTPError),
+        ],
+    )
+    def test_unit_get_request_fail(self, text, expected_error):
+        """Unit test get_request failures."""
+        response = MockResponse(404, {}, b"")
+        response.text = text
+        session = MagicMock()
+        session.get.return_value = response
+
+        with pytest.raises(expected_error):
+            get_request("URL", session=session)
+
+    @patch("smhi.utils.time.sleep")
+    def test_unit_get_request_retry_status(self, mock_sleep):
+        """Unit test get_request retries retryable status codes."""
+        session = MagicMock()
+        session.get.side_effect = [
+            MockResponse(503, {}, b""),
+            MockResponse(429, {"Retry-After": "7"}, b""),
+            MockResponse(200, {}, b"ok"),
+        ]
+        retry = RetryPolicy(max_attempts=3, backoff=1, jitter=False)
+
+        response = get_request("URL", session=session, retry=retry)
+
+        assert response.content == b"ok"
+        assert session.get.call_count == 3
+        session.get.assert_called_with("URL", timeout=retry.timeout)
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [1, 7]
+
+    @pytest.mark.parametrize(
+        "retry_after, expected",
+        [
+            ("120", 120.0),
+            ("Wed, 01 Jan 2025 12:00:30 GMT", 30.0),
+            ("Wed, 01 Jan 2025 12:00:30 -0000", 30.0),
+            ("soon", 1.0),
+        ],
+    )
+    @patch("smhi.utils.datetime")
+    def test_unit_get_retry_delay(self, mock_datetime, retry_after, expected):
+        """Unit test _get_retry_delay respects Retry-After of the server."""
+        mock_datetime.now.return_value = datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+        response = MockResponse(429, {"Retry-After": retry_after}, b"")
+        retry = RetryPolicy(backoff=1, backoff_max=10, jitter=False)
+
+        assert _get_retry_delay(response, retry, 1) == expected
+
+    @patch("smhi.utils.time.sleep")
+    def test_unit_get_request_retry_exhausted(self, mock_sleep):
+        """Unit test get_request gives up after max attempts."""
+        session = MagicMock()
+        session.get.side_effect = requests.exceptions.ConnectionError()
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            get_request("URL", session=session, retry=RetryPolicy(max_attempts=3))
+
+        assert session.get.call_count == 3
+        assert mock_sleep.call_count == 2
+
+        response = MockResponse(503, {}, b"")
+        response.text = "unavailable"
+        session.get.side_effect = None
+        session.get.return_value = response
+
+        with pytest.raises(RetryableHTTPError) as error:
+            get_request("URL", session=session, retry=RetryPolicy(max_attempts=2))
+
+        assert error.value.status_code == 503
+
+    @patch("smhi.utils.time.sleep")
+    def test_unit_get_request_no_retry(self, mock_sleep):
+        """Unit test get_request does not retry non-transient errors."""
+        response = MockResponse(404, {}, b"")
+        response.text = "not found"
+        session = MagicMock()
+        session.get.return_value = response
+
+        with pytest.raises(requests.exceptions.HTTPError) as error:
+            get_request("URL", session=session)
+
+        assert not isinstance(error.value, RetryableHTTPError)
+        session.get.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_unit_retry_policy(self):
+        """Unit test retry policy backoff and shared policy."""
+        retry = RetryPolicy(backoff=1, backoff_max=5, jitter=False)
+        assert [retry.delay(a) for a in range(1, 5)] == [1, 2, 4, 5]
+
+        retry = RetryPolicy(backoff=1, backoff_max=5)
+        assert all(0 <= retry.delay(a) <= 5 for a in range(1, 10))
+
+        set_retry_policy(RetryPolicy(max_attempts=1))
+        assert get_retry_policy().max_attempts == 1
+        set_retry_policy(None)
+        assert get_retry_policy() == RetryPolicy()
+
+    def test_unit_get_request_stream(self, tmp_path):
+        """Unit test get_request streams without using the cache."""
+        cache = ResponseCache(tmp_path)
+        set_response_cache(cache)
+
+        session = MagicMock()
+        session.get.return_value = MockResponse(200, {}, b"body")
+
+        try:
+            get_request("URL", session=session, stream=True)
+            get_request("URL", session=session, stream=True)
+        finally:
+            set_response_cache(None)
+
+        assert session.get.call_count == 2
+        session.get.assert_called_with(
+            "URL", timeout=RetryPolicy().timeout, stream=True
+        )
+        assert cache.get("URL") is None
+
+    def test_unit_get_request_cache(self, tmp_path):
+        """Unit test get_request serves, revalidates and bypasses the cache."""
+        cache = ResponseCache(tmp_path)
+        set_response_cache(cache)
+        assert get_response_cache() is cache
+
+        session = MagicMock()
+        session.get.return_value = MockResponse(200, {"ETag": '"a"'}, b"body")
+
+        try:
+            assert get_request("URL", session=session).content == b"body"
+            assert get_request("URL", session=session).content == b"body"
+            session.get.assert_called_once()
+
+            get_request("URL", session=session, use_cache=False)
+            assert session.get.call_count == 2
+
+            cache.ttl = 0
+            session.get.return_value = MockResponse(304, {}, b"")
+            assert get_request("URL", session=session).content == b"body"
+            assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"a"'}
+
+            session.get.return_value = MockResponse(200, {}, b"new")
+            assert get_request("URL", session=session).content == b"new"
+            assert cache.get("URL")[0].content == b"new"
+        finally:
+            set_response_cache(None)
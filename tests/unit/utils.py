@@ -9,6 +9,13 @@ class MockResponse:
         self.headers = header
         self.content = content
 
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
+
+    def close(self):
+        pass
+
 
 def get_response(file, encode=False):
     """Read in response.